@@ -18,6 +18,7 @@ from backend.app.models.jd_models import JobDescription, JDStructuringSession
 from backend.app.models.resume_models import Resume, MatchingResult
 from backend.app.models.history_models import MatchingHistory
 from backend.app.models.jd_library_models import JDLibrary, JDUsageHistory
+from backend.app.models.extraction_cache_models import ExtractionCacheEntry
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,28 @@
+"""Add (session_id, overall_score) index to matching_results
+
+Revision ID: 4c1f2a9d7b3e
+Revises: a509074fca30
+Create Date: 2026-10-17 18:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c1f2a9d7b3e'
+down_revision: Union[str, Sequence[str], None] = 'a509074fca30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_matching_results_session_score', 'matching_results', ['session_id', 'overall_score'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_matching_results_session_score', table_name='matching_results')
@@ -0,0 +1,47 @@
+"""Add extraction_cache table
+
+Revision ID: 7e2b9c4d1a05
+Revises: 4c1f2a9d7b3e
+Create Date: 2026-10-17 20:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e2b9c4d1a05'
+down_revision: Union[str, Sequence[str], None] = '4c1f2a9d7b3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('extraction_cache',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=True),
+    sa.Column('text_hash', sa.String(length=64), nullable=False),
+    sa.Column('model', sa.String(length=255), nullable=False),
+    sa.Column('prompt_version', sa.String(length=50), nullable=False),
+    sa.Column('extracted_text', sa.Text(), nullable=True),
+    sa.Column('structured_data', sa.JSON(), nullable=True),
+    sa.Column('hit_count', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('last_used_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_extraction_cache_id'), 'extraction_cache', ['id'], unique=False)
+    op.create_index('ix_extraction_cache_content', 'extraction_cache', ['kind', 'content_hash', 'model', 'prompt_version'], unique=False)
+    op.create_index('ix_extraction_cache_text', 'extraction_cache', ['kind', 'text_hash', 'model', 'prompt_version'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_extraction_cache_text', table_name='extraction_cache')
+    op.drop_index('ix_extraction_cache_content', table_name='extraction_cache')
+    op.drop_index(op.f('ix_extraction_cache_id'), table_name='extraction_cache')
+    op.drop_table('extraction_cache')
@@ -0,0 +1,29 @@
+"""Add fingerprint to matching_results for incremental re-matching
+
+Revision ID: 9d3a6f1c2b84
+Revises: 7e2b9c4d1a05
+Create Date: 2026-10-17 21:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3a6f1c2b84'
+down_revision: Union[str, Sequence[str], None] = '7e2b9c4d1a05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows have no fingerprint and are rescored on the next run
+    op.add_column('matching_results', sa.Column('fingerprint', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('matching_results', 'fingerprint')
@@ -0,0 +1,29 @@
+"""Add skill_vector to matching_results for what-if re-ranking
+
+Revision ID: b6e1d0a4c7f3
+Revises: 9d3a6f1c2b84
+Create Date: 2026-10-17 22:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e1d0a4c7f3'
+down_revision: Union[str, Sequence[str], None] = '9d3a6f1c2b84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows have no vector; ENGINE_VERSION changed, so the next run rescores them
+    op.add_column('matching_results', sa.Column('skill_vector', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('matching_results', 'skill_vector')
@@ -0,0 +1,31 @@
+"""Index matching_results by (session_id, rank_position) for ranked reads
+
+Revision ID: c3f8a2e5d9b1
+Revises: b6e1d0a4c7f3
+Create Date: 2026-10-18 10:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a2e5d9b1'
+down_revision: Union[str, Sequence[str], None] = 'b6e1d0a4c7f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # /results now pages in stored rank order (cascade shortlists rank ahead of higher traditional scores)
+    op.drop_index('ix_matching_results_session_score', table_name='matching_results')
+    op.create_index('ix_matching_results_session_rank', 'matching_results', ['session_id', 'rank_position'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_matching_results_session_rank', table_name='matching_results')
+    op.create_index('ix_matching_results_session_score', 'matching_results', ['session_id', 'overall_score'], unique=False)
@@ -2,13 +2,14 @@ from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
 from sqlalchemy.orm import Session
 from typing import Dict, Any
 import uuid
-import os
 import json
 
 from ..models.database import get_db
 from ..models.jd_models import JobDescription, JDStructuringSession
-from ..services.llm_service import LLMService
+from ..services.service_container import services
 from ..services.pdf_processor import PDFProcessor
+from ..services.extraction_cache import ExtractionCache, text_hash
+from ..services.upload_storage import UploadTooLarge, spool_upload
 
 
 router = APIRouter(prefix="/api/jd", tags=["Job Description"])
@@ -23,23 +24,34 @@ async def upload_jd(
     session_id = str(uuid.uuid4())
     
     try:
+        llm_service = services.llm_service()
+        extraction_cache = ExtractionCache.for_service(db, "jd", llm_service)
+        file_hash = None
+        cached = None
+        
         if file:
-            # Handling the file upload section
-            file_path = f"./data/uploads/jds/{session_id}_{file.filename}"
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
-            with open(file_path, "wb") as f:
-                content = await file.read()
-                f.write(content)
+            # Handling the file upload section (streamed to disk, size-limited)
+            spooled = await spool_upload(file, f"./data/uploads/jds/{session_id}_{file.filename}")
+            file_path = spooled.file_path
             
-            # It will extract the text from PDF
-            pdf_processor = PDFProcessor()
-            jd_text = pdf_processor.extract_text_from_pdf(file_path)
+            # Same file structured before? Reuse its text and structure
+            file_hash = spooled.content_hash
+            cached = extraction_cache.lookup(content_hash=file_hash)
+            if cached is not None:
+                jd_text = cached.extracted_text
+            else:
+                # It will extract the text from PDF
+                pdf_processor = PDFProcessor()
+                jd_text = pdf_processor.extract_text_from_pdf(file_path)
         elif text:
             jd_text = text
         else:
             raise HTTPException(status_code=400, detail="Either file or text must be provided")
         
+        jd_text_hash = text_hash(jd_text)
+        if cached is None:
+            cached = extraction_cache.lookup(text_hash=jd_text_hash)
+        
         # Creating JD record
         jd = JobDescription(
             original_text=jd_text,
@@ -51,8 +63,12 @@ async def upload_jd(
         db.refresh(jd)
         
         # Checking if JD needs to be structure or not
-        llm_service = LLMService()
-        structured_data = await llm_service.structure_job_description(jd_text)
+        if cached is not None:
+            print("♻️ Using cached JD structure")
+            structured_data = ExtractionCache.structured_copy(cached)
+        else:
+            structured_data = await llm_service.structure_job_description(jd_text)
+            extraction_cache.store(file_hash, jd_text_hash, jd_text, structured_data)
         
         # Creating the structuring session
         structuring_session = JDStructuringSession(
@@ -67,9 +83,14 @@ async def upload_jd(
             "session_id": session_id,
             "jd_id": jd.id,
             "structured_data": structured_data,
+            "from_cache": cached is not None,
             "needs_approval": True
         }
     
+    except HTTPException:
+        raise
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -160,7 +181,7 @@ async def approve_structure(
     else:
         # If user wants to make some changes
         feedback = approval_data.get("feedback", "")
-        llm_service = LLMService()
+        llm_service = services.llm_service()
         refined_structure = await llm_service.refine_structure_based_on_feedback(
             structuring_session.current_structure, feedback
         )
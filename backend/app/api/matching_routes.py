@@ -1,17 +1,38 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import and_, func, insert, or_, update
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional
 import os
+import base64
+import json
 import traceback
 import asyncio
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
-from dataclasses import dataclass
+import numpy as np
+from concurrent.futures import as_completed
+from functools import partial
 from ..config import settings
-from ..models.database import get_db
+from ..models.database import get_db, SessionLocal
 from ..models.jd_models import JobDescription
 from ..models.resume_models import Resume, MatchingResult
-from ..services.matching_engine import MatchingEngine
+from ..services.matching_engine import (
+    MatchingEngine,
+    JDScoringPlan,
+    jd_fingerprint,
+    matching_fingerprint,
+    rescore_skill_vectors,
+)
+from ..services.model_registry import model_registry
+from ..services.matching_executor import (
+    MatchingExecutor,
+    ResumeProcessingResult,
+    resolve_executor_mode,
+    resolve_max_workers,
+)
+from ..services.matching_jobs import MatchingJob, MatchingJobConflict, matching_jobs
+from ..services.rate_limiter import TokenBucket, rate_limits
+from ..services.service_container import services
 import time
 
 # Importing the Agentic AI Service
@@ -32,58 +53,78 @@ router = APIRouter(prefix="/api/matching", tags=["Matching"])
 USE_AGENTIC_AI = settings.USE_AGENTIC_AI and AGENTIC_AVAILABLE
 
 # Initializing the services
+# Load spaCy once per process (before any worker fork) and share it everywhere
+model_registry.preload()
 matching_engine = MatchingEngine()
-if USE_AGENTIC_AI:
-    try:
-        agentic_service = AgenticATSService()
-        print("Initialized Agentic AI Service for matching")
-    except Exception as e:
-        print(f"Failed to initialize Agentic AI: {e}")
-        USE_AGENTIC_AI = False
-        agentic_service = None
-else:
-    agentic_service = None
+# Agentic services are built per worker thread on first use (services.agentic_service())
+if not USE_AGENTIC_AI:
     print("Using traditional matching engine")
 
 
-@dataclass
-class ResumeProcessingResult:
-    resume_id: int
-    filename: str
-    candidate_name: str
-    ats_score: dict = None
-    error: str = None
-    processing_time: float = 0.0
+def _agentic_ats_score(resume_data: dict, jd_data: dict) -> dict:
+    """Agentic AI scores of one resume, shaped like an ATS score dict (raises on failure)"""
+    # One agentic service per worker thread, reused across resumes
+    local_agentic_service = services.agentic_service()
 
+    print("🤖 Using Agentic AI for comprehensive scoring...")
 
-class RateLimiter:
-    """Thread-safe rate limiter for API calls"""
+    # Run async function in thread
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    agentic_result = loop.run_until_complete(
+        local_agentic_service.match_and_score(
+            resume_data=resume_data, jd_data=jd_data
+        )
+    )
+    loop.close()
 
-    def __init__(self, max_calls: int, time_window: float):
-        self.max_calls = max_calls
-        self.time_window = time_window
-        self.calls = []
-        self.lock = threading.Lock()
+    print(f"Agentic AI Result processed")
 
-    def acquire(self):
-        with self.lock:
-            now = time.time()
-            # Remove old calls outside the time window
-            self.calls = [
-                call_time
-                for call_time in self.calls
-                if now - call_time < self.time_window
-            ]
+    # Extract scores from agentic result
+    overall_score = float(
+        agentic_result.get("overallscore")
+        or agentic_result.get("overall_score")
+        or 0
+    )
 
-            if len(self.calls) >= self.max_calls:
-                # Calculate wait time
-                oldest_call = min(self.calls)
-                wait_time = self.time_window - (now - oldest_call)
-                if wait_time > 0:
-                    time.sleep(wait_time)
-                    now = time.time()
+    skills_score = float(
+        agentic_result.get("skillmatchscore")
+        or agentic_result.get("skill_match_score")
+        or agentic_result.get("skillMatchScore")
+        or 0
+    )
 
-            self.calls.append(now)
+    experience_score = float(
+        agentic_result.get("experiencescore")
+        or agentic_result.get("experience_match_score")
+        or agentic_result.get("experience_score")
+        or agentic_result.get("experienceScore")
+        or 0
+    )
+    detailed_analysis = agentic_result.get("detailed_analysis", {})
+
+    # Add agentic-specific data to analysis
+    detailed_analysis["scoring_method"] = "Agentic AI"
+    detailed_analysis["recommendation"] = agentic_result.get(
+        "recommendation", "Unknown"
+    )
+    detailed_analysis["matched_skills"] = agentic_result.get(
+        "matched_skills", []
+    )
+    detailed_analysis["missing_skills"] = agentic_result.get(
+        "missing_skills", []
+    )
+
+    print(
+        f"Agentic Scores - Overall: {overall_score}%, Skills: {skills_score}%, Experience: {experience_score}%"
+    )
+
+    return {
+        "overall_score": overall_score,
+        "skill_match_score": skills_score,
+        "experience_score": experience_score,
+        "detailed_analysis": detailed_analysis,
+    }
 
 
 def process_single_resume(
@@ -92,16 +133,20 @@ def process_single_resume(
     skills_weightage: dict,
     jd_id: int,
     session_id: str,
-    rate_limiter: RateLimiter = None,
+    rate_limiter: TokenBucket = None,
+    scoring_plan: JDScoringPlan = None,
+    agentic: bool = None,
 ) -> ResumeProcessingResult:
-    """Process a single resume with thread-safe operations"""
+    """
+    Process a single resume with thread-safe operations
+
+    Args:
+        agentic: Score with the agentic AI (falling back to the traditional
+                 engine); defaults to USE_AGENTIC_AI
+    """
     start_time = time.time()
 
     try:
-        # Apply rate limiting if provided
-        if rate_limiter:
-            rate_limiter.acquire()
-
         print(f"🔄 Processing resume: {resume.filename}")
 
         # Ensure valid structured data
@@ -116,73 +161,26 @@ def process_single_resume(
         skills_score = 0
         experience_score = 0
         detailed_analysis = {}
+        skill_vector = None
         scoring_method = "Traditional"
 
-        # Create local instances for thread safety
-        local_matching_engine = MatchingEngine()
-        local_agentic_service = None
+        # The engine is stateless apart from the shared, read-only spaCy handle
+        local_matching_engine = matching_engine
 
-        if USE_AGENTIC_AI:
+        use_agentic = USE_AGENTIC_AI if agentic is None else agentic
+        if use_agentic:
             try:
-                # Import and create agentic service locally for thread safety
-                from ..services.agentic_service import EnhancedAgenticATSService
-
-                local_agentic_service = EnhancedAgenticATSService()
-
-                print("🤖 Using Agentic AI for comprehensive scoring...")
-
-                # Run async function in thread
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                agentic_result = loop.run_until_complete(
-                    local_agentic_service.match_and_score(
-                        resume_data=resume_data, jd_data=jd_data
-                    )
-                )
-                loop.close()
-
-                print(f"Agentic AI Result processed")
-
-                # Extract scores from agentic result
-                overall_score = float(
-                    agentic_result.get("overallscore")
-                    or agentic_result.get("overall_score")
-                    or 0
-                )
-
-                skills_score = float(
-                    agentic_result.get("skillmatchscore")
-                    or agentic_result.get("skill_match_score")
-                    or agentic_result.get("skillMatchScore")
-                    or 0
-                )
-
-                experience_score = float(
-                    agentic_result.get("experiencescore")
-                    or agentic_result.get("experience_match_score")
-                    or agentic_result.get("experience_score")
-                    or agentic_result.get("experienceScore")
-                    or 0
-                )
-                detailed_analysis = agentic_result.get("detailed_analysis", {})
-
-                # Add agentic-specific data to analysis
-                detailed_analysis["scoring_method"] = "Agentic AI"
-                detailed_analysis["recommendation"] = agentic_result.get(
-                    "recommendation", "Unknown"
-                )
-                detailed_analysis["matched_skills"] = agentic_result.get(
-                    "matched_skills", []
-                )
-                detailed_analysis["missing_skills"] = agentic_result.get(
-                    "missing_skills", []
-                )
+                # Apply rate limiting if provided (waits outside any shared lock);
+                # RateLimitExceeded falls back to traditional scoring like any agentic failure
+                if rate_limiter:
+                    rate_limiter.acquire()
+                agentic_score = _agentic_ats_score(resume_data, jd_data)
+                overall_score = agentic_score["overall_score"]
+                skills_score = agentic_score["skill_match_score"]
+                experience_score = agentic_score["experience_score"]
+                detailed_analysis = agentic_score["detailed_analysis"]
                 scoring_method = "Agentic AI"
 
-                print(
-                    f"Agentic Scores - Overall: {overall_score}%, Skills: {skills_score}%, Experience: {experience_score}%"
-                )
-
             except Exception as agentic_error:
                 print(f"Agentic AI failed: {str(agentic_error)}")
                 print(f"Falling back to traditional matching engine...")
@@ -192,19 +190,19 @@ def process_single_resume(
         if overall_score == 0 and skills_score == 0 and experience_score == 0:
             print("Using traditional matching engine...")
 
-            # Calculate ATS score using traditional method
-            ats_score = local_matching_engine.calculate_ats_score(
-                jd_data, resume_data, skills_weightage
+            # Calculate ATS score using traditional method; the result already
+            # carries every component score, so nothing is recomputed here
+            score_result = local_matching_engine.score_resume(
+                jd_data, resume_data, skills_weightage, plan=scoring_plan,
+                scores_only=settings.MATCHING_SCORES_ONLY,
             )
 
-            overall_score = ats_score.get("overall_score", 0)
-            detailed_analysis = ats_score.get("detailed_analysis", {})
+            overall_score = score_result.overall_score
+            skills_score = score_result.skill_match_score
+            experience_score = score_result.experience_score
+            detailed_analysis = score_result.detailed_analysis
             detailed_analysis["scoring_method"] = scoring_method
-
-            # Calculate individual scores
-            skills_score, experience_score = _calculate_traditional_scores(
-                jd_data, resume_data, skills_weightage, ats_score
-            )
+            skill_vector = score_result.skill_vector
 
         processing_time = time.time() - start_time
 
@@ -222,6 +220,7 @@ def process_single_resume(
                 "experience_score": round(experience_score, 2),
                 "detailed_analysis": detailed_analysis,
             },
+            skill_vector=skill_vector,
             processing_time=processing_time,
         )
 
@@ -241,80 +240,100 @@ def process_single_resume(
         )
 
 
-@router.post("/start/{session_id}")
-async def start_matching(session_id: str, db: Session = Depends(get_db)):
-    """Start matching process for all resumes in a session with multithreaded processing"""
+# Seconds between checks for new job events while streaming
+JOB_STREAM_POLL_INTERVAL = 0.5
 
-    print(f"\n{'=' * 60}")
-    print(f"Starting MULTITHREADED matching process for session: {session_id}")
-    print(f"Agentic AI Mode: {'ENABLED' if USE_AGENTIC_AI else 'DISABLED'}")
-    print(f"{'=' * 60}\n")
 
-    # Get job description
+def _get_matching_inputs(session_id: str, db: Session):
+    """Approved JD and resumes of a session, or the HTTP error explaining what is missing"""
     jd = (
         db.query(JobDescription).filter(JobDescription.session_id == session_id).first()
     )
     if not jd or not jd.is_approved:
         raise HTTPException(status_code=400, detail="JD not found or not approved")
 
-    # Extract job title safely
-    job_title = "Unknown Job"
-    if jd.structured_data and isinstance(jd.structured_data, dict):
-        job_title = jd.structured_data.get(
-            "job_title", jd.structured_data.get("title", "Unknown Job")
-        )
-
-    print(f"Found approved JD: {job_title}")
-
-    # Get all resumes for this session
     resumes = db.query(Resume).filter(Resume.session_id == session_id).all()
     if not resumes:
         raise HTTPException(
             status_code=400,
             detail="No resumes found for this session. Please upload resumes first.",
         )
+    return jd, resumes
 
-    print(f"Found {len(resumes)} resumes to process\n")
 
-    # Clear any existing results for this session (atomic operation)
-    try:
-        db.query(MatchingResult).filter(
-            MatchingResult.session_id == session_id
-        ).delete()
-        db.commit()
-        print(f"Cleared existing results for session: {session_id}")
-    except Exception as e:
-        print(f"Error clearing existing results: {e}")
-        db.rollback()
-        raise HTTPException(status_code=500, detail="Error clearing existing results")
+@router.post("/start/{session_id}")
+async def start_matching(
+    session_id: str,
+    force: bool = Query(False, description="Rescore every resume, even unchanged ones"),
+    db: Session = Depends(get_db),
+):
+    """Start matching process for all resumes in a session in parallel (process or thread pool)"""
+    _, resumes = _get_matching_inputs(session_id, db)
+    # Registered like a background job, so neither path can rewrite the session's
+    # results while the other one is running
+    job = _create_job(session_id, len(resumes))
+    # Blocking work runs off the event loop so other requests keep being served
+    return await run_in_threadpool(_run_matching_now, job, db, force)
 
-    # Prepare data for processing
-    jd_data = jd.structured_data if jd.structured_data else {}
-    skills_weightage = jd.skills_weightage if jd.skills_weightage else {}
 
-    print(f"📊 JD data keys: {list(jd_data.keys()) if jd_data else 'None'}")
+def _create_job(session_id: str, total: int) -> MatchingJob:
+    try:
+        return matching_jobs.create(session_id, total=total)
+    except MatchingJobConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
-    # Configure threading
-    max_workers = min(4, len(resumes))  # Limit to 4 threads to avoid overwhelming APIs
-    use_rate_limiting = USE_AGENTIC_AI  # Only rate limit if using Agentic AI
 
-    # Create rate limiter if needed (2 calls per 5 seconds for API limits)
-    rate_limiter = (
-        RateLimiter(max_calls=2, time_window=5.0) if use_rate_limiting else None
+def _run_matching_now(job: MatchingJob, db: Session, force: bool = False) -> dict:
+    """Synchronous /start: run the matching on the request's session, reporting into the job"""
+    job.start()
+    try:
+        summary = run_matching(job.session_id, db, on_result=job.record_result, force=force)
+    except HTTPException as e:
+        job.fail(str(e.detail))
+        raise
+    except Exception as e:
+        job.fail(str(e))
+        raise
+    job.finish(summary)
+    return summary
+
+
+def _reusable_results(
+    db: Session, session_id: str, fingerprints: Dict[int, str]
+) -> Dict[int, MatchingResult]:
+    """Stored results (by resume id) whose fingerprint matches the current inputs"""
+    reusable = {}
+    rows = db.query(MatchingResult).filter(
+        MatchingResult.session_id == session_id,
+        MatchingResult.fingerprint.isnot(None),
     )
+    for row in rows:
+        if row.resume_id not in reusable and fingerprints.get(row.resume_id) == row.fingerprint:
+            reusable[row.resume_id] = row
+    return reusable
 
-    print(f"🚀 Starting multithreaded processing with {max_workers} workers")
-    print(f"⏱️ Rate limiting: {'ENABLED' if use_rate_limiting else 'DISABLED'}")
 
+def _score_resumes(
+    resumes: List[Resume],
+    executor_mode: str,
+    max_workers: int,
+    thread_task: Callable[[Resume], ResumeProcessingResult],
+    jd_data: dict,
+    skills_weightage: dict,
+    scoring_plan: JDScoringPlan,
+    on_result: Callable[[ResumeProcessingResult], None] = None,
+):
+    """Score resumes in parallel; returns the results (completion order) and the executor mode used"""
     matching_results = []
-    processing_start_time = time.time()
-
     # Process resumes in parallel with duplicate prevention
     processed_resume_ids = set()  # Track processed resumes to prevent duplicates
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    with MatchingExecutor(
+        executor_mode, max_workers, jd_data, skills_weightage, scoring_plan
+    ) as executor:
+        executor_mode = executor.mode
         # Submit all tasks (ensure no duplicates in input)
-        future_to_resume = {}
+        unique_resumes = []
         for resume in resumes:
             # Skip duplicate resumes in input
             if resume.id in processed_resume_ids:
@@ -322,27 +341,33 @@ async def start_matching(session_id: str, db: Session = Depends(get_db)):
                 continue
 
             processed_resume_ids.add(resume.id)
-            future = executor.submit(
-                process_single_resume,
-                resume,
-                jd_data,
-                skills_weightage,
-                jd.id,
-                session_id,
-                rate_limiter,
-            )
-            future_to_resume[future] = resume
+            unique_resumes.append(resume)
+        future_to_resumes = executor.submit_all(unique_resumes, thread_task)
 
         # Collect results as they complete
         completed_count = 0
+        total = len(unique_resumes)
         results_resume_ids = set()  # Track results to prevent duplicate entries
 
-        for future in as_completed(future_to_resume):
-            resume = future_to_resume[future]
-            completed_count += 1
+        for future in as_completed(future_to_resumes):
+            chunk = future_to_resumes[future]
 
             try:
-                result = future.result()
+                results = future.result()
+            except Exception as e:
+                print(f"❌ EXCEPTION scoring {len(chunk)} resume(s): {str(e)}")
+                results = [
+                    ResumeProcessingResult(
+                        resume_id=resume.id,
+                        filename=resume.filename,
+                        candidate_name="Unknown",
+                        error=str(e),
+                    )
+                    for resume in chunk
+                ]
+
+            for result in results:
+                completed_count += 1
 
                 # Additional check to prevent duplicate results
                 if result.resume_id in results_resume_ids:
@@ -351,137 +376,409 @@ async def start_matching(session_id: str, db: Session = Depends(get_db)):
 
                 results_resume_ids.add(result.resume_id)
                 matching_results.append(result)
+                if on_result:
+                    on_result(result)
 
                 status = "✅ SUCCESS" if result.ats_score else "❌ FAILED"
                 print(
-                    f"[{completed_count}/{len(future_to_resume)}] {status}: {resume.filename} ({result.processing_time:.2f}s)"
+                    f"[{completed_count}/{total}] {status}: {result.filename} ({result.processing_time:.2f}s)"
                 )
 
-            except Exception as e:
-                print(
-                    f"[{completed_count}/{len(future_to_resume)}] ❌ EXCEPTION: {resume.filename} - {str(e)}"
-                )
-                matching_results.append(
-                    ResumeProcessingResult(
-                        resume_id=resume.id,
-                        filename=resume.filename,
-                        candidate_name="Unknown",
-                        error=str(e),
-                    )
-                )
+    return matching_results, executor_mode
 
-    total_processing_time = time.time() - processing_start_time
-    print(f"\n🎯 Multithreaded processing completed in {total_processing_time:.2f}s")
-    print(f"📈 Average time per resume: {total_processing_time / len(resumes):.2f}s")
 
-    # Save all results to database in batch (with duplicate prevention)
-    print(f"\n💾 Saving {len(matching_results)} results to database...")
-    db_save_start = time.time()
+def _cascade_agentic_task(
+    resume: Resume,
+    traditional: ResumeProcessingResult,
+    jd_data: dict,
+    rate_limiter: TokenBucket = None,
+) -> ResumeProcessingResult:
+    """Cascade stage 2: agentic re-scoring of one shortlisted resume, keeping its traditional score on failure"""
+    start_time = time.time()
+    try:
+        # A rate-limit timeout (RateLimitExceeded) falls back like any agentic failure
+        if rate_limiter:
+            rate_limiter.acquire()
+        agentic_score = _agentic_ats_score(resume.structured_data or {}, jd_data)
+        if not (
+            agentic_score["overall_score"]
+            or agentic_score["skill_match_score"]
+            or agentic_score["experience_score"]
+        ):
+            raise ValueError("Agentic AI returned no scores")
+    except Exception as agentic_error:
+        print(f"Agentic AI failed for {resume.filename}: {str(agentic_error)}")
+        detailed_analysis = dict(traditional.ats_score["detailed_analysis"])
+        detailed_analysis["scoring_method"] = "Traditional (Agentic Fallback)"
+        detailed_analysis["cascade_shortlisted"] = True
+        return ResumeProcessingResult(
+            resume_id=traditional.resume_id,
+            filename=traditional.filename,
+            candidate_name=traditional.candidate_name,
+            ats_score={**traditional.ats_score, "detailed_analysis": detailed_analysis},
+            skill_vector=traditional.skill_vector,
+            processing_time=traditional.processing_time + time.time() - start_time,
+        )
 
-    successful_results = [r for r in matching_results if r.ats_score]
-    processed_resume_ids = set()  # Track processed resumes to prevent duplicates
+    # What the shortlist was ranked on, so later runs can rank reused results too
+    agentic_score["detailed_analysis"]["traditional_score"] = traditional.ats_score["overall_score"]
+    agentic_score["detailed_analysis"]["cascade_shortlisted"] = True
+    # The traditional vector (with its experience score) lets what_if_ranking move this result too
+    skill_vector = None
+    if traditional.skill_vector:
+        skill_vector = {**traditional.skill_vector, "experience_score": traditional.ats_score["experience_score"]}
+    return ResumeProcessingResult(
+        resume_id=traditional.resume_id,
+        filename=traditional.filename,
+        candidate_name=traditional.candidate_name,
+        ats_score={
+            "overall_score": round(agentic_score["overall_score"], 2),
+            "skill_match_score": round(agentic_score["skill_match_score"], 2),
+            "experience_score": round(agentic_score["experience_score"], 2),
+            "detailed_analysis": agentic_score["detailed_analysis"],
+        },
+        skill_vector=skill_vector,
+        processing_time=traditional.processing_time + time.time() - start_time,
+    )
 
-    for result in successful_results:
-        # Skip if we've already processed this resume
-        if result.resume_id in processed_resume_ids:
-            print(f"⚠️ Skipping duplicate resume: {result.filename}")
+
+def _run_cascade(
+    scored: List[ResumeProcessingResult],
+    reused: List[ResumeProcessingResult],
+    resumes: List[Resume],
+    jd_data: dict,
+    on_result: Callable[[ResumeProcessingResult], None] = None,
+):
+    """
+    Cascade stage 2: send only the traditional top-K / score band to the agentic AI
+
+    Candidates are ranked by traditional score, reused results included (an
+    agentically scored one by the traditional score it was shortlisted on).
+    Hard rejects (score 0: no relevant experience) never go to the LLM. Only
+    freshly scored resumes are escalated; reused results keep their scores
+    (force=true re-runs the cascade for everyone). Everyone else is reported
+    right away while the shortlist is scored concurrently.
+
+    Returns the final results of `scored` and the cascade metrics.
+    """
+    top_k = settings.AGENTIC_CASCADE_TOP_K
+    min_score = settings.AGENTIC_CASCADE_MIN_SCORE
+    max_score = settings.AGENTIC_CASCADE_MAX_SCORE
+    fresh_ids = {result.resume_id for result in scored}
+
+    pool = []
+    for result in scored + reused:
+        if not result.ats_score:
             continue
+        analysis = result.ats_score["detailed_analysis"]
+        pool.append((analysis.get("traditional_score", result.ats_score["overall_score"]), result))
+    pool.sort(key=lambda item: item[0], reverse=True)
+
+    shortlist = [result for score, result in pool if score > 0 and min_score <= score <= max_score]
+    if top_k:
+        shortlist = shortlist[:top_k]
+    escalated = {result.resume_id: result for result in shortlist if result.resume_id in fresh_ids}
+    hard_rejected = sum(1 for score, result in pool if score <= 0 and result.resume_id in fresh_ids)
+
+    final_results = []
+    for result in scored:
+        if result.resume_id not in escalated:
+            final_results.append(result)
+            if on_result:
+                on_result(result)
+
+    print(
+        f"🪜 Cascade: {len(escalated)} of {len(scored)} resumes shortlisted for Agentic AI "
+        f"(top {top_k or 'all'}, band {min_score:g}-{max_score:g}, {hard_rejected} hard rejects)"
+    )
 
-        # Check if result already exists (additional safety check)
-        existing_result = (
-            db.query(MatchingResult)
-            .filter(
-                MatchingResult.session_id == session_id,
-                MatchingResult.resume_id == result.resume_id,
-            )
-            .first()
+    rate_limiter = rate_limits.get("agentic")
+    agentic_results, _ = _score_resumes(
+        [resume for resume in resumes if resume.id in escalated],
+        "thread",
+        resolve_max_workers(len(escalated), io_bound=True),
+        lambda resume: _cascade_agentic_task(resume, escalated[resume.id], jd_data, rate_limiter),
+        jd_data,
+        {},
+        None,
+        on_result=on_result,
+    )
+    final_results.extend(agentic_results)
+
+    fallbacks = sum(
+        1 for result in agentic_results
+        if result.ats_score and "Fallback" in result.ats_score["detailed_analysis"].get("scoring_method", "")
+    )
+    return final_results, {
+        "top_k": top_k,
+        "score_band": [min_score, max_score],
+        "hard_rejected": hard_rejected,
+        "agentic_calls": len(escalated),
+        "agentic_fallbacks": fallbacks,
+        # Without the cascade every scored resume is one agentic (LLM) call
+        "llm_calls_saved": len(scored) - len(escalated),
+    }
+
+
+def _ranking_key(match: dict):
+    """
+    Sort key of a ranked match (highest first)
+
+    Agentic and traditional scores are not on one scale, so the cascade
+    shortlist ranks as a block ahead of everyone else (its agentic results
+    first, then those that fell back to their traditional score); scores are
+    only compared within a tier.
+    """
+    analysis = match["ats_score"]["detailed_analysis"]
+    tier = _ranking_tier(analysis.get("cascade_shortlisted"), analysis.get("scoring_method"))
+    return tier, match["ats_score"]["overall_score"]
+
+
+def _ranking_tier(cascade_shortlisted: bool, scoring_method: str) -> int:
+    if not cascade_shortlisted:
+        return 0
+    return 2 if scoring_method == "Agentic AI" else 1
+
+
+def run_matching(
+    session_id: str,
+    db: Session,
+    on_result: Callable[[ResumeProcessingResult], None] = None,
+    force: bool = False,
+) -> dict:
+    """
+    Score, save and rank every resume of a session (blocking)
+
+    Only resumes whose fingerprint (resume data, JD data, skills weightage,
+    engine version, scoring mode) changed since the last run are scored; the
+    stored results of the others are reused and everything is re-ranked.
+    With USE_AGENTIC_AI and AGENTIC_CASCADE, only a traditional shortlist is
+    scored by the agentic AI (see _run_cascade).
+
+    Args:
+        on_result: Called with each ResumeProcessingResult as soon as it completes
+                   (used by background jobs to report progress)
+        force: Rescore every resume regardless of stored results
+    """
+
+    print(f"\n{'=' * 60}")
+    print(f"Starting PARALLEL matching process for session: {session_id}")
+    print(f"Agentic AI Mode: {'ENABLED' if USE_AGENTIC_AI else 'DISABLED'}")
+    print(f"{'=' * 60}\n")
+
+    # Get job description and all resumes for this session
+    jd, resumes = _get_matching_inputs(session_id, db)
+
+    # Extract job title safely
+    job_title = "Unknown Job"
+    if jd.structured_data and isinstance(jd.structured_data, dict):
+        job_title = jd.structured_data.get(
+            "job_title", jd.structured_data.get("title", "Unknown Job")
         )
 
-        if existing_result:
-            print(f"⚠️ Updating existing result for: {result.filename}")
-            # Update existing record instead of creating new one
-            existing_result.overall_score = result.ats_score["overall_score"]
-            existing_result.skill_match_score = result.ats_score["skill_match_score"]
-            existing_result.experience_score = result.ats_score["experience_score"]
-            existing_result.detailed_analysis = result.ats_score["detailed_analysis"]
-            existing_result.rank_position = 0  # temporary, updated later
-        else:
-            # Create new result
-            matching_result = MatchingResult(
-                session_id=session_id,
-                jd_id=jd.id,
-                resume_id=result.resume_id,
-                overall_score=result.ats_score["overall_score"],
-                skill_match_score=result.ats_score["skill_match_score"],
-                experience_score=result.ats_score["experience_score"],
-                detailed_analysis=result.ats_score["detailed_analysis"],
-                rank_position=0,  # temporary, updated later
-            )
-            db.add(matching_result)
-            print(f"📝 Created new result for: {result.filename}")
+    print(f"Found approved JD: {job_title}")
+    print(f"Found {len(resumes)} resumes to process\n")
+
+    # Prepare data for processing
+    jd_data = jd.structured_data if jd.structured_data else {}
+    skills_weightage = jd.skills_weightage if jd.skills_weightage else {}
 
-        processed_resume_ids.add(result.resume_id)
+    print(f"📊 JD data keys: {list(jd_data.keys()) if jd_data else 'None'}")
 
-    try:
-        db.commit()
-        db_save_time = time.time() - db_save_start
-        print(f"✅ Database save completed in {db_save_time:.2f}s")
-        print(f"📊 Processed {len(processed_resume_ids)} unique resumes")
-    except Exception as e:
-        print(f"❌ Error saving results: {str(e)}")
-        db.rollback()
-        raise HTTPException(status_code=500, detail="Error saving matching results")
+    # Compile the JD side once; every worker reuses it read-only
+    plan_start_time = time.time()
+    scoring_plan = matching_engine.compile_jd_plan(jd_data, skills_weightage)
+    plan_compile_time = time.time() - plan_start_time
+    print(
+        f"🧭 JD scoring plan: {len(scoring_plan.job_priorities)} priorities, "
+        f"{len(scoring_plan.required_skills)} required skills ({plan_compile_time:.3f}s)"
+    )
 
-    # RANKING RESUMES BY OVERALL SCORE
+    # Reuse stored results whose inputs have not changed since the last run
+    cascade = USE_AGENTIC_AI and settings.AGENTIC_CASCADE
+    scoring_mode = "agentic" if USE_AGENTIC_AI else "traditional"
+    if cascade:
+        # The shortlist settings decide which results are agentic, so they are part of the mode
+        scoring_mode = (
+            f"cascade:{settings.AGENTIC_CASCADE_TOP_K}:"
+            f"{settings.AGENTIC_CASCADE_MIN_SCORE}:{settings.AGENTIC_CASCADE_MAX_SCORE}"
+        )
+    jd_fp = jd_fingerprint(jd_data, skills_weightage, scoring_mode)
+    fingerprints = {
+        resume.id: matching_fingerprint(jd_fp, resume.structured_data or {})
+        for resume in resumes
+    }
+    reusable = {} if force else _reusable_results(db, session_id, fingerprints)
+
+    matching_results = []
+    resumes_to_score = []
+    for resume in resumes:
+        stored = reusable.get(resume.id)
+        if stored is None:
+            resumes_to_score.append(resume)
+            continue
+        result = ResumeProcessingResult(
+            resume_id=resume.id,
+            filename=resume.filename,
+            candidate_name=(resume.structured_data or {}).get("name", "Unknown"),
+            ats_score={
+                "overall_score": stored.overall_score,
+                "skill_match_score": stored.skill_match_score,
+                "experience_score": stored.experience_score,
+                "detailed_analysis": stored.detailed_analysis or {},
+            },
+            skill_vector=stored.skill_vector,
+        )
+        matching_results.append(result)
+        if on_result:
+            on_result(result)
+
+    print(
+        f"♻️ Reusing {len(reusable)} unchanged results, scoring {len(resumes_to_score)} resumes"
+        + (" (forced)" if force else "")
+    )
+
+    # Configure the executor: processes for CPU-bound traditional scoring,
+    # threads (max 4, to avoid overwhelming APIs) for the I/O-bound agentic path.
+    # In cascade mode everyone is scored traditionally first (see _run_cascade).
+    agentic_for_all = USE_AGENTIC_AI and not cascade
+    executor_mode = resolve_executor_mode(io_bound=agentic_for_all)
+    max_workers = resolve_max_workers(len(resumes_to_score), io_bound=agentic_for_all)
+    use_rate_limiting = agentic_for_all  # Only rate limit if every resume goes to Agentic AI
+
+    # Shared agentic budget (AGENTIC_REQUESTS_PER_MINUTE), adapts to 429s
+    rate_limiter = rate_limits.get("agentic") if use_rate_limiting else None
+
+    print(f"🚀 Starting {executor_mode}-pool processing with {max_workers} workers")
+    print(f"⏱️ Rate limiting: {'ENABLED' if use_rate_limiting else 'DISABLED'}")
+
+    processing_start_time = time.time()
+
+    thread_task = partial(
+        process_single_resume,
+        jd_data=jd_data,
+        skills_weightage=skills_weightage,
+        jd_id=jd.id,
+        session_id=session_id,
+        rate_limiter=rate_limiter,
+        scoring_plan=scoring_plan,
+        agentic=agentic_for_all,
+    )
+
+    scored_results, executor_mode = _score_resumes(
+        resumes_to_score,
+        executor_mode,
+        max_workers,
+        thread_task,
+        jd_data,
+        skills_weightage,
+        scoring_plan,
+        # Cascade results are reported once their final score is known
+        on_result=None if cascade else on_result,
+    )
+
+    cascade_metrics = None
+    if cascade:
+        scored_results, cascade_metrics = _run_cascade(
+            scored_results, matching_results, resumes_to_score, jd_data, on_result
+        )
+    matching_results.extend(scored_results)
+
+    total_processing_time = time.time() - processing_start_time
+    print(f"\n🎯 Parallel processing completed in {total_processing_time:.2f}s")
+    print(f"📈 Average time per resume: {total_processing_time / len(resumes):.2f}s")
+
+    # RANKING RESUMES BY OVERALL SCORE (in memory, before anything is written)
     print(f"\n{'=' * 60}")
     print("Ranking candidates...")
     print(f"{'=' * 60}\n")
 
-    # Convert results to ranking format
-    ranking_results = []
+    successful_matches = []
+    skill_vectors = {}  # stored apart from the ranking returned to the client
+    ranked_resume_ids = set()  # Track resumes to prevent duplicate rows
     for result in matching_results:
-        if result.ats_score:
-            ranking_results.append(
-                {
-                    "resume_id": result.resume_id,
-                    "filename": result.filename,
-                    "candidate_name": result.candidate_name,
-                    "ats_score": result.ats_score,
-                }
-            )
-
-    successful_matches = ranking_results
-    successful_matches.sort(key=lambda x: x["ats_score"]["overall_score"], reverse=True)
-
-    # Update rank positions in DB starting from 1.
-    for rank, result in enumerate(successful_matches, 1):
-        matching_result = (
-            db.query(MatchingResult)
-            .filter(
-                MatchingResult.session_id == session_id,
-                MatchingResult.resume_id == result["resume_id"],
-            )
-            .first()
+        if not result.ats_score:
+            continue
+        if result.resume_id in ranked_resume_ids:
+            print(f"⚠️ Skipping duplicate resume: {result.filename}")
+            continue
+        ranked_resume_ids.add(result.resume_id)
+        successful_matches.append(
+            {
+                "resume_id": result.resume_id,
+                "filename": result.filename,
+                "candidate_name": result.candidate_name,
+                "ats_score": result.ats_score,
+            }
         )
-        if matching_result:
-            matching_result.rank_position = rank
-            scoring_method = matching_result.detailed_analysis.get(
-                "scoring_method", "Unknown"
-            )
-            print(
-                f"Rank #{rank}: {result['filename']} - Score: {result['ats_score']['overall_score']}% [{scoring_method}]"
+        skill_vectors[result.resume_id] = result.skill_vector
+
+    successful_matches.sort(key=_ranking_key, reverse=True)
+
+    resume_data_by_id = {resume.id: resume.structured_data or {} for resume in resumes}
+    rows = []
+    for rank, match in enumerate(successful_matches, 1):
+        ats_score = match["ats_score"]
+        rows.append(
+            {
+                "session_id": session_id,
+                "jd_id": jd.id,
+                "resume_id": match["resume_id"],
+                "overall_score": ats_score["overall_score"],
+                "skill_match_score": ats_score["skill_match_score"],
+                "experience_score": ats_score["experience_score"],
+                "detailed_analysis": ats_score["detailed_analysis"],
+                "rank_position": rank,
+                "fingerprint": fingerprints.get(match["resume_id"]),
+                "skill_vector": skill_vectors.get(match["resume_id"]),
+            }
+        )
+        if ats_score["detailed_analysis"].get("analysis_pending"):
+            # What the deferred analysis must be built from, checked on first view
+            ats_score["detailed_analysis"]["analysis_inputs"] = _analysis_fingerprint(
+                jd_data, skills_weightage, resume_data_by_id.get(match["resume_id"], {})
             )
+        scoring_method = ats_score["detailed_analysis"].get("scoring_method", "Unknown")
+        if "Fallback" in scoring_method or ats_score["detailed_analysis"].get("error"):
+            # Agentic scoring or the engine failed for this one; try it again on the next run
+            rows[-1]["fingerprint"] = None
+        print(
+            f"Rank #{rank}: {match['filename']} - Score: {ats_score['overall_score']}% [{scoring_method}]"
+        )
+
+    # One transaction: delete stale rows, insert new ones, re-rank the reused ones
+    new_rows = [row for row in rows if row["resume_id"] not in reusable]
+    rank_updates = [
+        {"id": reusable[row["resume_id"]].id, "rank_position": row["rank_position"]}
+        for row in rows
+        if row["resume_id"] in reusable
+        and reusable[row["resume_id"]].rank_position != row["rank_position"]
+    ]
+    print(
+        f"\n💾 Saving {len(new_rows)} new results, re-ranking {len(rank_updates)} reused ones..."
+    )
+    db_save_start = time.time()
 
-    # Commit all changes
     try:
+        stale = db.query(MatchingResult).filter(MatchingResult.session_id == session_id)
+        if reusable:
+            stale = stale.filter(MatchingResult.id.notin_([row.id for row in reusable.values()]))
+        stale.delete(synchronize_session=False)
+        if new_rows:
+            db.execute(insert(MatchingResult), new_rows)
+        if rank_updates:
+            db.execute(update(MatchingResult), rank_updates)
         db.commit()
-        print(f"\nMatching completed: {len(successful_matches)} successful matches")
-        print(f"{'=' * 60}\n")
     except Exception as e:
-        print(f"Error saving results: {str(e)}")
+        print(f"❌ Error saving results: {str(e)}")
         db.rollback()
         raise HTTPException(status_code=500, detail="Error saving matching results")
 
+    db_save_time = time.time() - db_save_start
+    print(f"✅ Database save completed in {db_save_time:.2f}s ({len(new_rows)} rows inserted)")
+    print(f"\nMatching completed: {len(successful_matches)} successful matches")
+    print(f"{'=' * 60}\n")
+
     return {
         "session_id": session_id,
         "total_resumes": len(resumes),
@@ -492,98 +789,432 @@ async def start_matching(session_id: str, db: Session = Depends(get_db)):
         "performance_metrics": {
             "total_processing_time": round(total_processing_time, 2),
             "average_processing_time": round(total_processing_time / len(resumes), 2),
-            "database_save_time": round(db_save_time, 2)
-            if "db_save_time" in locals()
-            else 0,
+            "database_save_time": round(db_save_time, 3),
+            "rows_saved": len(new_rows),
+            "rows_reranked": len(rank_updates),
+            "resumes_scored": len(resumes_to_score),
+            "results_reused": len(reusable),
+            "plan_compile_time": round(plan_compile_time, 3),
+            "executor_mode": executor_mode,
             "threads_used": max_workers,
             "rate_limiting_enabled": use_rate_limiting,
         },
+        "cascade": cascade_metrics,
     }
 
 
+def _run_matching_job(job: MatchingJob, force: bool = False):
+    """Background task: run the matching with its own DB session, reporting into the job"""
+    db = SessionLocal()
+    job.start()
+    try:
+        summary = run_matching(job.session_id, db, on_result=job.record_result, force=force)
+        job.finish(summary)
+    except HTTPException as e:
+        job.fail(str(e.detail))
+    except Exception as e:
+        print(f"❌ Matching job {job.job_id} failed: {str(e)}")
+        traceback.print_exc()
+        job.fail(str(e))
+    finally:
+        db.close()
+
+
+def _get_job(job_id: str) -> MatchingJob:
+    job = matching_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Matching job not found")
+    return job
+
+
+@router.post("/jobs/{session_id}", status_code=202)
+async def start_matching_job(
+    session_id: str,
+    background_tasks: BackgroundTasks,
+    force: bool = Query(False, description="Rescore every resume, even unchanged ones"),
+    db: Session = Depends(get_db),
+):
+    """Queue the matching for a session and return a job id right away"""
+
+    # Fail fast on a missing JD/resumes instead of inside the background job
+    _, resumes = _get_matching_inputs(session_id, db)
+
+    job = _create_job(session_id, len(resumes))
+    background_tasks.add_task(_run_matching_job, job, force)
+    print(f"📥 Queued matching job {job.job_id} for session {session_id} ({len(resumes)} resumes)")
+
+    return {
+        "job_id": job.job_id,
+        "session_id": session_id,
+        "status": job.status,
+        "total_resumes": len(resumes),
+        "progress_url": f"{router.prefix}/jobs/{job.job_id}",
+        "stream_url": f"{router.prefix}/jobs/{job.job_id}/stream",
+        "results_url": f"{router.prefix}/jobs/{job.job_id}/results",
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_matching_job(job_id: str):
+    """Progress of a matching job (plus the final summary once completed)"""
+    return _get_job(job_id).snapshot()
+
+
+@router.get("/jobs/{job_id}/results")
+async def get_matching_job_results(job_id: str, offset: int = 0):
+    """Results finished so far; pass next_offset back as `offset` to get only newer ones"""
+    return _get_job(job_id).results_since(offset)
+
+
+@router.get("/jobs/{job_id}/stream")
+async def stream_matching_job(job_id: str, request: Request):
+    """Server-Sent Events: one `result`/`error` event per resume, then `completed` or `failed`"""
+    job = _get_job(job_id)
+
+    # EventSource reconnects send the last id they saw
+    last_event_id = request.headers.get("last-event-id")
+    start_offset = int(last_event_id) + 1 if last_event_id and last_event_id.isdigit() else 0
+
+    async def event_stream():
+        offset = start_offset
+        while True:
+            finished = job.is_finished
+            for event in job.events_since(offset):
+                offset = event["id"] + 1
+                yield (
+                    f"id: {event['id']}\n"
+                    f"event: {event['event']}\n"
+                    f"data: {json.dumps(event['data'])}\n\n"
+                )
+            if finished or await request.is_disconnected():
+                break
+            await asyncio.sleep(JOB_STREAM_POLL_INTERVAL)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # no proxy buffering (nginx)
+            "Content-Encoding": "identity",  # keeps GZipMiddleware from buffering events
+        },
+    )
+
+
+# Fields the /results endpoint can project (rank is always computed)
+RESULT_FIELDS = {
+    "resume_id": MatchingResult.resume_id,
+    "filename": Resume.filename,
+    "candidate_name": Resume.structured_data["name"].as_string(),
+    "overall_score": MatchingResult.overall_score,
+    "skill_match_score": MatchingResult.skill_match_score,
+    "experience_score": MatchingResult.experience_score,
+    "detailed_analysis": MatchingResult.detailed_analysis,
+    "skills_found": Resume.structured_data["skills"],
+    "scoring_method": MatchingResult.detailed_analysis["scoring_method"].as_string(),
+}
+RESULT_FIELD_DEFAULTS = {
+    "candidate_name": "Unknown",
+    "overall_score": 0,
+    "skill_match_score": 0,
+    "experience_score": 0,
+    "detailed_analysis": {},
+    "skills_found": [],
+    "scoring_method": "Unknown",
+}
+MAX_RESULTS_PAGE_SIZE = 1000
+
+
+def _encode_results_cursor(rank_position: int, result_id: int, next_rank: int) -> str:
+    payload = json.dumps([rank_position, result_id, next_rank]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def _decode_results_cursor(cursor: str):
+    try:
+        rank_position, result_id, next_rank = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(rank_position), int(result_id), int(next_rank)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/results/{session_id}")
-async def get_matching_results(session_id: str, db: Session = Depends(get_db)):
-    """Get detailed matching results for a session"""
+async def get_matching_results(
+    session_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_RESULTS_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Ranked matching results for a session
+
+    Args:
+        limit: Page size (all results when omitted)
+        cursor: next_cursor from the previous page
+        fields: Comma-separated projection, e.g. "candidate_name,overall_score";
+                heavy JSON columns are only read when requested
+    """
 
     print(f"Fetching matching results for session: {session_id}")
 
-    # Atfirst it will check if resumes exist for this session
-    resumes = db.query(Resume).filter(Resume.session_id == session_id).all()
-    if not resumes:
-        print(f"No resumes found for session: {session_id}")
-        raise HTTPException(
-            status_code=400,
-            detail="No resumes found for this session. Please upload resumes first.",
+    if fields:
+        selected_fields = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in selected_fields if f not in RESULT_FIELDS and f != "rank"]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)}. Allowed: rank, {', '.join(RESULT_FIELDS)}",
+            )
+        selected_fields = [f for f in selected_fields if f != "rank"]
+    else:
+        selected_fields = list(RESULT_FIELDS)
+
+    # One joined query, keyset-paginated on (rank_position, id), which walks the
+    # (session_id, rank_position) index instead of sorting the session. The stored
+    # rank is the matching's order (cascade shortlists rank ahead of the rest).
+    query = (
+        db.query(
+            MatchingResult.id.label("result_id"),
+            MatchingResult.rank_position.label("sort_rank"),
+            *[RESULT_FIELDS[name].label(name) for name in selected_fields],
         )
-
-    print(f"Found {len(resumes)} resumes for session {session_id}")
-
-    # Checking if matching results exist ORDER BY overall score DESC for proper ranking
-    results = (
-        db.query(MatchingResult)
+        .join(Resume, Resume.id == MatchingResult.resume_id)
         .filter(MatchingResult.session_id == session_id)
-        .order_by(MatchingResult.overall_score.desc())
-        .all()
     )
 
-    print(f"Found {len(results)} matching results")
+    rank_offset = 0
+    if cursor:
+        last_rank, last_id, rank_offset = _decode_results_cursor(cursor)
+        query = query.filter(
+            or_(
+                MatchingResult.rank_position > last_rank,
+                and_(
+                    MatchingResult.rank_position == last_rank,
+                    MatchingResult.id > last_id,
+                ),
+            )
+        )
 
-    if not results:
+    query = query.order_by(MatchingResult.rank_position.asc(), MatchingResult.id.asc())
+    if limit:
+        rows = query.limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+    else:
+        rows = query.all()
+        has_more = False
+
+    if not rows and not cursor:
+        # Only now find out which error applies
+        resume_count = (
+            db.query(func.count(Resume.id)).filter(Resume.session_id == session_id).scalar()
+        )
+        if not resume_count:
+            print(f"No resumes found for session: {session_id}")
+            raise HTTPException(
+                status_code=400,
+                detail="No resumes found for this session. Please upload resumes first.",
+            )
         print(f"No matching results found for session: {session_id}")
         raise HTTPException(
             status_code=404,
-            detail=f"No matching results found. Please run the matching process first for the {len(resumes)} uploaded resumes.",
+            detail=f"No matching results found. Please run the matching process first for the {resume_count} uploaded resumes.",
         )
 
-    # Building detailed results with PROPER SCORING
     detailed_results = []
-    for rank, result in enumerate(results, 1):
-        resume = db.query(Resume).filter(Resume.id == result.resume_id).first()
+    for position, row in enumerate(rows, rank_offset + 1):
+        item = {"rank": position}
+        for name in selected_fields:
+            value = getattr(row, name)
+            if value is None:
+                value = RESULT_FIELD_DEFAULTS.get(name)
+            if name.endswith("_score") and value is not None:
+                value = round(value, 2)
+            item[name] = value
+        detailed_results.append(item)
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = _encode_results_cursor(
+            last.sort_rank, last.result_id, rank_offset + len(rows)
+        )
 
-        if resume:
-            resume_data = resume.structured_data if resume.structured_data else {}
+    total_results = (
+        db.query(func.count(MatchingResult.id))
+        .join(Resume, Resume.id == MatchingResult.resume_id)
+        .filter(MatchingResult.session_id == session_id)
+        .scalar()
+        if limit or cursor
+        else len(detailed_results)
+    )
 
-            # Ensuring scores are properly formatted and not null
-            skill_score = (
-                result.skill_match_score if result.skill_match_score is not None else 0
-            )
-            exp_score = (
-                result.experience_score if result.experience_score is not None else 0
-            )
+    print(f"Returning {len(detailed_results)} of {total_results} results, ranked by score\n")
+
+    return {
+        "session_id": session_id,
+        "total_results": total_results,
+        "results": detailed_results,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+        "agentic_ai_used": USE_AGENTIC_AI,
+        "status": "success",
+    }
 
-            # Getting scoring method from detailed analysis
-            scoring_method = (
-                result.detailed_analysis.get("scoring_method", "Unknown")
-                if result.detailed_analysis
-                else "Unknown"
-            )
 
-            detailed_results.append(
-                {
-                    "rank": rank,
-                    "resume_id": result.resume_id,
-                    "filename": resume.filename,
-                    "candidate_name": resume_data.get("name", "Unknown"),
-                    "overall_score": round(result.overall_score, 2),
-                    "skill_match_score": round(skill_score, 2),
-                    "experience_score": round(exp_score, 2),
-                    "detailed_analysis": result.detailed_analysis or {},
-                    "skills_found": resume_data.get("skills", []),
-                    "scoring_method": scoring_method,
-                }
+def what_if_ranking(
+    session_id: str, skills_weightage: Dict[str, float], db: Session, limit: int = None
+) -> dict:
+    """
+    Ranking a session would get with another skills weightage, from the stored skill vectors
+
+    Nothing is rescored or written: each traditional result's stored skill
+    vector is re-weighted (see rescore_skill_vectors). An agentic result keeps
+    the vector it was shortlisted on and moves by as much as the weightage
+    moves that traditional score, since the LLM score cannot be re-weighted.
+    Results without a vector (rejected candidates, rows saved before vectors
+    existed) keep their stored scores.
+    """
+    start_time = time.perf_counter()
+    rows = (
+        db.query(
+            MatchingResult.resume_id,
+            MatchingResult.rank_position,
+            MatchingResult.overall_score,
+            MatchingResult.skill_match_score,
+            MatchingResult.experience_score,
+            MatchingResult.skill_vector,
+            MatchingResult.detailed_analysis["cascade_shortlisted"].as_boolean().label("cascade_shortlisted"),
+            MatchingResult.detailed_analysis["scoring_method"].as_string().label("scoring_method"),
+            Resume.filename,
+        )
+        .join(Resume, Resume.id == MatchingResult.resume_id)
+        .filter(MatchingResult.session_id == session_id)
+        .order_by(MatchingResult.rank_position.asc(), MatchingResult.id.asc())
+        .all()
+    )
+    if not rows:
+        raise HTTPException(
+            status_code=404,
+            detail="No matching results found. Please run the matching process first.",
+        )
+    load_time = time.perf_counter() - start_time
+
+    overall_scores = np.array([row.overall_score or 0.0 for row in rows])
+    skill_scores = np.array([row.skill_match_score or 0.0 for row in rows])
+    vector_rows = [i for i, row in enumerate(rows) if row.skill_vector]
+    if vector_rows:
+        vectors = [rows[i].skill_vector for i in vector_rows]
+        # Agentic results carry the traditional experience score of their vector
+        experience_scores = [
+            rows[i].skill_vector.get("experience_score", rows[i].experience_score or 0.0) for i in vector_rows
+        ]
+        new_skill_scores, new_overall_scores = rescore_skill_vectors(vectors, experience_scores, skills_weightage)
+        agentic = np.array([rows[i].scoring_method == "Agentic AI" for i in vector_rows])
+        if agentic.any():
+            # Shift the agentic scores by the change in their traditional scores (vector default weights)
+            base_skill_scores, base_overall_scores = rescore_skill_vectors(vectors, experience_scores, {})
+            new_skill_scores = np.where(
+                agentic,
+                np.clip(skill_scores[vector_rows] + new_skill_scores - base_skill_scores, 0, 100),
+                new_skill_scores,
+            )
+            new_overall_scores = np.where(
+                agentic,
+                np.clip(overall_scores[vector_rows] + new_overall_scores - base_overall_scores, 0, 100),
+                new_overall_scores,
             )
+        skill_scores[vector_rows] = new_skill_scores
+        overall_scores[vector_rows] = new_overall_scores
+
+    # Same tiers as the matching (cascade shortlist first); ties keep their current order
+    tiers = np.array([_ranking_tier(row.cascade_shortlisted, row.scoring_method) for row in rows])
+    order = np.lexsort((-np.round(overall_scores, 2), -tiers))
+    if limit:
+        order = order[:limit]
+    rescored = set(vector_rows)
+
+    ranking = []
+    for rank, i in enumerate(order.tolist(), 1):
+        row = rows[i]
+        ranking.append(
+            {
+                "rank": rank,
+                "previous_rank": row.rank_position,
+                "resume_id": row.resume_id,
+                "filename": row.filename,
+                "overall_score": round(float(overall_scores[i]), 2),
+                "previous_overall_score": round(row.overall_score or 0.0, 2),
+                "skill_match_score": round(float(skill_scores[i]), 2),
+                "experience_score": round(row.experience_score or 0.0, 2),
+                "rescored": i in rescored,
+            }
+        )
 
-    print(f"Returning {len(detailed_results)} detailed results, ranked by score\n")
+    total_time = time.perf_counter() - start_time
+    print(
+        f"🔮 What-if ranking for {session_id}: {len(vector_rows)}/{len(rows)} results "
+        f"re-weighted in {(total_time - load_time) * 1000:.1f}ms (load {load_time * 1000:.1f}ms)"
+    )
 
     return {
         "session_id": session_id,
-        "total_results": len(detailed_results),
-        "results": detailed_results,
-        "agentic_ai_used": USE_AGENTIC_AI,
+        "skills_weightage": skills_weightage,
+        "total_results": len(rows),
+        "results_rescored": len(vector_rows),
+        "ranking": ranking,
         "status": "success",
+        "performance_metrics": {
+            "load_time_ms": round(load_time * 1000, 2),
+            "rerank_time_ms": round((total_time - load_time) * 1000, 2),
+        },
     }
 
 
+@router.post("/what-if/{session_id}")
+async def what_if_skills_weightage(
+    session_id: str,
+    skills_weightage: Dict[str, float],
+    limit: Optional[int] = Query(None, ge=1, description="Return only the top N candidates"),
+    db: Session = Depends(get_db),
+):
+    """
+    Preview the ranking for a skills weightage without re-running the matching
+
+    The body has the same shape as /api/jd/set-skills-weightage; nothing is
+    saved. Set the weightage there and start the matching to keep it.
+    """
+    return await run_in_threadpool(what_if_ranking, session_id, skills_weightage, db, limit)
+
+
+def _analysis_fingerprint(jd_data: dict, skills_weightage: dict, resume_data: dict) -> str:
+    """Fingerprint of the inputs a deferred detailed analysis is built from"""
+    return matching_fingerprint(jd_fingerprint(jd_data, skills_weightage, "analysis"), resume_data)
+
+
+def _complete_detailed_analysis(
+    db: Session, result: MatchingResult, resume_data: dict, jd_data: dict, skills_weightage: dict
+) -> dict:
+    """Build the analysis sections a scores-only matching left out, and store them"""
+    start_time = time.time()
+    detailed_analysis = dict(result.detailed_analysis or {})
+    detailed_analysis.update(
+        matching_engine.complete_analysis(jd_data, resume_data, skills_weightage)
+    )
+    detailed_analysis.pop("analysis_pending", None)
+    detailed_analysis.pop("analysis_inputs", None)
+
+    # A new dict, so the JSON column is seen as changed
+    result.detailed_analysis = detailed_analysis
+    db.commit()
+    print(
+        f"🧾 Built detailed analysis for resume {result.resume_id} on first view "
+        f"({time.time() - start_time:.3f}s)"
+    )
+    return detailed_analysis
+
+
 @router.get("/detailed/{session_id}/{resume_id}")
 async def get_detailed_analysis(
     session_id: str, resume_id: int, db: Session = Depends(get_db)
@@ -612,9 +1243,21 @@ async def get_detailed_analysis(
     if not resume or not jd:
         raise HTTPException(status_code=404, detail="Resume or JD not found")
 
-    # Extracting detailed personal information
+    # Everything read from the rows up front: building a pending analysis commits,
+    # which expires them
     resume_data = resume.structured_data or {}
     jd_data = jd.structured_data or {}
+    skills_weightage = jd.skills_weightage or {}
+    resume_info = {"id": resume.id, "filename": resume.filename}
+    rank_position = result.rank_position
+    overall_score = result.overall_score
+    skill_score = (
+        result.skill_match_score if result.skill_match_score is not None else 0
+    )
+    exp_score = result.experience_score if result.experience_score is not None else 0
+    detailed_analysis = result.detailed_analysis or {}
+
+    # Extracting detailed personal information
 
     # Extracting contact information
     personal_info = {
@@ -637,12 +1280,19 @@ async def get_detailed_analysis(
         "experience_timeline": resume_data.get("experience_timeline", []),
     }
 
-    # Matching analysis with proper scores
-    detailed_analysis = result.detailed_analysis or {}
-    skill_score = (
-        result.skill_match_score if result.skill_match_score is not None else 0
-    )
-    exp_score = result.experience_score if result.experience_score is not None else 0
+    # Matching analysis with proper scores (built here, once, after a scores-only matching)
+    if detailed_analysis.get("analysis_pending"):
+        if detailed_analysis.get("analysis_inputs") != _analysis_fingerprint(
+            jd_data, skills_weightage, resume_data
+        ):
+            # Built now, it would explain scores the stored ones were not computed from
+            raise HTTPException(
+                status_code=409,
+                detail="The JD or resume changed after matching. Run the matching again to see the detailed analysis.",
+            )
+        detailed_analysis = await run_in_threadpool(
+            _complete_detailed_analysis, db, result, resume_data, jd_data, skills_weightage
+        )
     scoring_method = detailed_analysis.get("scoring_method", "Unknown")
 
     # Agentic AI specific fields (if available)
@@ -659,8 +1309,7 @@ async def get_detailed_analysis(
 
     return {
         "resume_info": {
-            "id": resume.id,
-            "filename": resume.filename,
+            **resume_info,
             "personal_info": personal_info,
             "professional_info": professional_info,
         },
@@ -672,9 +1321,9 @@ async def get_detailed_analysis(
             "experience_required": jd_data.get("experience_required", "Not specified"),
         },
         "matching_analysis": {
-            "rank": result.rank_position,
-            "rank_position": result.rank_position,
-            "overall_score": round(result.overall_score, 2),
+            "rank": rank_position,
+            "rank_position": rank_position,
+            "overall_score": round(overall_score, 2),
             "skill_match_score": round(skill_score, 2),
             "experience_score": round(exp_score, 2),
             "detailed_analysis": detailed_analysis,
@@ -682,61 +1331,3 @@ async def get_detailed_analysis(
             "agentic_insights": agentic_insights if agentic_insights else None,
         },
     }
-
-
-# HELPER FUNCTION FOR TRADITIONAL SCORING
-
-
-def _calculate_traditional_scores(
-    jd_data: dict, resume_data: dict, skills_weightage: dict, ats_score: dict
-) -> tuple[float, float]:
-    # Calculating individual skill and experience scores using traditional matching engine
-
-    try:
-        # Parsing JD experience requirement
-        jd_exp_required = 0
-        if jd_data.get("experience_required"):
-            try:
-                jd_exp_required = matching_engine._parse_experience_years(
-                    str(jd_data["experience_required"])
-                )
-            except:
-                jd_exp_required = 0
-
-        # Extracting job priorities
-        job_priorities = matching_engine._extract_job_priorities(jd_data, None)
-
-        # Calculating individual scores using matching engine methods
-        skills_score = matching_engine._calculate_complete_skills_score(
-            resume_data, job_priorities, skills_weightage
-        )
-        experience_score = matching_engine._calculate_enhanced_experience_score(
-            resume_data, job_priorities, jd_exp_required
-        )
-
-        print(
-            f"Traditional scores calculated - Skills: {skills_score}%, Experience: {experience_score}%"
-        )
-
-    except Exception as score_error:
-        print(f"Error calculating individual scores: {score_error}")
-
-        # It is a Fallback that Use scores from ats_score if available
-        skills_score = ats_score.get("skill_match_score", 0)
-        experience_score = ats_score.get("experience_score", 0)
-
-        # If still zero, calculate reasonable estimates
-        if skills_score == 0 and experience_score == 0:
-            overall = ats_score.get("overall_score", 0)
-            skills_score = min(
-                100, max(0, overall + (len(resume_data.get("skills", [])) * 2))
-            )
-            experience_score = min(
-                100, max(0, overall - 10 + (resume_data.get("total_experience", 0) * 5))
-            )
-
-        print(
-            f"Using fallback scores - Skills: {skills_score}%, Experience: {experience_score}%"
-        )
-
-    return (skills_score, experience_score)
@@ -34,6 +34,66 @@ class Settings:
     USE_AGENTIC_AI: bool = False
     USE_GROQ: bool = False
 
+    # Matching engine
+    SKILL_VECTOR_CACHE_SIZE: int = int(os.getenv("SKILL_VECTOR_CACHE_SIZE", "20000"))
+    MATCHING_EXECUTOR: str = os.getenv("MATCHING_EXECUTOR", "process")  # process | thread
+    MATCHING_MAX_WORKERS: int = int(os.getenv("MATCHING_MAX_WORKERS", "0"))  # 0 = one per CPU core
+    # Bulk matching stores scores only; /api/matching/detailed builds the full analysis on first view
+    MATCHING_SCORES_ONLY: bool = os.getenv("MATCHING_SCORES_ONLY", "false").lower() == "true"
+    # Cascade (with USE_AGENTIC_AI): everyone gets the traditional score, only the
+    # top-K (0 = no cut) within [MIN_SCORE, MAX_SCORE] is re-scored by the agentic AI
+    AGENTIC_CASCADE: bool = os.getenv("AGENTIC_CASCADE", "false").lower() == "true"
+    AGENTIC_CASCADE_TOP_K: int = int(os.getenv("AGENTIC_CASCADE_TOP_K", "20"))
+    AGENTIC_CASCADE_MIN_SCORE: float = float(os.getenv("AGENTIC_CASCADE_MIN_SCORE", "0"))
+    AGENTIC_CASCADE_MAX_SCORE: float = float(os.getenv("AGENTIC_CASCADE_MAX_SCORE", "100"))
+
+    # PDF text extraction
+    PDF_BACKEND: str = os.getenv("PDF_BACKEND", "pymupdf")  # pymupdf | pypdf2
+    PDF_MAX_PAGES: int = int(os.getenv("PDF_MAX_PAGES", "50"))  # 0 = no cap
+    PDF_MAX_CHARS: int = int(os.getenv("PDF_MAX_CHARS", "200000"))  # 0 = no cap
+    PDF_MAX_WORKERS: int = int(os.getenv("PDF_MAX_WORKERS", "0"))  # shared process pool; 0 = one per CPU core
+
+    # Resume ingestion pipeline
+    RESUME_PDF_WORKERS: int = int(os.getenv("RESUME_PDF_WORKERS", "4"))  # PDFs in flight per upload
+    RESUME_LLM_CONCURRENCY: int = int(os.getenv("RESUME_LLM_CONCURRENCY", "4"))
+    RESUME_COMMIT_BATCH_SIZE: int = int(os.getenv("RESUME_COMMIT_BATCH_SIZE", "20"))
+    RESUME_EXTRACTION_MODE: str = os.getenv("RESUME_EXTRACTION_MODE", "tiered")  # llm | tiered | heuristic
+    RESUME_MIN_FIELD_CONFIDENCE: float = float(os.getenv("RESUME_MIN_FIELD_CONFIDENCE", "0.7"))
+    RESUME_PROMPT_COMPACTION: bool = os.getenv("RESUME_PROMPT_COMPACTION", "true").lower() == "true"
+    RESUME_PROMPT_TOKEN_BUDGET: int = int(os.getenv("RESUME_PROMPT_TOKEN_BUDGET", "500"))  # ~2000 chars
+
+    # Extraction cache (reuses LLM extractions of identical resumes/JDs)
+    EXTRACTION_CACHE_ENABLED: bool = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+    EXTRACTION_CACHE_MIN_TEXT_CHARS: int = int(os.getenv("EXTRACTION_CACHE_MIN_TEXT_CHARS", "20"))  # shorter text is never text-hashed
+
+    # Pooled HTTP clients for the LLM backends
+    OLLAMA_MAX_CONNECTIONS: int = int(os.getenv("OLLAMA_MAX_CONNECTIONS", "8"))
+    PERPLEXITY_MAX_CONNECTIONS: int = int(os.getenv("PERPLEXITY_MAX_CONNECTIONS", "10"))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+
+    # LLM response cache (sqlite file, TTL + LRU bounded)
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", "./data/cache/llm_responses.sqlite3")
+    LLM_CACHE_TTL_SECONDS: int = int(os.getenv("LLM_CACHE_TTL_SECONDS", "604800"))  # 7 days
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+    LLM_CACHE_MAX_MB: int = int(os.getenv("LLM_CACHE_MAX_MB", "256"))
+
+    # Per-backend request budgets (token buckets; 0 = unlimited)
+    OLLAMA_REQUESTS_PER_MINUTE: float = float(os.getenv("OLLAMA_REQUESTS_PER_MINUTE", "0"))
+    PERPLEXITY_REQUESTS_PER_MINUTE: float = float(os.getenv("PERPLEXITY_REQUESTS_PER_MINUTE", "50"))
+    AGENTIC_REQUESTS_PER_MINUTE: float = float(os.getenv("AGENTIC_REQUESTS_PER_MINUTE", "24"))  # 2 per 5s
+    LLM_RATE_LIMIT_BURST: int = int(os.getenv("LLM_RATE_LIMIT_BURST", "2"))
+    LLM_RATE_LIMIT_MAX_WAIT: float = float(os.getenv("LLM_RATE_LIMIT_MAX_WAIT", "300"))  # seconds
+    LLM_RATE_LIMIT_RETRIES: int = int(os.getenv("LLM_RATE_LIMIT_RETRIES", "2"))  # retries after HTTP 429
+
+    # Circuit breakers and deadlines for the LLM backend chain
+    LLM_REQUEST_DEADLINE_SECONDS: float = float(os.getenv("LLM_REQUEST_DEADLINE_SECONDS", "180"))  # 0 = none
+    CIRCUIT_BREAKER_WINDOW_SECONDS: float = float(os.getenv("CIRCUIT_BREAKER_WINDOW_SECONDS", "60"))
+    CIRCUIT_BREAKER_MIN_CALLS: int = int(os.getenv("CIRCUIT_BREAKER_MIN_CALLS", "3"))
+    CIRCUIT_BREAKER_FAILURE_RATE: float = float(os.getenv("CIRCUIT_BREAKER_FAILURE_RATE", "0.5"))
+    CIRCUIT_BREAKER_SLOW_CALL_SECONDS: float = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_SECONDS", "120"))
+    CIRCUIT_BREAKER_OPEN_SECONDS: float = float(os.getenv("CIRCUIT_BREAKER_OPEN_SECONDS", "30"))
+
 
 
     USE_PERPLEXITY: bool = os.getenv("USE_PERPLEXITY", "true").lower() == "true"
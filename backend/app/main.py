@@ -157,12 +157,27 @@ async def health_check():
 @app.get("/api/status")
 async def api_status():
     """Detailed API status"""
+    from backend.app.services.model_registry import model_registry
+    from backend.app.services.vector_cache import vector_cache_stats
+    from backend.app.services.http_client import http_clients
+    from backend.app.services.llm_cache import llm_cache
+    from backend.app.services.rate_limiter import rate_limits
+    from backend.app.services.circuit_breaker import circuit_breakers
+    from backend.app.services.service_container import services
+
     return {
         "status": "online",
         "database": "connected",
         "api_version": "1.0.0",
         "endpoints_count": 26,
-        "documentation": "/docs"
+        "documentation": "/docs",
+        "nlp_models": model_registry.stats(),
+        "skill_vector_cache": vector_cache_stats(),
+        "http_clients": http_clients.stats(),
+        "llm_cache": llm_cache.stats(),
+        "rate_limits": rate_limits.stats(),
+        "circuit_breakers": circuit_breakers.stats(),
+        "llm_services": services.stats()
     }
 
 
@@ -184,6 +199,58 @@ async def create_tables():
         print(f"Error creating database tables: {e}")
 
 
+@app.on_event("startup")
+async def warm_llm_services():
+    """Build the LLM backends once, before the first request needs them"""
+    try:
+        from backend.app.services.service_container import services
+        services.llm_service()
+    except Exception as e:
+        print(f"⚠️ LLM backends not ready at startup: {e}")
+
+
+@app.on_event("startup")
+async def start_matching_workers():
+    """Fork the matching process pool now, before request threads exist (they may hold locks)"""
+    try:
+        from backend.app.services.matching_executor import resolve_executor_mode, warm_process_pool
+        if resolve_executor_mode() == "process":
+            warm_process_pool()
+    except Exception as e:
+        print(f"⚠️ Matching workers not started: {e}")
+
+
+@app.on_event("shutdown")
+async def stop_matching_workers():
+    """Stop the shared matching processes"""
+    from backend.app.services.matching_executor import shutdown_process_pool
+    shutdown_process_pool()
+
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    """Close pooled LLM backend connections"""
+    from backend.app.services.http_client import http_clients
+    await http_clients.aclose()
+
+
+@app.on_event("startup")
+async def start_pdf_workers():
+    """Fork the PDF extraction pool now, before request threads exist"""
+    try:
+        from backend.app.services.pdf_processor import warm_process_pool
+        warm_process_pool()
+    except Exception as e:
+        print(f"⚠️ PDF workers not started: {e}")
+
+
+@app.on_event("shutdown")
+async def stop_pdf_workers():
+    """Stop the shared PDF extraction processes"""
+    from backend.app.services.pdf_processor import shutdown_process_pool
+    shutdown_process_pool()
+
+
 
 try:
     from backend.app.api import (
@@ -212,10 +279,6 @@ except Exception as e:
     traceback.print_exc()
 
 
-# Global setting for Increasing max upload size to 500MB
-app.max_request_size = 500 * 1024 * 1024  # 500 MB
-
-
 
 # Main entry point
 if __name__ == "__main__":
@@ -227,6 +290,5 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         log_level="info",
-        reload=True,
-        limit_max_request_size=500 * 1024 * 1024  # Ensures 500MB limit in Uvicorn too
+        reload=True
     )
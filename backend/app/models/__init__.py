@@ -4,3 +4,4 @@ from .jd_models import JobDescription, JDStructuringSession
 from .resume_models import Resume, MatchingResult
 from .history_models import MatchingHistory
 from .jd_library_models import JDLibrary, JDUsageHistory
+from .extraction_cache_models import ExtractionCacheEntry
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index
+from .database import Base
+from datetime import datetime
+
+class ExtractionCacheEntry(Base):
+    """LLM extraction result for one document, reusable across sessions"""
+    __tablename__ = "extraction_cache"
+    __table_args__ = (
+        Index("ix_extraction_cache_content", "kind", "content_hash", "model", "prompt_version"),
+        Index("ix_extraction_cache_text", "kind", "text_hash", "model", "prompt_version"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(20), nullable=False)  # resume | jd
+    content_hash = Column(String(64))  # SHA-256 of the uploaded file bytes (None for pasted text)
+    text_hash = Column(String(64), nullable=False)  # SHA-256 of the normalized extracted text
+    model = Column(String(255), nullable=False)
+    prompt_version = Column(String(50), nullable=False)
+    extracted_text = Column(Text)
+    structured_data = Column(JSON)
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow)
@@ -21,6 +21,7 @@ from backend.app.models.jd_models import JobDescription, JDStructuringSession
 from backend.app.models.resume_models import Resume, MatchingResult
 from backend.app.models.history_models import MatchingHistory
 from backend.app.models.jd_library_models import JDLibrary, JDUsageHistory
+from backend.app.models.extraction_cache_models import ExtractionCacheEntry
 from backend.app.config import settings
 
 
@@ -131,7 +132,8 @@ class DatabaseMigrationManager:
             'matching_results',
             'matching_history',
             'jd_library',
-            'jd_usage_history'
+            'jd_usage_history',
+            'extraction_cache'
         ]
         
         existing_tables = self.get_existing_tables()
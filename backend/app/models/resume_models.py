@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Float, Index
 from .database import Base
 from datetime import datetime
 
@@ -17,6 +17,10 @@ class Resume(Base):
 
 class MatchingResult(Base):
     __tablename__ = "matching_results"
+    __table_args__ = (
+        # Ranked reads of one session (ORDER BY rank_position) walk this index
+        Index("ix_matching_results_session_rank", "session_id", "rank_position"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(String(100), index=True)
@@ -27,4 +31,8 @@ class MatchingResult(Base):
     experience_score = Column(Float)
     detailed_analysis = Column(JSON)
     rank_position = Column(Integer)
+    # Hash of resume data + JD data + skills weightage + engine version (see matching_engine)
+    fingerprint = Column(String(64))
+    # Per required skill [default weight, credit] for re-ranking under new weights (see matching_engine)
+    skill_vector = Column(JSON(none_as_null=True))
     created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
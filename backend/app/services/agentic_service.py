@@ -3,6 +3,7 @@ from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
 from crewai import Agent, Task, Crew, Process, LLM
 from backend.app.config import settings
+from backend.app.services.rate_limiter import is_rate_limit_error, rate_limits
 import json
 import re
 import asyncio
@@ -301,6 +302,8 @@ class EnhancedAgenticATSService:
             }
         except Exception as e:
             print(f"❌ Agentic scoring failed: {e}")
+            if is_rate_limit_error(e):
+                rate_limits.get("agentic").throttle()
             # Return fallback scores
             return {
                 "overall_score": 0,
@@ -0,0 +1,287 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from ..config import settings
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+PROBE_TIMEOUT = 5.0
+MAX_OPEN_SECONDS = 300.0
+
+
+class CircuitOpenError(Exception):
+    """The backend's circuit is open; the call was skipped without touching the network"""
+
+    status_code = 503
+
+    def __init__(self, backend: str, retry_in: float):
+        super().__init__(f"{backend} circuit open (retry in {retry_in:.0f}s)")
+        self.backend = backend
+        self.retry_in = retry_in
+
+
+class DeadlineExceeded(Exception):
+    """The request's deadline budget ran out before the backend answered"""
+
+    status_code = 504
+
+
+class Deadline:
+    """Time budget for one logical LLM request, shared by every backend it tries"""
+
+    def __init__(self, seconds: Optional[float] = None):
+        seconds = settings.LLM_REQUEST_DEADLINE_SECONDS if seconds is None else seconds
+        self.expires_at = time.monotonic() + seconds if seconds > 0 else None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (never negative), or None when unbounded"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+
+class CircuitBreaker:
+    """
+    Per-backend circuit breaker with a rolling window
+
+    - CLOSED: calls go through; outcomes and latencies are kept for
+      window_seconds. Once the window holds min_calls calls and the share of
+      failed or slow (>= slow_call_seconds) calls reaches failure_rate, the
+      circuit opens
+    - OPEN: calls fail immediately with CircuitOpenError for open_seconds
+      (doubled after every failed probe, up to MAX_OPEN_SECONDS)
+    - HALF_OPEN: one caller runs the health probe (e.g. Ollama's /api/tags)
+      or, without a probe, one trial request; success closes the circuit
+    """
+
+    def __init__(
+        self,
+        name: str,
+        probe: Optional[Callable[[], Awaitable[bool]]] = None,
+        window_seconds: Optional[float] = None,
+        min_calls: Optional[int] = None,
+        failure_rate: Optional[float] = None,
+        slow_call_seconds: Optional[float] = None,
+        open_seconds: Optional[float] = None,
+    ):
+        self.name = name
+        self.probe = probe
+        # None means "use the setting"; an explicit 0 is kept
+        self.window_seconds = settings.CIRCUIT_BREAKER_WINDOW_SECONDS if window_seconds is None else window_seconds
+        self.min_calls = settings.CIRCUIT_BREAKER_MIN_CALLS if min_calls is None else min_calls
+        self.failure_rate = settings.CIRCUIT_BREAKER_FAILURE_RATE if failure_rate is None else failure_rate
+        self.slow_call_seconds = (
+            settings.CIRCUIT_BREAKER_SLOW_CALL_SECONDS if slow_call_seconds is None else slow_call_seconds
+        )
+        self.open_seconds = settings.CIRCUIT_BREAKER_OPEN_SECONDS if open_seconds is None else open_seconds
+
+        self.state = CLOSED
+        self._outcomes: Deque[Tuple[float, bool, float]] = deque()  # (time, ok, latency)
+        self._opened_at = 0.0
+        self._open_for = self.open_seconds
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self.times_opened = 0
+        self.probes = 0
+
+    def _admit(self) -> bool:
+        """Raise CircuitOpenError, or return True when this caller runs the half-open trial"""
+        with self._lock:
+            if self.state == CLOSED:
+                return False
+            now = time.monotonic()
+            retry_in = self._opened_at + self._open_for - now
+            if self.state == OPEN and retry_in <= 0 and not self._trial_in_flight:
+                self.state = HALF_OPEN
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            raise CircuitOpenError(self.name, max(0.0, retry_in))
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None,
+        acquire: Optional[Callable[[Optional[float]], Awaitable[float]]] = None,
+    ) -> Any:
+        """
+        Run fn() through the breaker, cancelled after `timeout` seconds
+
+        acquire(max_wait) waits for a rate-limit slot once the call is
+        admitted and returns the seconds waited. Queue time is not backend
+        latency: it is taken off `timeout` but never timed or counted as a
+        failure, and nothing is recorded when no time is left for fn().
+        """
+        trial = self._admit()
+        if trial and self.probe:
+            if not await self._run_probe():
+                with self._lock:
+                    self._trip(escalate=True)
+                raise CircuitOpenError(self.name, self._open_for)
+            with self._lock:
+                self._close()
+            trial = False
+
+        try:
+            if acquire is not None:
+                waited = await acquire(timeout)
+                if timeout is not None:
+                    timeout = max(0.0, timeout - waited)
+            if timeout is not None and timeout <= 0:
+                raise DeadlineExceeded(f"No time left in the request deadline for {self.name}")
+        except BaseException:
+            if trial:
+                with self._lock:
+                    self._release_trial()
+            raise
+
+        start = time.monotonic()
+        try:
+            try:
+                result = await asyncio.wait_for(fn(), timeout)
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded(f"{self.name} did not answer within the {timeout:.1f}s deadline")
+        except asyncio.CancelledError:
+            # The caller went away (client disconnect, outer cancel): says nothing about the backend
+            if trial:
+                with self._lock:
+                    self._release_trial()
+            raise
+        except Exception:
+            self._record(False, time.monotonic() - start, trial)
+            raise
+        self._record(True, time.monotonic() - start, trial)
+        return result
+
+    async def _run_probe(self) -> bool:
+        self.probes += 1
+        try:
+            healthy = bool(await asyncio.wait_for(self.probe(), PROBE_TIMEOUT))
+        except Exception as e:
+            print(f"⚠️ {self.name} health probe failed: {e}")
+            healthy = False
+        print(f"🩺 {self.name} half-open probe: {'healthy' if healthy else 'still down'}")
+        return healthy
+
+    def _record(self, ok: bool, latency: float, trial: bool):
+        now = time.monotonic()
+        with self._lock:
+            self.calls += 1
+            if not ok:
+                self.failures += 1
+
+            if trial:
+                if ok:
+                    self._close()
+                else:
+                    self._trip(escalate=True)
+                return
+            if self.state != CLOSED:
+                return  # admitted before the circuit opened
+
+            self._outcomes.append((now, ok, latency))
+            self._prune(now)
+            if len(self._outcomes) >= self.min_calls and self._bad_rate() >= self.failure_rate:
+                self._trip(escalate=False)
+
+    def _prune(self, now: float):
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    def _bad_rate(self) -> float:
+        bad = sum(1 for _, ok, latency in self._outcomes if not ok or latency >= self.slow_call_seconds)
+        return bad / len(self._outcomes) if self._outcomes else 0.0
+
+    def _trip(self, escalate: bool):
+        # Caller must hold self._lock
+        self._open_for = min(MAX_OPEN_SECONDS, self._open_for * 2) if escalate else self.open_seconds
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+        self._outcomes.clear()
+        self.times_opened += 1
+        print(f"🔴 {self.name} circuit OPEN for {self._open_for:.0f}s")
+
+    def _release_trial(self):
+        # Caller must hold self._lock; the trial never reached the backend
+        self.state = OPEN
+        self._trial_in_flight = False
+
+    def _close(self):
+        # Caller must hold self._lock
+        if self.state != CLOSED:
+            print(f"🟢 {self.name} circuit CLOSED")
+        self.state = CLOSED
+        self._open_for = self.open_seconds
+        self._trial_in_flight = False
+        self._outcomes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._prune(time.monotonic())
+            latencies = sorted(latency for _, _, latency in self._outcomes)
+            retry_in = self._opened_at + self._open_for - time.monotonic() if self.state != CLOSED else 0.0
+            return {
+                "state": self.state,
+                "window_calls": len(latencies),
+                "window_failure_rate": round(self._bad_rate(), 3),
+                "window_p50_seconds": round(latencies[len(latencies) // 2], 3) if latencies else None,
+                "window_p95_seconds": round(latencies[int(len(latencies) * 0.95)], 3) if latencies else None,
+                "retry_in_seconds": round(max(0.0, retry_in), 1),
+                "calls": self.calls,
+                "failures": self.failures,
+                "rejected": self.rejected,
+                "times_opened": self.times_opened,
+                "probes": self.probes,
+            }
+
+
+async def _ollama_probe() -> bool:
+    from .ollama_service import get_ollama_service
+    return await get_ollama_service().health_check()
+
+
+class CircuitBreakerRegistry:
+    """One shared CircuitBreaker per LLM backend"""
+
+    # Backends with a cheap health endpoint are probed instead of risking a real request
+    PROBES = {
+        "ollama": _ollama_probe,
+    }
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, backend: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(backend)
+            if breaker is None:
+                breaker = CircuitBreaker(backend, probe=self.PROBES.get(backend))
+                self._breakers[backend] = breaker
+            return breaker
+
+    def reset(self):
+        """Drop the breakers so they are rebuilt from the current settings"""
+        with self._lock:
+            self._breakers.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.stats() for name, breaker in breakers.items()}
+
+
+# Singleton instance
+circuit_breakers = CircuitBreakerRegistry()
@@ -0,0 +1,112 @@
+import copy
+import hashlib
+import re
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from ..config import settings
+from ..models.extraction_cache_models import ExtractionCacheEntry
+from .llm_service import JD_PROMPT_VERSION, RESUME_PROMPT_VERSION
+
+
+PROMPT_VERSIONS = {
+    "resume": RESUME_PROMPT_VERSION,
+    "jd": JD_PROMPT_VERSION,
+}
+
+
+def content_hash(content: bytes) -> str:
+    """SHA-256 of the raw uploaded bytes"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def normalize_text(text: str) -> str:
+    """Case and whitespace folding, so re-exports of the same document hash alike"""
+    return re.sub(r'\s+', ' ', (text or '').lower()).strip()
+
+
+def text_hash(text: str) -> Optional[str]:
+    """
+    SHA-256 of the normalized extracted text
+
+    None for empty or near-empty text (image-only or unreadable PDFs): all of
+    those would share one hash and hand each other's extractions around.
+    """
+    normalized = normalize_text(text)
+    if len(normalized) < settings.EXTRACTION_CACHE_MIN_TEXT_CHARS:
+        return None
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class ExtractionCache:
+    """
+    Persistent cache of LLM extractions, keyed by content and model
+
+    Lookups try the file hash first (skips PDF parsing and the LLM), then the
+    normalized text hash (same document saved under another name or
+    re-exported). Entries are scoped to the backend/model and prompt version
+    that produced them. Writes are only added to the session; they are
+    committed together with the caller's own rows.
+    """
+
+    def __init__(self, db: Any, kind: str, model: str):
+        self.db = db
+        self.kind = kind
+        self.model = model
+        self.prompt_version = PROMPT_VERSIONS[kind]
+        self.enabled = settings.EXTRACTION_CACHE_ENABLED
+
+    @classmethod
+    def for_service(cls, db: Any, kind: str, llm_service: Any) -> "ExtractionCache":
+        return cls(db, kind, llm_service.model_identity())
+
+    def lookup(self, content_hash: Optional[str] = None, text_hash: Optional[str] = None) -> Optional[ExtractionCacheEntry]:
+        """Cached entry for the file hash or the text hash (in that order), or None"""
+        if not self.enabled:
+            return None
+
+        query = self.db.query(ExtractionCacheEntry).filter(
+            ExtractionCacheEntry.kind == self.kind,
+            ExtractionCacheEntry.model == self.model,
+            ExtractionCacheEntry.prompt_version == self.prompt_version,
+        )
+
+        entry = None
+        if content_hash:
+            entry = query.filter(ExtractionCacheEntry.content_hash == content_hash).first()
+        if entry is None and text_hash:
+            entry = query.filter(ExtractionCacheEntry.text_hash == text_hash).first()
+
+        if entry is not None:
+            entry.hit_count = (entry.hit_count or 0) + 1
+            entry.last_used_at = datetime.utcnow()
+        return entry
+
+    def store(
+        self,
+        content_hash: Optional[str],
+        text_hash: Optional[str],
+        extracted_text: str,
+        structured_data: Dict[str, Any],
+    ) -> Optional[ExtractionCacheEntry]:
+        """Add an extraction to the session; failed extractions and text without a hash are never cached"""
+        if not self.enabled or not text_hash or not structured_data or "error" in structured_data:
+            return None
+
+        entry = ExtractionCacheEntry(
+            kind=self.kind,
+            content_hash=content_hash,
+            text_hash=text_hash,
+            model=self.model,
+            prompt_version=self.prompt_version,
+            extracted_text=extracted_text,
+            structured_data=copy.deepcopy(structured_data),
+            hit_count=0,
+        )
+        self.db.add(entry)
+        return entry
+
+    @staticmethod
+    def structured_copy(entry: ExtractionCacheEntry) -> Dict[str, Any]:
+        """Private copy of a cached extraction, safe for the caller to mutate"""
+        return copy.deepcopy(entry.structured_data or {})
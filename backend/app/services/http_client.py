@@ -0,0 +1,105 @@
+import asyncio
+import weakref
+from dataclasses import dataclass
+from typing import Dict
+
+import httpx
+
+from ..config import settings
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+@dataclass
+class BackendHTTPConfig:
+    max_connections: int
+    max_keepalive_connections: int
+    connect_timeout: float
+    read_timeout: float
+
+
+def _backend_configs() -> Dict[str, BackendHTTPConfig]:
+    return {
+        # Self-hosted: few connections, generation can take minutes
+        "ollama": BackendHTTPConfig(
+            max_connections=settings.OLLAMA_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OLLAMA_MAX_CONNECTIONS,
+            connect_timeout=10.0,
+            read_timeout=float(settings.OLLAMA_TIMEOUT),
+        ),
+        "perplexity": BackendHTTPConfig(
+            max_connections=settings.PERPLEXITY_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.PERPLEXITY_MAX_CONNECTIONS,
+            connect_timeout=10.0,
+            read_timeout=120.0,
+        ),
+    }
+
+
+class HTTPClientPool:
+    """
+    Shared, keep-alive httpx.AsyncClient per backend
+
+    Connections (and TLS sessions) are reused across calls and requests,
+    HTTP/2 is negotiated when h2 is installed and the server supports it,
+    and every backend gets its own connection limit and timeouts.
+
+    An AsyncClient is bound to the event loop it runs on, so clients are kept
+    per loop; the API process normally has exactly one.
+    """
+
+    def __init__(self):
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def get(self, backend: str) -> httpx.AsyncClient:
+        """Pooled client for `backend` on the running event loop"""
+        loop = asyncio.get_running_loop()
+        clients = self._clients.setdefault(loop, {})
+
+        client = clients.get(backend)
+        if client is None or client.is_closed:
+            client = self._create(backend)
+            clients[backend] = client
+        return client
+
+    @staticmethod
+    def _create(backend: str) -> httpx.AsyncClient:
+        config = _backend_configs()[backend]
+        print(f"🔌 Creating pooled HTTP client for {backend} "
+              f"(max {config.max_connections} connections, HTTP/2: {HTTP2_AVAILABLE})")
+        return httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(config.read_timeout, connect=config.connect_timeout),
+        )
+
+    async def aclose(self):
+        """Close the clients of the running loop (app shutdown)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        for client in self._clients.pop(loop, {}).values():
+            await client.aclose()
+
+    def stats(self) -> Dict[str, Dict]:
+        return {
+            "http2_available": HTTP2_AVAILABLE,
+            "open_clients": sum(
+                1 for clients in list(self._clients.values()) for c in clients.values() if not c.is_closed
+            ),
+        }
+
+
+# Singleton instance
+http_clients = HTTPClientPool()
@@ -1,11 +1,12 @@
 import json
 import os
 from typing import Dict, Any, List
-from .llm_service import LLMService
+from .service_container import services
 
 class InterviewService:
     def __init__(self):
-        self.llm_service = LLMService()
+        # Shared, already-warm LLM backends
+        self.llm_service = services.llm_service()
     
     async def generate_interview_questions(self, jd_data: Dict[str, Any], difficulty_level: str = "medium-hard") -> List[str]:
         #Generaing interview questions based on JD skills and requirements
@@ -50,7 +51,7 @@ Make questions specific to {job_title} role and {skills_text} skills.
 
         try:
             print(f"Generating interview questions for {job_title}...")
-            response = await self.llm_service._make_api_call(prompt)
+            response = await self.llm_service.generate_text(prompt)
             
             # Trying to parse JSON response
             try:
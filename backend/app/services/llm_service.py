@@ -1,13 +1,58 @@
-import requests
+import asyncio
+import httpx
 import json
 import os
 from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
 import re
 from backend.app.config import settings
+from backend.app.services.circuit_breaker import Deadline, circuit_breakers
+from backend.app.services.http_client import http_clients
+from backend.app.services.llm_cache import llm_cache, make_cache_key
+from backend.app.services.rate_limiter import rate_limits
 
 load_dotenv()
 
+# Bump when the JD/resume extraction prompts change, so cached extractions
+# made with the old prompts are not reused
+JD_PROMPT_VERSION = "jd-v1"
+RESUME_PROMPT_VERSION = "resume-v1"
+REFINE_PROMPT_VERSION = "refine-v1"
+RESUME_FIELDS_PROMPT_VERSION = "resume-fields-v1"
+
+PROMPT_VERSIONS = {
+    "jd": JD_PROMPT_VERSION,
+    "resume": RESUME_PROMPT_VERSION,
+    "refine": REFINE_PROMPT_VERSION,
+    "resume_fields": RESUME_FIELDS_PROMPT_VERSION,
+}
+
+# Per-field JSON shape for partial resume extraction (tiered extraction's LLM tier)
+RESUME_FIELD_SCHEMA = {
+    "name": '"Full name"',
+    "email": '"email@example.com"',
+    "phone": '"phone number"',
+    "linkedin": '"LinkedIn URL or \'Not provided\'"',
+    "github": '"GitHub URL or \'Not provided\'"',
+    "portfolio": '"Portfolio URL or \'Not provided\'"',
+    "current_role": '"Current job title"',
+    "total_experience": '0',
+    "skills": '["skill1", "skill2", "skill3"]',
+    "education": '["degree1", "degree2"]',
+    "certifications": '["cert1", "cert2"]',
+    "experience_timeline": '[{"company": "Company name", "role": "Job title", "duration": "Time period", "technologies_used": ["tech1"]}]',
+}
+
+# Sampling temperature each backend uses for the structured extraction calls
+BACKEND_TEMPERATURES = {
+    "ollama": 0.1,
+    "agentic": 0.1,
+    "perplexity": 0.2,
+}
+
+# Backends whose HTTP requests go through TokenBucket.send (agentic calls are paced by their callers)
+HTTP_RATE_LIMITED_BACKENDS = ("ollama", "perplexity")
+
 
 class LLMService:
     
@@ -86,13 +131,98 @@ class LLMService:
         else:
             print("✅ Perplexity API configured with valid key")
     
+    def model_identity(self) -> str:
+        """Backend and model that answer extraction calls (part of the extraction cache key)"""
+        if self.use_ollama and self.ollama_service:
+            return f"ollama:{self.ollama_service.model}"
+        if self.use_agentic and self.agentic_available:
+            return f"agentic:{self._agentic_model()}"
+        return f"perplexity:{getattr(self, 'model', settings.PERPLEXITY_MODEL)}"
+    
+    def _agentic_model(self) -> str:
+        return getattr(getattr(self.agentic_service, 'llm', None), 'model', None) or settings.GROQ_MODEL
+    
+    async def _cached_call(self, backend: str, model: str, operation: str, inputs: tuple, call,
+                           deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """
+        Serve a structured LLM call from the response cache, or make it and cache the parsed result
+        
+        The key covers backend, model, prompt version, temperature and the inputs;
+        responses that failed to parse are never cached. Cache misses go through
+        the backend's circuit breaker within what is left of `deadline`.
+        """
+        if not settings.LLM_CACHE_ENABLED:
+            return await self._guarded(backend, call, deadline)
+        
+        key = make_cache_key(
+            backend, model, PROMPT_VERSIONS[operation], BACKEND_TEMPERATURES[backend], *inputs
+        )
+        cached = llm_cache.get(key)
+        if cached is not None:
+            print(f"♻️ LLM cache hit ({backend} {operation})")
+            return cached
+        
+        result = await self._guarded(backend, call, deadline)
+        if isinstance(result, dict) and "error" not in result:
+            llm_cache.put(key, result, backend=backend, operation=operation)
+        return result
+    
+    @staticmethod
+    async def _guarded(backend: str, call, deadline: Optional[Deadline] = None):
+        """
+        Run a backend call through its circuit breaker; an open circuit fails in microseconds
+
+        The rate-limit slot is taken once the breaker admits the call but
+        before it starts timing, so queueing for the budget is never seen as
+        a slow or failed backend (and waits no longer than the deadline allows).
+        """
+        timeout = deadline.remaining() if deadline else None
+        breaker = circuit_breakers.get(backend)
+        if backend not in HTTP_RATE_LIMITED_BACKENDS:
+            return await breaker.call(call, timeout=timeout)
+        bucket = rate_limits.get(backend)
+        with bucket.prepaid():
+            return await breaker.call(call, timeout=timeout, acquire=bucket.acquire_prepaid)
+    
+    @staticmethod
+    async def _run_agentic(method: str, *args) -> Dict[str, Any]:
+        """
+        CrewAI's kickoff() blocks, so agentic calls run on their own loop in a worker thread
+
+        Each worker thread drives its own EnhancedAgenticATSService: CrewAI
+        agents are not safe to share between threads.
+        """
+        def run():
+            from backend.app.services.service_container import services
+            return asyncio.run(getattr(services.agentic_service(), method)(*args))
+
+        return await asyncio.to_thread(run)
+    
+    async def generate_text(self, prompt: str) -> str:
+        """Free-form completion from Ollama, or Perplexity as the fallback"""
+        deadline = Deadline()
+        if self.use_ollama and self.ollama_service:
+            try:
+                return await self._guarded(
+                    "ollama", lambda: self.ollama_service._make_request(prompt, temperature=0.2), deadline
+                )
+            except Exception as e:
+                print(f"⚠️ Ollama failed: {e}")
+        
+        return await self._guarded("perplexity", lambda: self._make_api_call(prompt), deadline)
+    
     async def structure_job_description(self, jd_text: str) -> Dict[str, Any]:
         """Structure JD using Ollama, Agentic AI, or Perplexity"""
+        deadline = Deadline()  # shared by every backend tried below
         # Priority 1: Try Ollama first
         if self.use_ollama and self.ollama_service:
             try:
                 print("🤖 Using Ollama for JD analysis...")
-                return self.ollama_service.structure_job_description(jd_text)
+                return await self._cached_call(
+                    "ollama", self.ollama_service.model, "jd", (jd_text,),
+                    lambda: self.ollama_service.structure_job_description(jd_text),
+                    deadline
+                )
             except Exception as e:
                 print(f"⚠️ Ollama failed: {e}")
         
@@ -100,23 +230,36 @@ class LLMService:
         if self.use_agentic and self.agentic_available:
             try:
                 print("🤖 Using Agentic AI for JD analysis...")
-                return await self.agentic_service.analyze_job_description(jd_text)
+                return await self._cached_call(
+                    "agentic", self._agentic_model(), "jd", (jd_text,),
+                    lambda: self._run_agentic("analyze_job_description", jd_text),
+                    deadline
+                )
             except Exception as e:
                 print(f"⚠️ Agentic AI failed: {e}")
         
         # Priority 3: Fallback to Perplexity API
         if self.api_key:
-            return await self._structure_jd_perplexity(jd_text)
+            return await self._cached_call(
+                "perplexity", self.model, "jd", (jd_text,),
+                lambda: self._structure_jd_perplexity(jd_text),
+                deadline
+            )
             
         raise EnvironmentError("No functional AI backend (Ollama, Agentic AI, or Perplexity) available. Please check configuration.")
     
     async def extract_resume_information(self, resume_text: str) -> Dict[str, Any]:
         """Extract resume info using Ollama, Agentic AI, or Perplexity"""
+        deadline = Deadline()  # shared by every backend tried below
         # Priority 1: Try Ollama first
         if self.use_ollama and self.ollama_service:
             try:
                 print("🤖 Using Ollama for resume analysis...")
-                return self.ollama_service.extract_resume_information(resume_text)
+                return await self._cached_call(
+                    "ollama", self.ollama_service.model, "resume", (resume_text,),
+                    lambda: self.ollama_service.extract_resume_information(resume_text),
+                    deadline
+                )
             except Exception as e:
                 print(f"⚠️ Ollama failed: {e}")
         
@@ -124,24 +267,99 @@ class LLMService:
         if self.use_agentic and self.agentic_available:
             try:
                 print("🤖 Using Agentic AI for resume analysis...")
-                return await self.agentic_service.analyze_resume(resume_text)
+                return await self._cached_call(
+                    "agentic", self._agentic_model(), "resume", (resume_text,),
+                    lambda: self._run_agentic("analyze_resume", resume_text),
+                    deadline
+                )
             except Exception as e:
                 print(f"⚠️ Agentic AI failed: {e}")
         
         # Priority 3: Fallback to Perplexity API
         if self.api_key:
-            return await self._extract_resume_perplexity(resume_text)
+            return await self._cached_call(
+                "perplexity", self.model, "resume", (resume_text,),
+                lambda: self._extract_resume_perplexity(resume_text),
+                deadline
+            )
             
         raise EnvironmentError("No functional AI backend available for resume extraction.")
     
+    async def extract_resume_fields(self, resume_text: str, fields: List[str]) -> Dict[str, Any]:
+        """Extract only `fields` from a resume, with a prompt sized to those fields"""
+        deadline = Deadline()  # shared by every backend tried below
+        fields = [f for f in RESUME_FIELD_SCHEMA if f in fields]
+        schema = ",\n".join(f'    "{f}": {RESUME_FIELD_SCHEMA[f]}' for f in fields)
+        prompt = f"""Extract ONLY these fields from the resume and return them as JSON.
+
+Required JSON structure:
+{{
+{schema}
+}}
+
+Resume Text:
+{resume_text[:2000]}
+
+Return ONLY valid JSON.
+"""
+        
+        # Priority 1: Try Ollama first
+        if self.use_ollama and self.ollama_service:
+            try:
+                print(f"🤖 Using Ollama for resume fields: {', '.join(fields)}")
+                return await self._cached_call(
+                    "ollama", self.ollama_service.model, "resume_fields", (resume_text, fields),
+                    lambda: self._resume_fields_ollama(prompt),
+                    deadline
+                )
+            except Exception as e:
+                print(f"⚠️ Ollama failed: {e}")
+        
+        # Priority 2: Agentic AI has no partial mode; run the full extraction and keep the requested fields
+        if self.use_agentic and self.agentic_available:
+            try:
+                print("🤖 Using Agentic AI for resume analysis...")
+                full = await self._cached_call(
+                    "agentic", self._agentic_model(), "resume", (resume_text,),
+                    lambda: self._run_agentic("analyze_resume", resume_text),
+                    deadline
+                )
+                return {f: full[f] for f in fields if f in full}
+            except Exception as e:
+                print(f"⚠️ Agentic AI failed: {e}")
+        
+        # Priority 3: Fallback to Perplexity API
+        if self.api_key:
+            return await self._cached_call(
+                "perplexity", self.model, "resume_fields", (resume_text, fields),
+                lambda: self._resume_fields_perplexity(prompt),
+                deadline
+            )
+        
+        raise EnvironmentError("No functional AI backend available for resume extraction.")
+    
+    async def _resume_fields_ollama(self, prompt: str) -> Dict[str, Any]:
+        system_prompt = "You are an expert resume parser. Extract information accurately and return ONLY valid JSON."
+        response = await self.ollama_service._make_request(prompt, system_prompt, temperature=BACKEND_TEMPERATURES["ollama"])
+        return self.ollama_service._parse_json_response(response, "resume fields")
+    
+    async def _resume_fields_perplexity(self, prompt: str) -> Dict[str, Any]:
+        response = await self._make_api_call(prompt)
+        return json.loads(re.search(r'\{.*\}', response, re.DOTALL).group())
+    
     async def refine_structure_based_on_feedback(self, current_structure: Dict, feedback: str) -> Dict[str, Any]:
         """Refine the structured JD based on user feedback"""
+        deadline = Deadline()  # shared by every backend tried below
         
         # Priority 1: Try Ollama first
         if self.use_ollama and self.ollama_service:
             try:
                 print("🤖 Using Ollama for refinement...")
-                return self.ollama_service.refine_structure_based_on_feedback(current_structure, feedback)
+                return await self._cached_call(
+                    "ollama", self.ollama_service.model, "refine", (current_structure, feedback),
+                    lambda: self.ollama_service.refine_structure_based_on_feedback(current_structure, feedback),
+                    deadline
+                )
             except Exception as e:
                 print(f"⚠️ Ollama refinement failed: {e}")
         
@@ -149,22 +367,34 @@ class LLMService:
         if self.use_agentic and self.agentic_available:
             try:
                 print("🤖 Using Agentic AI for refinement...")
-                return await self.agentic_service.refine_job_description_structure(current_structure, feedback)
+                return await self._cached_call(
+                    "agentic", self._agentic_model(), "refine", (current_structure, feedback),
+                    lambda: self._run_agentic("refine_job_description_structure", current_structure, feedback),
+                    deadline
+                )
             except Exception as e:
                 print(f"⚠️ Agentic AI refinement failed: {e}")
         
         # Priority 3: Try Perplexity API
         if self.api_key:
             try:
-                print(f"🔄 Refining structure with Perplexity API...")
-                prompt = f"""Modify this job description structure based on user feedback.\n\nCurrent: {json.dumps(current_structure)}\nFeedback: {feedback}\n\nReturn ONLY valid JSON."""
-                response = await self._make_api_call(prompt)
-                return json.loads(re.search(r'\{.*\}', response, re.DOTALL).group())
+                return await self._cached_call(
+                    "perplexity", self.model, "refine", (current_structure, feedback),
+                    lambda: self._refine_perplexity(current_structure, feedback),
+                    deadline
+                )
             except Exception as e:
                 print(f"❌ Perplexity refinement failed: {str(e)}")
         
         raise EnvironmentError("No functional AI backend available for structure refinement.")
 
+    async def _refine_perplexity(self, current_structure: Dict, feedback: str) -> Dict[str, Any]:
+        """Refine JD structure using Perplexity API"""
+        print(f"🔄 Refining structure with Perplexity API...")
+        prompt = f"""Modify this job description structure based on user feedback.\n\nCurrent: {json.dumps(current_structure)}\nFeedback: {feedback}\n\nReturn ONLY valid JSON."""
+        response = await self._make_api_call(prompt)
+        return json.loads(re.search(r'\{.*\}', response, re.DOTALL).group())
+    
     async def _structure_jd_perplexity(self, jd_text: str) -> Dict[str, Any]:
         """Structure JD using Perplexity API"""
         if not self.api_key:
@@ -209,12 +439,12 @@ class LLMService:
         
         try:
             print(f"📡 Making Perplexity API call...")
-            response = requests.post(
+            client = http_clients.get("perplexity")
+            response = await rate_limits.get("perplexity").send(lambda: client.post(
                 self.base_url, 
                 headers=self.headers, 
-                json=payload, 
-                timeout=120
-            )
+                json=payload
+            ))
             
             print(f"📊 API Response Status: {response.status_code}")
             
@@ -227,8 +457,8 @@ class LLMService:
             result = response.json()
             return result['choices'][0]['message']['content']
         
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             raise Exception("API request timed out")
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             raise Exception(f"API request failed: {str(e)}")
     
@@ -1,10 +1,177 @@
-import spacy
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional, Pattern
+import hashlib
+import json
 import re
 from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import numpy as np
 import traceback
+from .model_registry import model_registry
+from .vector_cache import get_skill_vector_cache
+from .role_patterns import ROLE_DETECTION_PATTERNS, ROLE_SKILL_FALLBACKS, ROLE_INDEX
+
+
+# Bump whenever scoring logic changes: stored matching results carry it in
+# their fingerprint, so the next run rescores every resume
+ENGINE_VERSION = "engine-v3"
+
+# Share of a required skill's weight earned by a semantic (embedding) match
+SEMANTIC_MATCH_THRESHOLD = 0.8
+SEMANTIC_MATCH_CREDIT = 0.85
+
+
+def jd_fingerprint(jd_data: Dict, skills_weightage: Dict, scoring_mode: str) -> str:
+    """Hash of everything on the JD side that a matching result depends on"""
+    payload = json.dumps(
+        [ENGINE_VERSION, scoring_mode, jd_data or {}, skills_weightage or {}],
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def matching_fingerprint(jd_fp: str, resume_data: Dict) -> str:
+    """Fingerprint of one (resume, JD, weightage, engine) scoring"""
+    payload = json.dumps(resume_data or {}, sort_keys=True, default=str)
+    return hashlib.sha256(f"{jd_fp}:{payload}".encode("utf-8")).hexdigest()
+
+
+def rescore_skill_vectors(
+    vectors: List[Dict], experience_scores: List[float], skills_weightage: Dict
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Skills and overall scores of stored skill vectors under another skills weightage
+
+    Same arithmetic as score_resume - weighted skill credits over the required
+    skills, then the fresh-graduate penalty or the skills/experience average -
+    as one weighted dot product per resume, without spaCy or an LLM.
+    Vectors come from ATSScoreResult.skill_vector (see score_resume).
+    """
+    default_weights = {}
+    for vector in vectors:
+        for skill, (default_weight, _) in vector["skills"].items():
+            default_weights.setdefault(skill, default_weight)
+    columns = {skill: col for col, skill in enumerate(default_weights)}
+    weights = np.array(
+        [float(skills_weightage.get(skill, default)) for skill, default in default_weights.items()]
+    )
+
+    # credits[i, j]: share of skill j's weight resume i earns; required marks the JD's skills
+    # Filled with one scatter over the flattened vectors instead of a per-cell loop
+    lengths = [len(vector["skills"]) for vector in vectors]
+    cells = np.repeat(np.arange(len(vectors)) * len(columns), lengths) + np.fromiter(
+        (columns[skill] for vector in vectors for skill in vector["skills"]), dtype=np.intp, count=sum(lengths)
+    )
+    credits = np.zeros((len(vectors), len(columns)))
+    required = np.zeros((len(vectors), len(columns)))
+    credits.flat[cells] = np.fromiter(
+        (credit for vector in vectors for _, credit in vector["skills"].values()), dtype=float, count=sum(lengths)
+    )
+    required.flat[cells] = 1.0
+    # NaN: skills/experience average, a number: fresh-graduate penalty
+    penalties = np.array(
+        [np.nan if vector.get("penalty") is None else vector["penalty"] for vector in vectors], dtype=float
+    )
+
+    row_weights = required * weights
+    total_weight = row_weights.sum(axis=1)
+    earned = (row_weights * credits).sum(axis=1)
+    skills_scores = np.divide(earned, total_weight, out=np.zeros(len(vectors)), where=total_weight > 0) * 100
+    skills_scores = np.minimum(100, skills_scores)
+
+    fresh_graduate = ~np.isnan(penalties)
+    overall_scores = np.where(
+        fresh_graduate,
+        np.maximum(0, skills_scores - np.nan_to_num(penalties)),
+        (skills_scores + np.asarray(experience_scores, dtype=float)) / 2,
+    )
+    return skills_scores, np.clip(overall_scores, 0, 100)
+
+
+def experience_description(experience: Dict) -> str:
+    """Free text of a job: its description, else its responsibilities (a string or a list of lines)"""
+    description = experience.get('description') or experience.get('responsibilities') or ''
+    if isinstance(description, (list, tuple)):
+        return ' '.join(str(line) for line in description)
+    return str(description)
+
+
+# Technologies looked for in experience descriptions (compiled once at import)
+DESCRIPTION_TECH_PATTERNS = {
+    'python': ['python', 'django', 'flask', 'fastapi', 'pandas', 'numpy'],
+    'java': ['java', 'spring', 'hibernate', 'maven', 'jsp', 'spring boot'],
+    'javascript': ['javascript', 'js', 'node.js', 'nodejs', 'react', 'angular', 'vue'],
+    'dotnet': ['.net', 'c#', 'asp.net', 'mvc', 'entity framework'],
+    'php': ['php', 'laravel', 'codeigniter', 'symfony'],
+    'databases': ['mysql', 'postgresql', 'mongodb', 'redis', 'oracle', 'sql server'],
+    'cloud': ['aws', 'azure', 'gcp', 'google cloud'],
+    'devops': ['docker', 'kubernetes', 'jenkins', 'terraform', 'ci/cd'],
+    'web': ['html', 'css', 'bootstrap', 'sass'],
+    'mobile': ['android', 'ios', 'react native', 'flutter'],
+    'tools': ['git', 'github', 'jira', 'postman'],
+    'programming': ['programming', 'coding', 'development', 'software development']
+}
+
+
+def compile_word_patterns(words: List[str]) -> List[Tuple[str, Pattern]]:
+    """Whole-word regex for each keyword, paired with the keyword itself"""
+    return [(word, re.compile(r'\b' + re.escape(word.lower()) + r'\b')) for word in words]
+
+
+DESCRIPTION_TECH_REGEXES = compile_word_patterns(
+    [tech for techs in DESCRIPTION_TECH_PATTERNS.values() for tech in techs]
+)
+
+
+@dataclass
+class JDScoringPlan:
+    """
+    Everything the engine derives from the JD alone, compiled once per matching session
+
+    Build it with MatchingEngine.compile_jd_plan() and pass it to calculate_ats_score()
+    for every resume, so per-resume work only covers the resume side.
+    """
+    jd_experience_required: float
+    job_priorities: List[Dict]
+    required_skills: Dict[str, float]                # lowercased skill -> weight
+    priority_skills: set                             # lowercased key skills of all priorities
+    priority_skill_list: List[str]                   # same, in priority order (with repeats)
+    required_role_keywords: set
+    priority_skill_regexes: List[Tuple[str, Pattern]] = field(default_factory=list)
+    required_skill_matrix: Optional[np.ndarray] = None   # unit vectors, rows follow required_skills
+    required_skill_rows: Dict[str, int] = field(default_factory=dict)
+    default_skill_weights: Dict[str, float] = field(default_factory=dict)  # weights before skills_weightage
+
+
+@dataclass
+class ATSScoreResult:
+    """
+    Outcome of scoring one resume, with every component score the engine computed
+
+    Callers read the component scores from here instead of recomputing them.
+    """
+    overall_score: float = 0.0
+    skill_match_score: float = 0.0
+    experience_score: float = 0.0
+    qualification_score: Optional[float] = None
+    detailed_analysis: Dict = field(default_factory=dict)
+    rejected: bool = False
+    error: Optional[str] = None
+    # {"skills": {skill: [default weight, credit]}, "penalty": fresh-graduate penalty or None};
+    # lets rescore_skill_vectors re-rank under new weights without rescoring
+    skill_vector: Optional[Dict] = None
+
+    def to_dict(self) -> dict:
+        result = {
+            "overall_score": self.overall_score,
+            "skill_match_score": self.skill_match_score,
+            "experience_score": self.experience_score,
+        }
+        if self.qualification_score is not None:
+            result["qualification_score"] = self.qualification_score
+        result["detailed_analysis"] = self.detailed_analysis
+        return result
+
 
 class MatchingEngine:
     """
@@ -12,20 +179,97 @@ class MatchingEngine:
     Author: David Akpoviroro Oke (MrIridescent)
     Philosophy: Precision, Integrity, and Depth.
     """
-    def __init__(self):
-        """Initialize the enhanced matching engine with strict experience relevance"""
-        try:
-            try:
-                self.nlp = spacy.load("en_core_web_md")
-                print("spaCy medium model loaded successfully")
-            except OSError:
-                self.nlp = spacy.load("en_core_web_sm")
-                print("spaCy small model loaded as fallback")
-        except OSError:
-            print("spaCy model not found, using basic matching")
-            self.nlp = None
+    def __init__(self, nlp: Any = None, load_model: bool = True):
+        """
+        Initialize the enhanced matching engine with strict experience relevance
+
+        Args:
+            nlp: Optional spaCy pipeline. Defaults to the process-wide shared
+                 handle from the model registry (medium model, small as fallback),
+                 so constructing an engine never reloads the model.
+            load_model: False builds an engine without any pipeline (rule-based
+                 scoring only, e.g. role detection benchmarks)
+        """
+        if nlp is None and load_model:
+            nlp = model_registry.get_default()
+        self.nlp = nlp
+        # Shared LRU of unit vectors: similarity is a dot product, not a pipeline run
+        self.vector_cache = get_skill_vector_cache(self.nlp)
     
-    def calculate_ats_score(self, jd_data: dict, resume_data: dict, skills_weightage: dict, manual_priorities: List[Dict] = None) -> dict:
+    def compile_jd_plan(self, jd_data: dict, skills_weightage: dict, manual_priorities: List[Dict] = None) -> JDScoringPlan:
+        """Derive the JD-side scoring inputs once (priorities, skill weights, vectors, regexes)"""
+        jd_data = jd_data or {}
+        skills_weightage = skills_weightage or {}
+        
+        jd_experience_required = self._extract_experience_requirement(jd_data)
+        job_priorities = self._extract_job_priorities(jd_data, manual_priorities)
+        
+        # Required skills with their weightage (highest weight wins on repeats)
+        required_skills = {}
+        default_skill_weights = {}
+        for priority in job_priorities:
+            for skill in priority.get('key_skills', []):
+                skill_lower = skill.lower()
+                default_weight = float(priority.get('priority', 50))
+                weight = float(skills_weightage.get(skill_lower, default_weight))
+                required_skills[skill_lower] = max(required_skills.get(skill_lower, 0), weight)
+                default_skill_weights[skill_lower] = max(default_skill_weights.get(skill_lower, 0), default_weight)
+        
+        priority_skill_list = []
+        required_role_keywords = set()
+        for priority in job_priorities:
+            priority_skill_list.extend([skill.lower() for skill in priority.get('key_skills', [])])
+            # Role keywords without the common suffixes
+            role_name = priority['role'].lower()
+            required_role_keywords.update(role_name.replace(' developer', '').replace(' engineer', '').split())
+        
+        required_skill_matrix = None
+        if self.nlp and required_skills:
+            required_skill_matrix = self.vector_cache.matrix(list(required_skills))
+        
+        return JDScoringPlan(
+            jd_experience_required=jd_experience_required,
+            job_priorities=job_priorities,
+            required_skills=required_skills,
+            priority_skills=set(priority_skill_list),
+            priority_skill_list=priority_skill_list,
+            required_role_keywords=required_role_keywords,
+            priority_skill_regexes=compile_word_patterns(priority_skill_list),
+            required_skill_matrix=required_skill_matrix,
+            required_skill_rows={skill: row for row, skill in enumerate(required_skills)},
+            default_skill_weights=default_skill_weights,
+        )
+    
+    def complete_analysis(self, jd_data: dict, resume_data: dict, skills_weightage: dict, manual_priorities: List[Dict] = None, plan: JDScoringPlan = None) -> Dict:
+        """The skills/experience analysis sections a scores_only scoring left out"""
+        if plan is None:
+            plan = self.compile_jd_plan(jd_data or {}, skills_weightage, manual_priorities)
+        enhanced_resume_data = self._enhance_resume_data(resume_data or {}, plan)
+        return self._analysis_sections(enhanced_resume_data, plan, skills_weightage or {})
+    
+    def _enhance_resume_data(self, resume_data: dict, plan: JDScoringPlan) -> dict:
+        """Resume data with normalized skills and the relevance-enhanced experience timeline"""
+        enhanced_resume_data = resume_data.copy()
+        enhanced_resume_data['skills'] = self._extract_resume_skills(resume_data)
+        enhanced_resume_data['experience_timeline'] = self._enhance_experience_data(
+            resume_data, plan.job_priorities, plan)
+        return enhanced_resume_data
+    
+    def _analysis_sections(self, enhanced_resume_data: dict, plan: JDScoringPlan, skills_weightage: dict) -> Dict:
+        return {
+            "skills_analysis": self._get_complete_skills_analysis(
+                enhanced_resume_data, plan.job_priorities, skills_weightage
+            ),
+            "experience_analysis": self._get_enhanced_experience_analysis(
+                enhanced_resume_data, plan.job_priorities, plan.jd_experience_required
+            ),
+        }
+    
+    def calculate_ats_score(self, jd_data: dict, resume_data: dict, skills_weightage: dict, manual_priorities: List[Dict] = None, plan: JDScoringPlan = None) -> dict:
+        """ATS score as a plain dict (see score_resume for the structured result)"""
+        return self.score_resume(jd_data, resume_data, skills_weightage, manual_priorities, plan).to_dict()
+    
+    def score_resume(self, jd_data: dict, resume_data: dict, skills_weightage: dict, manual_priorities: List[Dict] = None, plan: JDScoringPlan = None, scores_only: bool = False) -> ATSScoreResult:
         """
         Calculate ATS score with STRICT experience relevance matching
         
@@ -33,6 +277,13 @@ class MatchingEngine:
         - Candidates without relevant job role experience get 0 overall score
         - Only experience in matching roles contributes to scoring
         - Universal system works for any job description
+        
+        Pass a precompiled `plan` (see compile_jd_plan) when scoring many resumes
+        against the same JD; it takes precedence over skills_weightage/manual_priorities.
+        
+        With scores_only, detailed_analysis leaves out the skills and experience
+        analysis sections (marked "analysis_pending"); complete_analysis() builds
+        them later for the candidates someone actually opens.
         """
         
         print(f"\n{'='*70}")
@@ -40,24 +291,23 @@ class MatchingEngine:
         print(f"{'='*70}\n")
         
         if not jd_data or not resume_data:
-            return self._get_default_score("Missing JD or resume data")
+            return self._get_default_result("Missing JD or resume data")
         
         try:
-            # STEP 1: Extract JD Requirements
-            jd_experience_required = self._extract_experience_requirement(jd_data)
-            job_priorities = self._extract_job_priorities(jd_data, manual_priorities)
+            # STEP 1: JD Requirements (compiled once per session when a plan is passed in)
+            if plan is None:
+                plan = self.compile_jd_plan(jd_data, skills_weightage, manual_priorities)
+            jd_experience_required = plan.jd_experience_required
+            job_priorities = plan.job_priorities
             
             print(f"📋 JD Analysis:")
             print(f"   Required Experience: {jd_experience_required} years")
             print(f"   Job Priorities: {[(p['role'], p['priority']) for p in job_priorities]}")
             
             # STEP 2: Extract and Enhance Resume Data
-            resume_skills = self._extract_resume_skills(resume_data)
-            enhanced_experience = self._enhance_experience_data(resume_data, job_priorities)
-            
-            enhanced_resume_data = resume_data.copy()
-            enhanced_resume_data['skills'] = resume_skills
-            enhanced_resume_data['experience_timeline'] = enhanced_experience
+            enhanced_resume_data = self._enhance_resume_data(resume_data, plan)
+            resume_skills = enhanced_resume_data['skills']
+            enhanced_experience = enhanced_resume_data['experience_timeline']
             
             print(f"\n👤 Resume Analysis:")
             print(f"   Total Experience: {resume_data.get('total_experience', 0)} years")
@@ -66,7 +316,7 @@ class MatchingEngine:
             
             # STEP 3: Calculate Relevant Experience (CRITICAL)
             relevant_experience_years, relevance_details = self._calculate_relevant_experience(
-                enhanced_experience, job_priorities)
+                enhanced_experience, job_priorities, plan)
             
             print(f"\n🎯 RELEVANT EXPERIENCE CHECK:")
             print(f"   Total Relevant Experience: {relevant_experience_years:.1f} years")
@@ -77,12 +327,13 @@ class MatchingEngine:
                 print(f"\n❌ REJECTED: No relevant job role experience found")
                 print(f"   Candidate has no experience matching: {[p['role'] for p in job_priorities]}")
                 
-                return {
-                    "overall_score": 0.0,
-                    "skill_match_score": 0.0,
-                    "experience_score": 0.0,
-                    "qualification_score": 0.0,
-                    "detailed_analysis": {
+                return ATSScoreResult(
+                    overall_score=0.0,
+                    skill_match_score=0.0,
+                    experience_score=0.0,
+                    qualification_score=0.0,
+                    rejected=True,
+                    detailed_analysis={
                         "rejection_reason": "No relevant job role experience",
                         "required_roles": [p['role'] for p in job_priorities],
                         "candidate_experience": [
@@ -96,32 +347,35 @@ class MatchingEngine:
                         "relevant_experience_years": 0.0,
                         "matching_jobs_count": 0
                     }
-                }
+                )
             
             # STEP 5: Calculate Scores (only for candidates with relevant experience)
             print(f"\n✅ QUALIFIED: Candidate has relevant experience")
             
-            # Skills Score (0-100)
+            # Skills Score (0-100), keeping each required skill's credit for the skill vector
+            skill_credits = {}
             skills_score = self._calculate_complete_skills_score(
-                enhanced_resume_data, job_priorities, skills_weightage
+                enhanced_resume_data, job_priorities, skills_weightage, plan, skill_credits
             )
             
             # Experience Score (0-100) - considers ONLY relevant experience
             experience_score = self._calculate_enhanced_experience_score_v2(
                 enhanced_resume_data, job_priorities, jd_experience_required,
-                relevant_experience_years, relevance_details
+                relevant_experience_years, relevance_details, plan
             )
             
             # STEP 6: Final Score Calculation
             total_experience = resume_data.get('total_experience', 0)
             is_fresh_graduate = (total_experience == 0 or not enhanced_experience)
             
+            penalty = None
             if is_fresh_graduate:
                 if jd_experience_required > 0:
                     penalty = min(30, jd_experience_required * 10)
                     final_score = max(0, skills_score - penalty)
                     score_method = f"Skills-Based with {penalty}% experience penalty"
                 else:
+                    penalty = 0
                     final_score = skills_score
                     score_method = "Skills-Based (No experience required)"
             else:
@@ -149,12 +403,6 @@ class MatchingEngine:
                     "matching_jobs": relevance_details['matching_jobs'],
                     "matching_jobs_count": relevance_details['matching_jobs_count']
                 },
-                "skills_analysis": self._get_complete_skills_analysis(
-                    enhanced_resume_data, job_priorities, skills_weightage
-                ),
-                "experience_analysis": self._get_enhanced_experience_analysis(
-                    enhanced_resume_data, job_priorities, jd_experience_required
-                ),
                 "scoring_breakdown": {
                     "skills_score": round(skills_score, 2),
                     "experience_score": round(experience_score, 2),
@@ -163,26 +411,38 @@ class MatchingEngine:
                     "meets_experience_requirement": relevant_experience_years >= jd_experience_required
                 }
             }
+            if scores_only:
+                detailed_analysis["analysis_pending"] = True
+            else:
+                detailed_analysis.update(self._analysis_sections(enhanced_resume_data, plan, skills_weightage))
             
             print(f"{'='*70}\n")
             
-            return {
-                "overall_score": round(min(100, max(0, final_score)), 2),
-                "skill_match_score": round(skills_score, 2),
-                "experience_score": round(experience_score, 2),
-                "qualification_score": 75.0,
-                "detailed_analysis": detailed_analysis
-            }
+            return ATSScoreResult(
+                overall_score=round(min(100, max(0, final_score)), 2),
+                skill_match_score=round(skills_score, 2),
+                experience_score=round(experience_score, 2),
+                qualification_score=75.0,
+                detailed_analysis=detailed_analysis,
+                skill_vector={
+                    "skills": {
+                        skill: [plan.default_skill_weights.get(skill, weight), skill_credits.get(skill, 0.0)]
+                        for skill, weight in plan.required_skills.items()
+                    },
+                    "penalty": penalty,
+                } if plan.required_skills else None,
+            )
             
         except Exception as e:
             print(f"❌ Error in matching calculation: {str(e)}")
             traceback.print_exc()
-            return self._get_default_score(str(e))
+            return self._get_default_result(str(e))
     
     def _calculate_relevant_experience(
         self, 
         experience_timeline: List[Dict], 
-        job_priorities: List[Dict]
+        job_priorities: List[Dict],
+        plan: JDScoringPlan = None
     ) -> Tuple[float, Dict]:
         """
         Calculate ONLY relevant experience that matches JD requirements
@@ -200,17 +460,21 @@ class MatchingEngine:
             })
         
         # Collect all required role keywords from priorities
-        required_role_keywords = set()
-        priority_skills = set()
-        
-        for priority in job_priorities:
-            role_name = priority['role'].lower()
-            key_skills = [skill.lower() for skill in priority['key_skills']]
+        if plan is not None:
+            required_role_keywords = plan.required_role_keywords
+            priority_skills = plan.priority_skills
+        else:
+            required_role_keywords = set()
+            priority_skills = set()
             
-            # Extract role keywords (remove common suffixes)
-            role_keywords = role_name.replace(' developer', '').replace(' engineer', '').split()
-            required_role_keywords.update(role_keywords)
-            priority_skills.update(key_skills)
+            for priority in job_priorities:
+                role_name = priority['role'].lower()
+                key_skills = [skill.lower() for skill in priority['key_skills']]
+                
+                # Extract role keywords (remove common suffixes)
+                role_keywords = role_name.replace(' developer', '').replace(' engineer', '').split()
+                required_role_keywords.update(role_keywords)
+                priority_skills.update(key_skills)
         
         print(f"\n🔍 Required Role Keywords: {required_role_keywords}")
         print(f"🔍 Priority Skills: {list(priority_skills)[:10]}")
@@ -292,7 +556,8 @@ class MatchingEngine:
         job_priorities: List[Dict],
         jd_experience_required: float,
         relevant_experience_years: float,
-        relevance_details: Dict
+        relevance_details: Dict,
+        plan: JDScoringPlan = None
     ) -> float:
         """
         Calculate experience score based ONLY on relevant experience
@@ -320,7 +585,7 @@ class MatchingEngine:
         
         # COMPONENT 3: Recent/Current Relevant Experience Bonus (20% weight)
         recency_score = self._calculate_recent_experience_bonus_v2(
-            resume_data.get('experience_timeline', []), job_priorities
+            resume_data.get('experience_timeline', []), job_priorities, plan
         )
         
         # Final calculation
@@ -369,7 +634,8 @@ class MatchingEngine:
     def _calculate_recent_experience_bonus_v2(
         self, 
         experience_timeline: List[Dict], 
-        job_priorities: List[Dict]
+        job_priorities: List[Dict],
+        plan: JDScoringPlan = None
     ) -> float:
         """Calculate bonus for current/recent relevant experience"""
         
@@ -380,9 +646,12 @@ class MatchingEngine:
         max_bonus = 0.0
         
         # Collect priority skills
-        priority_skills = set()
-        for priority in job_priorities:
-            priority_skills.update([s.lower() for s in priority['key_skills']])
+        if plan is not None:
+            priority_skills = plan.priority_skills
+        else:
+            priority_skills = set()
+            for priority in job_priorities:
+                priority_skills.update([s.lower() for s in priority['key_skills']])
         
         for exp in experience_timeline:
             exp_duration = exp.get('duration', '').lower()
@@ -488,16 +757,21 @@ class MatchingEngine:
         return normalized_skills
     
     # Enhance Experience Data
-    def _enhance_experience_data(self, resume_data: Dict, job_priorities: List[Dict]) -> List[Dict]:
+    def _enhance_experience_data(self, resume_data: Dict, job_priorities: List[Dict], plan: JDScoringPlan = None) -> List[Dict]:
         """Enhance experience data by analyzing job descriptions for technologies"""
         
         experience_timeline = resume_data.get('experience_timeline', [])
         enhanced_timeline = []
         
         # Collect all priority skills for matching
-        all_priority_skills = []
-        for priority in job_priorities:
-            all_priority_skills.extend([skill.lower() for skill in priority.get('key_skills', [])])
+        if plan is not None:
+            all_priority_skills = plan.priority_skill_list
+            skill_regexes = plan.priority_skill_regexes
+        else:
+            all_priority_skills = []
+            for priority in job_priorities:
+                all_priority_skills.extend([skill.lower() for skill in priority.get('key_skills', [])])
+            skill_regexes = compile_word_patterns(all_priority_skills)
         
         for experience in experience_timeline:
             enhanced_exp = experience.copy()
@@ -511,9 +785,10 @@ class MatchingEngine:
             existing_techs.update(title_techs)
             
             # Analyze job description for technologies (if available)
-            job_description = experience.get('description', '') or experience.get('responsibilities', '')
+            job_description = experience_description(experience)
             if job_description:
-                desc_techs = self._extract_technologies_from_description(job_description, all_priority_skills)
+                desc_techs = self._extract_technologies_from_description(
+                    job_description, all_priority_skills, skill_regexes)
                 existing_techs.update(desc_techs)
             
             # Update technologies used
@@ -552,7 +827,9 @@ class MatchingEngine:
         
         return found_techs
     
-    def _extract_technologies_from_description(self, description: str, priority_skills: List[str]) -> List[str]:
+    def _extract_technologies_from_description(
+        self, description: str, priority_skills: List[str], skill_regexes: List[Tuple[str, Pattern]] = None
+    ) -> List[str]:
         # Extracting technologies from job description text
         
         if not description:
@@ -561,33 +838,16 @@ class MatchingEngine:
         desc_lower = description.lower()
         found_techs = []
         
-        # Enhanced technology patterns
-        tech_patterns = {
-            'python': ['python', 'django', 'flask', 'fastapi', 'pandas', 'numpy'],
-            'java': ['java', 'spring', 'hibernate', 'maven', 'jsp', 'spring boot'],
-            'javascript': ['javascript', 'js', 'node.js', 'nodejs', 'react', 'angular', 'vue'],
-            'dotnet': ['.net', 'c#', 'asp.net', 'mvc', 'entity framework'],
-            'php': ['php', 'laravel', 'codeigniter', 'symfony'],
-            'databases': ['mysql', 'postgresql', 'mongodb', 'redis', 'oracle', 'sql server'],
-            'cloud': ['aws', 'azure', 'gcp', 'google cloud'],
-            'devops': ['docker', 'kubernetes', 'jenkins', 'terraform', 'ci/cd'],
-            'web': ['html', 'css', 'bootstrap', 'sass'],
-            'mobile': ['android', 'ios', 'react native', 'flutter'],
-            'tools': ['git', 'github', 'jira', 'postman'],
-            'programming': ['programming', 'coding', 'development', 'software development']
-        }
-        
         # Searching for all technology patterns
-        for category, techs in tech_patterns.items():
-            for tech in techs:
-                pattern = r'\b' + re.escape(tech.lower()) + r'\b'
-                if re.search(pattern, desc_lower):
-                    found_techs.append(tech)
+        for tech, regex in DESCRIPTION_TECH_REGEXES:
+            if regex.search(desc_lower):
+                found_techs.append(tech)
         
         # Searching for priority skills specifically
-        for skill in priority_skills:
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(pattern, desc_lower):
+        if skill_regexes is None:
+            skill_regexes = compile_word_patterns(priority_skills)
+        for skill, regex in skill_regexes:
+            if regex.search(desc_lower):
                 found_techs.append(skill)
         
         # Remove duplicates
@@ -598,18 +858,47 @@ class MatchingEngine:
         if not self.nlp or not text1 or not text2:
             return 0.0
             
-        doc1 = self.nlp(text1.lower())
-        doc2 = self.nlp(text2.lower())
+        similarity = self.vector_cache.similarity(text1, text2)
         
-        if not doc1.has_vector or not doc2.has_vector:
+        if similarity is None:
             # Fallback to simple matching if vectors are missing
             return 1.0 if text1.lower() == text2.lower() else 0.0
             
-        return float(doc1.similarity(doc2))
+        return similarity
+
+    def _skill_similarity_matrix(self, required_skills: List[str], resume_skills: List[str], plan: JDScoringPlan = None):
+        """
+        Cosine similarity of every required skill against every resume skill
+
+        Returns an R x S matrix (one BLAS call over unit vectors) or None when
+        there is no spaCy model or nothing to compare. Row-wise argmax picks the
+        first best resume skill, exactly like the old pairwise loop. With a plan,
+        the required-skill rows come from its precomputed matrix.
+        """
+        if not self.nlp or not required_skills or not resume_skills:
+            return None
+        
+        if plan is not None and plan.required_skill_matrix is not None:
+            rows = [plan.required_skill_rows[skill] for skill in required_skills]
+            required_matrix = plan.required_skill_matrix[rows]
+        else:
+            required_matrix = self.vector_cache.matrix(required_skills)
+        resume_matrix = self.vector_cache.matrix(resume_skills)
+        if required_matrix is None or resume_matrix is None:
+            return None
+        
+        return required_matrix @ resume_matrix.T
 
     # SCORE 1: Complete Skills Matching
-    def _calculate_complete_skills_score(self, resume_data: Dict, job_priorities: List[Dict], skills_weightage: Dict) -> float:
-        """Calculate skills score with enhanced semantic matching (0-100 points)"""
+    def _calculate_complete_skills_score(self, resume_data: Dict, job_priorities: List[Dict], skills_weightage: Dict, plan: JDScoringPlan = None, skill_credits: Dict = None) -> float:
+        """
+        Calculate skills score with enhanced semantic matching (0-100 points)
+
+        Pass a dict as `skill_credits` to receive each required skill's credit:
+        1.0 direct match, SEMANTIC_MATCH_CREDIT semantic match, 0.0 missing.
+        """
+        if skill_credits is None:
+            skill_credits = {}
         
         resume_skills = resume_data.get('skills', [])
         if not resume_skills:
@@ -619,13 +908,16 @@ class MatchingEngine:
         print(f"SKILLS SCORING (Semantic Enhanced):")
         
         # Collect all required skills with their weightage
-        required_skills = {}
-        for priority in job_priorities:
-            for skill in priority.get('key_skills', []):
-                skill_lower = skill.lower()
-                # Get weight from weightage dict or default to priority level
-                weight = float(skills_weightage.get(skill_lower, priority.get('priority', 50)))
-                required_skills[skill_lower] = max(required_skills.get(skill_lower, 0), weight)
+        if plan is not None:
+            required_skills = plan.required_skills
+        else:
+            required_skills = {}
+            for priority in job_priorities:
+                for skill in priority.get('key_skills', []):
+                    skill_lower = skill.lower()
+                    # Get weight from weightage dict or default to priority level
+                    weight = float(skills_weightage.get(skill_lower, priority.get('priority', 50)))
+                    required_skills[skill_lower] = max(required_skills.get(skill_lower, 0), weight)
         
         if not required_skills:
             return 80.0 # Default if no requirements found
@@ -635,27 +927,36 @@ class MatchingEngine:
         
         resume_skills_lower = [s.lower() for s in resume_skills]
         
+        # All semantic similarities for the unmatched skills in a single matmul
+        unmatched_skills = [s for s in required_skills if s not in resume_skills_lower]
+        similarity_matrix = self._skill_similarity_matrix(unmatched_skills, resume_skills_lower, plan)
+        unmatched_rows = {skill: row for row, skill in enumerate(unmatched_skills)}
+        
         for req_skill, weight in required_skills.items():
             # 1. Direct Match (100% of weight)
             if req_skill in resume_skills_lower:
                 weighted_score += weight
+                skill_credits[req_skill] = 1.0
                 print(f"   ✅ Direct Match: {req_skill} (+{weight})")
                 continue
                 
             # 2. Semantic Match (85% of weight if similarity > 0.8)
             best_sim = 0.0
             best_match = ""
-            for res_skill in resume_skills_lower:
-                sim = self._calculate_semantic_similarity(req_skill, res_skill)
-                if sim > best_sim:
-                    best_sim = sim
-                    best_match = res_skill
-            
-            if best_sim > 0.8:
-                sim_weight = weight * 0.85
+            if similarity_matrix is not None:
+                row = similarity_matrix[unmatched_rows[req_skill]]
+                best_index = int(np.argmax(row))
+                if row[best_index] > best_sim:
+                    best_sim = float(row[best_index])
+                    best_match = resume_skills_lower[best_index]
+            
+            if best_sim > SEMANTIC_MATCH_THRESHOLD:
+                sim_weight = weight * SEMANTIC_MATCH_CREDIT
                 weighted_score += sim_weight
+                skill_credits[req_skill] = SEMANTIC_MATCH_CREDIT
                 print(f"   💡 Semantic Match: {req_skill} <-> {best_match} (Sim: {best_sim:.2f}, +{sim_weight:.1f})")
             else:
+                skill_credits[req_skill] = 0.0
                 print(f"   ❌ No Match: {req_skill}")
                 
         final_skill_score = (weighted_score / total_weight) * 100
@@ -938,7 +1239,7 @@ class MatchingEngine:
                             role_match_score += 1  # Other relevant keywords
                 
                 # Level 3: Job description analysis (if available)
-                job_description = experience.get('description', '') or experience.get('responsibilities', '')
+                job_description = experience_description(experience)
                 if job_description:
                     desc_lower = job_description.lower()
                     for skill in key_skills:
@@ -1191,10 +1492,8 @@ class MatchingEngine:
         # spaCy semantic similarity
         if self.nlp:
             try:
-                doc1 = self.nlp(skill1)
-                doc2 = self.nlp(skill2)
-                similarity = doc1.similarity(doc2)
-                return similarity > 0.85 
+                similarity = self.vector_cache.similarity(skill1, skill2)
+                return similarity is not None and similarity > 0.85
             except:
                 pass
         
@@ -1386,2029 +1685,33 @@ class MatchingEngine:
         priorities = []
         
         # DYNAMIC ROLE DETECTION All roles compete for Priority 1
-        role_detection_patterns = [
-           
-    {
-        'role': 'Python Developer',
-        'key_skills': ['python', 'django', 'flask', 'fastapi', 'pandas', 'numpy'],
-        'patterns': ['python developer', 'python', 'django', 'flask', 'fastapi'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Java Developer',
-        'key_skills': ['java', 'spring', 'hibernate', 'jsp', 'maven', 'spring boot'],
-        'patterns': ['java developer', 'java', 'spring', 'j2ee', 'jsp', 'spring boot'],
-        'weight': 1.0
-    },
-    {
-        'role': '.NET Developer',
-        'key_skills': ['c#', '.net', 'asp.net', 'sql server', 'mvc', 'entity framework'],
-        'patterns': ['.net developer', '.net', 'dotnet', 'c#', 'asp.net', 'mvc'],
-        'weight': 1.0
-    },
-    {
-        'role': 'JavaScript Developer',
-        'key_skills': ['javascript', 'react', 'angular', 'vue', 'node.js', 'express'],
-        'patterns': ['javascript developer', 'js developer', 'react developer', 'angular developer', 'node.js', 'frontend developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'PHP Developer',
-        'key_skills': ['php', 'laravel', 'codeigniter', 'symfony', 'mysql', 'wordpress'],
-        'patterns': ['php developer', 'php', 'laravel', 'codeigniter', 'wordpress'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Ruby Developer',
-        'key_skills': ['ruby', 'ruby on rails', 'rails', 'rspec', 'postgresql'],
-        'patterns': ['ruby developer', 'ruby', 'rails', 'ruby on rails'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Go Developer',
-        'key_skills': ['go', 'golang', 'gin', 'gorilla', 'postgresql', 'redis'],
-        'patterns': ['go developer', 'golang developer', 'go', 'golang'],
-        'weight': 1.0
-    },
-    {
-        'role': 'DevOps Engineer',
-        'key_skills': ['docker', 'kubernetes', 'jenkins', 'terraform', 'aws', 'azure'],
-        'patterns': ['devops engineer', 'devops', 'infrastructure engineer', 'cloud engineer', 'docker', 'kubernetes'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Data Scientist',
-        'key_skills': ['python', 'machine learning', 'pandas', 'numpy', 'tensorflow', 'pytorch'],
-        'patterns': ['data scientist', 'machine learning engineer', 'ml engineer', 'data analyst'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Mobile Developer',
-        'key_skills': ['android', 'ios', 'react native', 'flutter', 'swift', 'kotlin'],
-        'patterns': ['mobile developer', 'android developer', 'ios developer', 'react native', 'flutter'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Full Stack Developer',
-        'key_skills': ['javascript', 'react', 'node.js', 'python', 'django', 'postgresql'],
-        'patterns': ['full stack developer', 'fullstack developer', 'full-stack developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Frontend Developer',
-        'key_skills': ['html', 'css', 'javascript', 'react', 'angular', 'vue'],
-        'patterns': ['frontend developer', 'front-end developer', 'ui developer', 'web developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Backend Developer',
-        'key_skills': ['api', 'database', 'microservices', 'rest', 'sql', 'nosql'],
-        'patterns': ['backend developer', 'back-end developer', 'api developer', 'server developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'QA Engineer',
-        'key_skills': ['testing', 'automation', 'selenium', 'junit', 'pytest', 'cypress'],
-        'patterns': ['qa engineer', 'quality assurance', 'test engineer', 'automation engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Business Analyst',
-        'key_skills': ['business analysis', 'requirement gathering', 'stakeholder management', 'documentation', 'process analysis', 'data analysis'],
-        'patterns': ['business analyst', 'ba ', 'requirements analyst', 'systems analyst', 'process analyst'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Project Manager',
-        'key_skills': ['project management', 'agile', 'scrum', 'stakeholder management', 'planning', 'coordination'],
-        'patterns': ['project manager', 'program manager', 'delivery manager', 'scrum master'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Data Analyst',
-        'key_skills': ['data analysis', 'excel', 'power bi', 'sql', 'reporting', 'dashboard'],
-        'patterns': ['data analyst', 'business intelligence', 'reporting analyst', 'data scientist'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Cloud Engineer',
-        'key_skills': ['aws', 'azure', 'gcp', 'cloudformation', 'terraform', 'cloud architecture'],
-        'patterns': ['cloud engineer', 'aws engineer', 'azure engineer', 'cloud solutions architect', 'gcp engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'AI/ML Engineer',
-        'key_skills': ['machine learning', 'deep learning', 'tensorflow', 'pytorch', 'scikit-learn', 'nlp'],
-        'patterns': ['ai engineer', 'ml engineer', 'machine learning engineer', 'deep learning engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Cybersecurity Engineer',
-        'key_skills': ['security', 'network security', 'penetration testing', 'firewalls', 'siem', 'vulnerability assessment'],
-        'patterns': ['cybersecurity', 'security engineer', 'information security', 'infosec', 'network security'],
-        'weight': 1.0
-    },
-    {
-        'role': 'UI/UX Designer',
-        'key_skills': ['ux', 'ui', 'figma', 'adobe xd', 'prototyping', 'user research'],
-        'patterns': ['ui designer', 'ux designer', 'ui/ux', 'user experience designer', 'interaction designer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Database Administrator',
-        'key_skills': ['sql', 'oracle', 'mysql', 'postgresql', 'database administration', 'performance tuning'],
-        'patterns': ['dba', 'database administrator', 'sql dba', 'oracle dba'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Site Reliability Engineer',
-        'key_skills': ['sre', 'monitoring', 'incident management', 'prometheus', 'grafana', 'reliability engineering'],
-        'patterns': ['site reliability engineer', 'sre', 'system reliability', 'infrastructure reliability'],
-        'weight': 1.0
-    },
-    {
-        'role': 'System Administrator',
-        'key_skills': ['linux', 'windows server', 'networking', 'bash', 'powershell', 'active directory'],
-        'patterns': ['system administrator', 'sysadmin', 'windows admin', 'linux admin'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Game Developer',
-        'key_skills': ['unity', 'unreal engine', 'c++', 'c#', 'game design', '3d graphics'],
-        'patterns': ['game developer', 'unity developer', 'unreal developer', 'game programmer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Blockchain Developer',
-        'key_skills': ['solidity', 'ethereum', 'smart contracts', 'web3', 'blockchain', 'nfts'],
-        'patterns': ['blockchain developer', 'smart contract developer', 'solidity', 'web3 developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Embedded Systems Engineer',
-        'key_skills': ['embedded c', 'firmware', 'microcontrollers', 'rtos', 'iot', 'c++'],
-        'patterns': ['embedded engineer', 'embedded systems', 'firmware engineer', 'iot developer'],
-        'weight': 1.0
-    }, {
-    'role': 'ETL Developer',
-    'key_skills': ['etl', 'informatica', 'data warehousing', 'ssis', 'data pipelines', 'sql'],
-    'patterns': ['etl developer', 'data warehouse developer', 'data integration', 'ssis developer'],
-    'weight': 1.0
-    },
-    {
-    'role': 'Product Architect',
-    'key_skills': ['product architecture', 'system design', 'product strategy', 'technical leadership', 'requirement analysis'],
-    'patterns': ['product architect', 'product architecture', 'technical product architect'],
-    'weight': 1.0
-    },
-    {
-    'role': 'Software Architect',
-    'key_skills': ['software architecture', 'system design', 'microservices', 'design patterns', 'scalability', 'performance tuning'],
-    'patterns': ['software architect', 'technical architect', 'solution designer', 'system architect'],
-    'weight': 1.0
-    },
-    {
-        'role': 'Business Development Executive',
-        'key_skills': ['business development', 'sales', 'lead generation', 'client acquisition', 'negotiation', 'partnerships'],
-        'patterns': ['business development executive', 'bde', 'business development', 'sales executive', 'client acquisition'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Sales Executive',
-        'key_skills': ['sales', 'lead generation', 'cold calling', 'negotiation', 'crm', 'relationship management'],
-        'patterns': ['sales executive', 'sales associate', 'sales representative', 'sales manager'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Business Associate',
-        'key_skills': ['business development', 'market research', 'sales', 'partnerships', 'communication'],
-        'patterns': ['business associate', 'business partner', 'associate - business development'],
-        'weight': 1.0
-    },
-    {
-        'role': 'MERN Stack Developer',
-        'key_skills': ['mongodb', 'express', 'react', 'node.js', 'javascript', 'fullstack'],
-        'patterns': ['mern stack developer', 'mern developer', 'mern'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Quality Analyst',
-        'key_skills': ['quality analysis', 'manual testing', 'automation testing', 'bug tracking', 'test cases'],
-        'patterns': ['quality analyst', 'qa analyst', 'quality analysis', 'qa tester'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Graphic Designer',
-        'key_skills': ['graphic design', 'photoshop', 'illustrator', 'corel draw', 'creativity', 'branding'],
-        'patterns': ['graphic designer', 'visual designer', 'graphics', 'creative designer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Android Developer',
-        'key_skills': ['android', 'java', 'kotlin', 'mobile apps', 'android studio'],
-        'patterns': ['android developer', 'android engineer', 'mobile android'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Flutter Developer',
-        'key_skills': ['flutter', 'dart', 'mobile development', 'cross-platform', 'firebase'],
-        'patterns': ['flutter developer', 'flutter engineer', 'flutter mobile'],
-        'weight': 1.0
-    },
-    {
-        'role': 'React Native Developer',
-        'key_skills': ['react native', 'javascript', 'mobile apps', 'ios', 'android'],
-        'patterns': ['react native developer', 'rn developer', 'reactnative'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Laravel Developer',
-        'key_skills': ['php', 'laravel', 'mysql', 'eloquent', 'backend development'],
-        'patterns': ['laravel developer', 'php laravel', 'laravel'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Office Administrative Executive',
-        'key_skills': ['administration', 'office management', 'coordination', 'documentation', 'ms office'],
-        'patterns': ['administrative executive', 'office executive', 'admin executive', 'office administrator'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Sales and Marketing Executive',
-        'key_skills': ['sales', 'marketing', 'digital marketing', 'business development', 'crm', 'advertising'],
-        'patterns': ['sales and marketing executive', 'sales & marketing', 'marketing executive'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Blue Prism Developer',
-        'key_skills': ['rpa', 'blue prism', 'automation', 'process automation', 'bots'],
-        'patterns': ['blue prism developer', 'rpa blue prism', 'automation developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Database Management Specialist',
-        'key_skills': ['database management', 'sql', 'mysql', 'oracle', 'postgresql', 'data migration'],
-        'patterns': ['database management', 'dbms specialist', 'database support'],
-        'weight': 1.0
-    }, 
-    {
-    'role': 'Mechanical Engineer',
-    'key_skills': ['autocad', 'solidworks', 'catia', 'cad', 'manufacturing', 'design', 'mechanical design', 'thermodynamics', 'fluid mechanics'],
-    'patterns': ['mechanical engineer', 'mechanical', 'manufacturing engineer', 'design engineer'],
-    'weight': 1.0
-},
-{
-    'role': 'Civil Engineer',
-    'key_skills': ['autocad', 'civil 3d', 'structural design', 'construction', 'surveying', 'site planning', 'structural analysis', 'revit'],
-    'patterns': ['civil engineer', 'civil engineering', 'structural engineer', 'construction engineer', 'site engineer'],
-    'weight': 1.0
-},
-{
-    'role': 'Electrical Engineer',
-    'key_skills': ['circuit design', 'pcb design', 'plc', 'scada', 'electrical systems', 'power systems', 'autocad electrical', 'matlab'],
-    'patterns': ['electrical engineer', 'electrical', 'power engineer', 'electronics engineer'],
-    'weight': 1.0
-},
-{
-    'role': 'Aeronautical Engineer',
-    'key_skills': ['aerodynamics', 'aircraft design', 'catia', 'ansys', 'cfd', 'structural analysis', 'flight mechanics', 'aviation'],
-    'patterns': ['aeronautical engineer', 'aerospace engineer', 'aircraft engineer', 'aviation engineer'],
-    'weight': 1.0
-},
-{
-    'role': 'Chemical Engineer',
-    'key_skills': ['process design', 'chemical processes', 'process simulation', 'aspen plus', 'hysys', 'process safety', 'plant design'],
-    'patterns': ['chemical engineer', 'process engineer', 'chemical'],
-    'weight': 1.0
-},
-{
-    'role': 'Industrial Engineer',
-    'key_skills': ['lean manufacturing', 'six sigma', 'process improvement', 'supply chain', 'operations management', 'quality control'],
-    'patterns': ['industrial engineer', 'process improvement', 'operations engineer', 'lean engineer'],
-    'weight': 1.0
-},
-
-# ============= HEALTHCARE & MEDICAL =============
-{
-    'role': 'Medical Doctor',
-    'key_skills': ['clinical diagnosis', 'patient care', 'medical procedures', 'mbbs', 'md', 'treatment planning', 'emergency medicine'],
-    'patterns': ['doctor', 'physician', 'medical officer', 'general practitioner', 'consultant'],
-    'weight': 1.0
-},
-{
-    'role': 'Nurse',
-    'key_skills': ['patient care', 'nursing', 'medical procedures', 'medication administration', 'critical care', 'emergency response'],
-    'patterns': ['nurse', 'registered nurse', 'staff nurse', 'nursing', 'rn'],
-    'weight': 1.0
-},
-{
-    'role': 'Pharmacist',
-    'key_skills': ['pharmaceutical care', 'medication dispensing', 'drug interactions', 'pharmacy management', 'clinical pharmacy'],
-    'patterns': ['pharmacist', 'pharmacy', 'clinical pharmacist'],
-    'weight': 1.0
-},
-
-# ============= FINANCE & ACCOUNTING =============
-{
-    'role': 'Accountant',
-    'key_skills': ['accounting', 'bookkeeping', 'financial reporting', 'taxation', 'tally', 'quickbooks', 'gst', 'auditing'],
-    'patterns': ['accountant', 'accounts executive', 'finance executive', 'accounting'],
-    'weight': 1.0
-},
-{
-    'role': 'Financial Analyst',
-    'key_skills': ['financial analysis', 'financial modeling', 'budgeting', 'forecasting', 'excel', 'valuation', 'investment analysis'],
-    'patterns': ['financial analyst', 'finance analyst', 'investment analyst'],
-    'weight': 1.0
-},
-{
-    'role': 'Chartered Accountant',
-    'key_skills': ['auditing', 'taxation', 'financial reporting', 'compliance', 'ifrs', 'ind as', 'direct tax', 'indirect tax'],
-    'patterns': ['chartered accountant', 'ca', 'audit manager'],
-    'weight': 1.0
-},
-
-# ============= MARKETING & SALES =============
-{
-    'role': 'Marketing Manager',
-    'key_skills': ['marketing strategy', 'brand management', 'digital marketing', 'campaign management', 'market research', 'seo', 'social media'],
-    'patterns': ['marketing manager', 'brand manager', 'marketing head'],
-    'weight': 1.0
-},
-{
-    'role': 'Digital Marketing Specialist',
-    'key_skills': ['seo', 'sem', 'google ads', 'facebook ads', 'content marketing', 'social media marketing', 'email marketing', 'analytics'],
-    'patterns': ['digital marketing', 'seo specialist', 'sem specialist', 'social media manager'],
-    'weight': 1.0
-},
-
-# ============= HUMAN RESOURCES =============
-{
-    'role': 'HR Manager',
-    'key_skills': ['recruitment', 'talent acquisition', 'employee relations', 'performance management', 'hr policies', 'compensation', 'training'],
-    'patterns': ['hr manager', 'human resources manager', 'hr head', 'people manager'],
-    'weight': 1.0
-},
-{
-    'role': 'Recruiter',
-    'key_skills': ['recruitment', 'talent acquisition', 'sourcing', 'screening', 'interviewing', 'candidate management', 'ats'],
-    'patterns': ['recruiter', 'talent acquisition', 'recruitment specialist', 'hiring'],
-    'weight': 1.0
-},
-
-# ============= EDUCATION & TRAINING =============
-{
-    'role': 'Teacher',
-    'key_skills': ['teaching', 'curriculum development', 'classroom management', 'lesson planning', 'student assessment', 'education'],
-    'patterns': ['teacher', 'educator', 'faculty', 'lecturer', 'professor'],
-    'weight': 1.0
-},
-{
-    'role': 'Corporate Trainer',
-    'key_skills': ['training', 'facilitation', 'learning development', 'presentation skills', 'training design', 'instructional design'],
-    'patterns': ['trainer', 'corporate trainer', 'training specialist', 'learning specialist'],
-    'weight': 1.0
-},
-
-# ============= LEGAL =============
-{
-    'role': 'Lawyer',
-    'key_skills': ['legal research', 'litigation', 'contract drafting', 'legal compliance', 'corporate law', 'legal advisory'],
-    'patterns': ['lawyer', 'advocate', 'legal counsel', 'attorney', 'legal advisor'],
-    'weight': 1.0
-},
-
-# ============= OPERATIONS & SUPPLY CHAIN =============
-{
-    'role': 'Supply Chain Manager',
-    'key_skills': ['supply chain management', 'logistics', 'inventory management', 'procurement', 'vendor management', 'operations'],
-    'patterns': ['supply chain manager', 'logistics manager', 'operations manager', 'procurement manager'],
-    'weight': 1.0
-},
-
-# ============= CUSTOMER SERVICE =============
-{
-    'role': 'Customer Support Executive',
-    'key_skills': ['customer service', 'communication', 'problem solving', 'crm', 'call handling', 'complaint resolution'],
-    'patterns': ['customer support', 'customer service', 'support executive', 'customer care'],
-    'weight': 1.0
-},
-
-# ============= ARCHITECTURE & DESIGN =============
-{
-    'role': 'Architect',
-    'key_skills': ['architectural design', 'autocad', 'revit', 'sketchup', '3d modeling', 'building design', 'construction drawings'],
-    'patterns': ['architect', 'architectural designer', 'design architect'],
-    'weight': 1.0
-},
-{
-    'role': 'Interior Designer',
-    'key_skills': ['interior design', 'space planning', 'autocad', '3d max', 'sketchup', 'furniture design', 'color theory'],
-    'patterns': ['interior designer', 'interior decorator', 'space designer'],
-    'weight': 1.0
-},
-
-# ============= CONTENT & MEDIA =============
-{
-    'role': 'Content Writer',
-    'key_skills': ['content writing', 'copywriting', 'seo writing', 'blogging', 'creative writing', 'editing', 'proofreading'],
-    'patterns': ['content writer', 'copywriter', 'writer', 'content creator'],
-    'weight': 1.0
-},
-{
-    'role': 'Video Editor',
-    'key_skills': ['video editing', 'adobe premiere', 'final cut pro', 'after effects', 'motion graphics', 'color grading'],
-    'patterns': ['video editor', 'video producer', 'multimedia editor'],
-    'weight': 1.0
-},
-
-{
-    'role': 'Hotel Manager',
-    'key_skills': ['hotel management', 'hospitality', 'guest relations', 'operations management', 'front office', 'food and beverage'],
-    'patterns': ['hotel manager', 'hospitality manager', 'guest relations manager'],
-    'weight': 1.0
-},
-
-{
-    'role': 'Management Professional',
-    'key_skills': ['management', 'leadership', 'strategy', 'operations', 'team management', 'planning'],
-    'patterns': ['manager', 'management', 'supervisor', 'team lead'],
-    'weight': 0.5
-},
- {
-        'role': 'Python Developer',
-        'key_skills': ['python', 'django', 'flask', 'fastapi', 'pandas', 'numpy', 'sqlalchemy'],
-        'patterns': ['python developer', 'python engineer', 'django developer', 'flask developer', 'fastapi developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Java Developer',
-        'key_skills': ['java', 'spring', 'spring boot', 'hibernate', 'jsp', 'maven', 'microservices'],
-        'patterns': ['java developer', 'java engineer', 'spring developer', 'j2ee', 'spring boot developer'],
-        'weight': 1.0
-    },
-    {
-        'role': '.NET Developer',
-        'key_skills': ['c#', '.net', 'asp.net', 'sql server', 'mvc', 'entity framework', '.net core'],
-        'patterns': ['.net developer', 'dotnet developer', 'c# developer', 'asp.net developer', 'mvc developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'JavaScript Developer',
-        'key_skills': ['javascript', 'react', 'angular', 'vue', 'node.js', 'express', 'typescript'],
-        'patterns': ['javascript developer', 'js developer', 'frontend developer', 'react developer', 'angular developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'PHP Developer',
-        'key_skills': ['php', 'laravel', 'codeigniter', 'symfony', 'mysql', 'wordpress', 'composer'],
-        'patterns': ['php developer', 'laravel developer', 'codeigniter developer', 'wordpress developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Ruby Developer',
-        'key_skills': ['ruby', 'ruby on rails', 'rails', 'rspec', 'postgresql', 'sinatra'],
-        'patterns': ['ruby developer', 'rails developer', 'ruby on rails developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Go Developer',
-        'key_skills': ['go', 'golang', 'gin', 'gorilla', 'postgresql', 'redis', 'microservices'],
-        'patterns': ['go developer', 'golang developer', 'go engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'C++ Developer',
-        'key_skills': ['c++', 'stl', 'boost', 'qt', 'visual studio', 'object oriented programming'],
-        'patterns': ['c++ developer', 'cpp developer', 'c++ engineer', 'c++ programmer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Rust Developer',
-        'key_skills': ['rust', 'cargo', 'systems programming', 'memory safety', 'concurrency'],
-        'patterns': ['rust developer', 'rust engineer', 'rust programmer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Scala Developer',
-        'key_skills': ['scala', 'akka', 'play framework', 'spark', 'functional programming'],
-        'patterns': ['scala developer', 'scala engineer', 'scala programmer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Kotlin Developer',
-        'key_skills': ['kotlin', 'android', 'spring boot', 'coroutines', 'jetpack'],
-        'patterns': ['kotlin developer', 'kotlin engineer', 'kotlin programmer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Swift Developer',
-        'key_skills': ['swift', 'ios', 'xcode', 'cocoa touch', 'uikit', 'swiftui'],
-        'patterns': ['swift developer', 'swift engineer', 'swift programmer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Full Stack Developer',
-        'key_skills': ['javascript', 'react', 'node.js', 'python', 'django', 'postgresql', 'mongodb'],
-        'patterns': ['full stack developer', 'fullstack developer', 'full-stack developer', 'full stack engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Frontend Developer',
-        'key_skills': ['html', 'css', 'javascript', 'react', 'angular', 'vue', 'webpack', 'sass'],
-        'patterns': ['frontend developer', 'front-end developer', 'ui developer', 'web developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Backend Developer',
-        'key_skills': ['api', 'database', 'microservices', 'rest', 'sql', 'nosql', 'redis'],
-        'patterns': ['backend developer', 'back-end developer', 'api developer', 'server developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'MERN Stack Developer',
-        'key_skills': ['mongodb', 'express', 'react', 'node.js', 'javascript', 'rest api'],
-        'patterns': ['mern stack developer', 'mern developer', 'mern stack'],
-        'weight': 1.0
-    },
-    {
-        'role': 'MEAN Stack Developer',
-        'key_skills': ['mongodb', 'express', 'angular', 'node.js', 'javascript', 'typescript'],
-        'patterns': ['mean stack developer', 'mean developer', 'mean stack'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Android Developer',
-        'key_skills': ['android', 'java', 'kotlin', 'android studio', 'firebase', 'rest api'],
-        'patterns': ['android developer', 'android engineer', 'mobile android developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'iOS Developer',
-        'key_skills': ['ios', 'swift', 'objective-c', 'xcode', 'cocoa touch', 'core data'],
-        'patterns': ['ios developer', 'ios engineer', 'iphone developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Flutter Developer',
-        'key_skills': ['flutter', 'dart', 'mobile development', 'cross-platform', 'firebase'],
-        'patterns': ['flutter developer', 'flutter engineer', 'flutter mobile developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'React Native Developer',
-        'key_skills': ['react native', 'javascript', 'mobile apps', 'ios', 'android', 'redux'],
-        'patterns': ['react native developer', 'rn developer', 'react native engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Game Developer',
-        'key_skills': ['unity', 'unreal engine', 'c++', 'c#', 'game design', '3d graphics'],
-        'patterns': ['game developer', 'unity developer', 'unreal developer', 'game programmer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Embedded Systems Engineer',
-        'key_skills': ['embedded c', 'firmware', 'microcontrollers', 'rtos', 'iot', 'arm'],
-        'patterns': ['embedded engineer', 'embedded systems', 'firmware engineer', 'iot developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Blockchain Developer',
-        'key_skills': ['solidity', 'ethereum', 'smart contracts', 'web3', 'blockchain', 'cryptocurrency'],
-        'patterns': ['blockchain developer', 'smart contract developer', 'web3 developer', 'crypto developer'],
-        'weight': 1.0
-    },
-    
-    
-    {
-        'role': 'Data Scientist',
-        'key_skills': ['python', 'machine learning', 'pandas', 'numpy', 'tensorflow', 'pytorch', 'statistics'],
-        'patterns': ['data scientist', 'ml scientist', 'research scientist'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Data Analyst',
-        'key_skills': ['data analysis', 'excel', 'power bi', 'tableau', 'sql', 'python', 'statistics'],
-        'patterns': ['data analyst', 'business intelligence analyst', 'analytics analyst'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Data Engineer',
-        'key_skills': ['python', 'spark', 'hadoop', 'kafka', 'airflow', 'etl', 'data pipelines'],
-        'patterns': ['data engineer', 'big data engineer', 'data platform engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Machine Learning Engineer',
-        'key_skills': ['machine learning', 'deep learning', 'tensorflow', 'pytorch', 'python', 'mlops'],
-        'patterns': ['machine learning engineer', 'ml engineer', 'ai engineer', 'deep learning engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Business Intelligence Analyst',
-        'key_skills': ['power bi', 'tableau', 'sql', 'data visualization', 'reporting', 'dax'],
-        'patterns': ['business intelligence', 'bi analyst', 'bi developer', 'reporting analyst'],
-        'weight': 1.0
-    },
-    {
-        'role': 'ETL Developer',
-        'key_skills': ['etl', 'informatica', 'ssis', 'data warehousing', 'sql', 'talend'],
-        'patterns': ['etl developer', 'data warehouse developer', 'informatica developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Tableau Developer',
-        'key_skills': ['tableau', 'data visualization', 'sql', 'dashboard design', 'analytics'],
-        'patterns': ['tableau developer', 'tableau consultant', 'tableau specialist'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Power BI Developer',
-        'key_skills': ['power bi', 'dax', 'power query', 'data modeling', 'sql', 'excel'],
-        'patterns': ['power bi developer', 'powerbi developer', 'power bi consultant'],
-        'weight': 1.0
-    },
-    
-    
-    {
-        'role': 'DevOps Engineer',
-        'key_skills': ['docker', 'kubernetes', 'jenkins', 'terraform', 'aws', 'azure', 'ci/cd'],
-        'patterns': ['devops engineer', 'devops', 'infrastructure engineer', 'sre'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Cloud Engineer',
-        'key_skills': ['aws', 'azure', 'gcp', 'terraform', 'cloudformation', 'cloud architecture'],
-        'patterns': ['cloud engineer', 'aws engineer', 'azure engineer', 'cloud architect'],
-        'weight': 1.0
-    },
-    {
-        'role': 'AWS Solutions Architect',
-        'key_skills': ['aws', 'ec2', 's3', 'lambda', 'cloudformation', 'vpc', 'iam'],
-        'patterns': ['aws solutions architect', 'aws architect', 'cloud solutions architect'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Azure Cloud Engineer',
-        'key_skills': ['azure', 'azure devops', 'arm templates', 'azure functions', 'active directory'],
-        'patterns': ['azure engineer', 'azure cloud engineer', 'azure developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Site Reliability Engineer',
-        'key_skills': ['sre', 'monitoring', 'prometheus', 'grafana', 'kubernetes', 'incident management'],
-        'patterns': ['site reliability engineer', 'sre', 'reliability engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Kubernetes Engineer',
-        'key_skills': ['kubernetes', 'docker', 'helm', 'container orchestration', 'microservices'],
-        'patterns': ['kubernetes engineer', 'k8s engineer', 'container engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'System Administrator',
-        'key_skills': ['linux', 'windows server', 'networking', 'bash', 'powershell', 'active directory'],
-        'patterns': ['system administrator', 'sysadmin', 'systems admin', 'infrastructure admin'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Network Engineer',
-        'key_skills': ['networking', 'cisco', 'routing', 'switching', 'firewalls', 'tcp/ip'],
-        'patterns': ['network engineer', 'network administrator', 'network specialist'],
-        'weight': 1.0
-    },
-    
-    {
-        'role': 'Cybersecurity Engineer',
-        'key_skills': ['security', 'penetration testing', 'vulnerability assessment', 'firewalls', 'siem'],
-        'patterns': ['cybersecurity engineer', 'security engineer', 'infosec engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Penetration Tester',
-        'key_skills': ['penetration testing', 'ethical hacking', 'vulnerability assessment', 'metasploit', 'burp suite'],
-        'patterns': ['penetration tester', 'pen tester', 'ethical hacker', 'security tester'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Security Analyst',
-        'key_skills': ['security monitoring', 'threat analysis', 'siem', 'incident response', 'log analysis'],
-        'patterns': ['security analyst', 'cybersecurity analyst', 'infosec analyst'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Information Security Manager',
-        'key_skills': ['information security', 'risk management', 'compliance', 'iso 27001', 'security policies'],
-        'patterns': ['information security manager', 'infosec manager', 'security manager'],
-        'weight': 1.0
-    },
-    
-    {
-        'role': 'QA Engineer',
-        'key_skills': ['testing', 'automation', 'selenium', 'junit', 'testng', 'api testing'],
-        'patterns': ['qa engineer', 'quality assurance engineer', 'test engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Automation Test Engineer',
-        'key_skills': ['selenium', 'cypress', 'playwright', 'automation testing', 'java', 'python'],
-        'patterns': ['automation engineer', 'test automation engineer', 'sdet'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Manual Tester',
-        'key_skills': ['manual testing', 'test cases', 'bug tracking', 'jira', 'regression testing'],
-        'patterns': ['manual tester', 'manual test engineer', 'qa tester'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Performance Test Engineer',
-        'key_skills': ['performance testing', 'jmeter', 'loadrunner', 'load testing', 'stress testing'],
-        'patterns': ['performance test engineer', 'performance tester', 'load test engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Quality Analyst',
-        'key_skills': ['quality analysis', 'manual testing', 'test cases', 'bug tracking', 'regression testing'],
-        'patterns': ['quality analyst', 'qa analyst', 'software tester'],
-        'weight': 1.0
-    },
-    
-
-    
-    {
-        'role': 'Database Administrator',
-        'key_skills': ['sql', 'oracle', 'mysql', 'postgresql', 'database administration', 'backup recovery'],
-        'patterns': ['database administrator', 'dba', 'sql dba', 'oracle dba'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Database Developer',
-        'key_skills': ['sql', 'stored procedures', 'database design', 'query optimization', 'indexing'],
-        'patterns': ['database developer', 'sql developer', 'database programmer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Software Architect',
-        'key_skills': ['software architecture', 'system design', 'microservices', 'design patterns', 'scalability'],
-        'patterns': ['software architect', 'solution architect', 'technical architect'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Solutions Architect',
-        'key_skills': ['solution architecture', 'system design', 'cloud architecture', 'technical leadership'],
-        'patterns': ['solutions architect', 'solution architect', 'enterprise architect'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Product Architect',
-        'key_skills': ['product architecture', 'system design', 'technical strategy', 'product development'],
-        'patterns': ['product architect', 'technical product architect'],
-        'weight': 1.0
-    },
-    
-    
-    {
-        'role': 'UI/UX Designer',
-        'key_skills': ['ui design', 'ux design', 'figma', 'adobe xd', 'prototyping', 'user research'],
-        'patterns': ['ui/ux designer', 'ui designer', 'ux designer', 'product designer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Graphic Designer',
-        'key_skills': ['graphic design', 'photoshop', 'illustrator', 'indesign', 'branding', 'visual design'],
-        'patterns': ['graphic designer', 'visual designer', 'creative designer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Web Designer',
-        'key_skills': ['web design', 'html', 'css', 'figma', 'responsive design', 'adobe xd'],
-        'patterns': ['web designer', 'website designer', 'ui web designer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Motion Graphics Designer',
-        'key_skills': ['after effects', 'motion graphics', 'animation', 'video editing', 'adobe premiere'],
-        'patterns': ['motion graphics designer', 'motion designer', 'animator'],
-        'weight': 1.0
-    },
-
-    
-    {
-        'role': 'Mechanical Engineer',
-        'key_skills': ['autocad', 'solidworks', 'catia', 'mechanical design', 'manufacturing', 'cad'],
-        'patterns': ['mechanical engineer', 'design engineer', 'cad engineer', 'product design engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Mechanical Design Engineer',
-        'key_skills': ['solidworks', 'catia', 'creo', 'cad', 'mechanical design', '3d modeling'],
-        'patterns': ['mechanical design engineer', 'design engineer mechanical', 'cad design engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Manufacturing Engineer',
-        'key_skills': ['manufacturing processes', 'production planning', 'quality control', 'lean manufacturing'],
-        'patterns': ['manufacturing engineer', 'production engineer', 'process engineer manufacturing'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Production Engineer',
-        'key_skills': ['production planning', 'quality control', 'process optimization', 'manufacturing'],
-        'patterns': ['production engineer', 'production manager', 'production supervisor'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Maintenance Engineer',
-        'key_skills': ['preventive maintenance', 'troubleshooting', 'equipment maintenance', 'reliability'],
-        'patterns': ['maintenance engineer', 'plant maintenance engineer', 'facilities engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Quality Engineer',
-        'key_skills': ['quality control', 'quality assurance', 'six sigma', 'statistical analysis', 'iso'],
-        'patterns': ['quality engineer', 'quality control engineer', 'qa engineer manufacturing'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Automobile Engineer',
-        'key_skills': ['automotive engineering', 'vehicle design', 'catia', 'automotive systems'],
-        'patterns': ['automobile engineer', 'automotive engineer', 'vehicle engineer'],
-        'weight': 1.0
-    },
-    
-
-    
-    {
-        'role': 'Civil Engineer',
-        'key_skills': ['autocad', 'civil 3d', 'structural design', 'construction', 'surveying', 'revit'],
-        'patterns': ['civil engineer', 'structural engineer', 'construction engineer', 'site engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Structural Engineer',
-        'key_skills': ['structural analysis', 'staad pro', 'etabs', 'structural design', 'rcc design'],
-        'patterns': ['structural engineer', 'structural design engineer', 'structure engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Construction Engineer',
-        'key_skills': ['construction management', 'site supervision', 'project planning', 'quantity surveying'],
-        'patterns': ['construction engineer', 'site engineer', 'construction manager'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Quantity Surveyor',
-        'key_skills': ['quantity surveying', 'cost estimation', 'bill of quantities', 'contract management'],
-        'patterns': ['quantity surveyor', 'qs engineer', 'estimator'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Highway Engineer',
-        'key_skills': ['highway design', 'transportation engineering', 'pavement design', 'traffic engineering'],
-        'patterns': ['highway engineer', 'transportation engineer', 'traffic engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Geotechnical Engineer',
-        'key_skills': ['soil mechanics', 'foundation design', 'geotechnical investigation', 'soil testing'],
-        'patterns': ['geotechnical engineer', 'soil engineer', 'foundation engineer'],
-        'weight': 1.0
-    },
-    
-
-    
-    {
-        'role': 'Electrical Engineer',
-        'key_skills': ['electrical design', 'power systems', 'plc', 'scada', 'autocad electrical'],
-        'patterns': ['electrical engineer', 'power engineer', 'electrical design engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Electronics Engineer',
-        'key_skills': ['circuit design', 'pcb design', 'embedded systems', 'microcontrollers', 'vlsi'],
-        'patterns': ['electronics engineer', 'electronics design engineer', 'circuit design engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Instrumentation Engineer',
-        'key_skills': ['instrumentation', 'control systems', 'plc', 'dcs', 'scada', 'calibration'],
-        'patterns': ['instrumentation engineer', 'control engineer', 'i&c engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Power Electronics Engineer',
-        'key_skills': ['power electronics', 'inverters', 'converters', 'motor drives', 'power supply design'],
-        'patterns': ['power electronics engineer', 'power systems engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'VLSI Design Engineer',
-        'key_skills': ['vlsi', 'verilog', 'vhdl', 'rtl design', 'asic design', 'fpga'],
-        'patterns': ['vlsi engineer', 'vlsi design engineer', 'asic design engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Telecommunications Engineer',
-        'key_skills': ['telecommunications', 'networking', 'rf engineering', 'wireless communication'],
-        'patterns': ['telecommunications engineer', 'telecom engineer', 'rf engineer'],
-        'weight': 1.0
-    },
-
-    
-    {
-        'role': 'Chemical Engineer',
-        'key_skills': ['chemical processes', 'process design', 'aspen plus', 'process simulation', 'plant design'],
-        'patterns': ['chemical engineer', 'process engineer', 'process design engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Process Engineer',
-        'key_skills': ['process optimization', 'process design', 'chemical engineering', 'plant operations'],
-        'patterns': ['process engineer', 'process development engineer', 'chemical process engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Petroleum Engineer',
-        'key_skills': ['petroleum engineering', 'reservoir engineering', 'drilling', 'production engineering'],
-        'patterns': ['petroleum engineer', 'reservoir engineer', 'drilling engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Refinery Engineer',
-        'key_skills': ['refinery operations', 'process engineering', 'distillation', 'chemical processing'],
-        'patterns': ['refinery engineer', 'refinery operations engineer'],
-        'weight': 1.0
-    },
-
-    
-    {
-        'role': 'Aeronautical Engineer',
-        'key_skills': ['aerodynamics', 'aircraft design', 'catia', 'ansys', 'cfd', 'flight mechanics'],
-        'patterns': ['aeronautical engineer', 'aerospace engineer', 'aircraft engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Aerospace Design Engineer',
-        'key_skills': ['aerospace design', 'catia', 'cfd', 'structural analysis', 'aircraft systems'],
-        'patterns': ['aerospace design engineer', 'aircraft design engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Flight Test Engineer',
-        'key_skills': ['flight testing', 'test engineering', 'data analysis', 'aviation'],
-        'patterns': ['flight test engineer', 'test pilot engineer'],
-        'weight': 1.0
-    },
-
-    
-    {
-        'role': 'Industrial Engineer',
-        'key_skills': ['lean manufacturing', 'six sigma', 'process improvement', 'operations management'],
-        'patterns': ['industrial engineer', 'process improvement engineer', 'operations engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Lean Six Sigma Consultant',
-        'key_skills': ['lean manufacturing', 'six sigma', 'process optimization', 'continuous improvement'],
-        'patterns': ['lean six sigma', 'six sigma consultant', 'lean consultant'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Plant Engineer',
-        'key_skills': ['plant operations', 'maintenance management', 'process optimization', 'safety management'],
-        'patterns': ['plant engineer', 'plant manager', 'facility engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Metallurgical Engineer',
-        'key_skills': ['metallurgy', 'materials science', 'heat treatment', 'welding', 'material testing'],
-        'patterns': ['metallurgical engineer', 'metallurgy engineer', 'materials engineer'],
-        'weight': 1.0
-    },
-    
-
-    
-    {
-        'role': 'Biomedical Engineer',
-        'key_skills': ['biomedical engineering', 'medical devices', 'biomechanics', 'signal processing'],
-        'patterns': ['biomedical engineer', 'medical device engineer', 'clinical engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Environmental Engineer',
-        'key_skills': ['environmental engineering', 'waste management', 'water treatment', 'pollution control'],
-        'patterns': ['environmental engineer', 'environmental consultant', 'sustainability engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Safety Engineer',
-        'key_skills': ['safety management', 'osha', 'risk assessment', 'industrial safety', 'hse'],
-        'patterns': ['safety engineer', 'hse engineer', 'safety officer'],
-        'weight': 1.0
-    },
-    
-
-    
-    {
-        'role': 'Medical Doctor',
-        'key_skills': ['clinical diagnosis', 'patient care', 'medical procedures', 'mbbs', 'treatment planning'],
-        'patterns': ['doctor', 'physician', 'medical officer', 'general practitioner', 'consultant doctor'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Surgeon',
-        'key_skills': ['surgery', 'surgical procedures', 'patient care', 'operating room', 'medical procedures'],
-        'patterns': ['surgeon', 'surgical consultant', 'operating surgeon'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Dentist',
-        'key_skills': ['dental procedures', 'oral surgery', 'teeth cleaning', 'dental care', 'orthodontics'],
-        'patterns': ['dentist', 'dental surgeon', 'orthodontist'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Nurse',
-        'key_skills': ['patient care', 'nursing', 'medication administration', 'critical care', 'emergency response'],
-        'patterns': ['nurse', 'registered nurse', 'staff nurse', 'nursing officer', 'rn'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Pharmacist',
-        'key_skills': ['pharmaceutical care', 'medication dispensing', 'drug interactions', 'pharmacy management'],
-        'patterns': ['pharmacist', 'clinical pharmacist', 'hospital pharmacist'],
-        'weight': 1.0
-    },
-
-    {
-        'role': 'Aircraft Maintenance Engineer (AME)',
-        'key_skills': ['aircraft maintenance', 'dgca', 'ame license', 'aircraft systems', 'troubleshooting', 'airframe', 'powerplant', 'avionics'],
-        'patterns': ['aircraft maintenance engineer', 'ame', 'aircraft engineer', 'aviation maintenance', 'aircraft mechanic'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Aeronautical Engineer',
-        'key_skills': ['aerodynamics', 'aircraft design', 'catia', 'ansys', 'cfd', 'flight mechanics', 'structural analysis', 'aviation'],
-        'patterns': ['aeronautical engineer', 'aerospace engineer', 'aircraft engineer', 'aviation engineer', 'flight engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Aerospace Design Engineer',
-        'key_skills': ['aerospace design', 'catia', 'solidworks', 'cfd analysis', 'structural analysis', 'aircraft systems', 'ansys'],
-        'patterns': ['aerospace design engineer', 'aircraft design engineer', 'aeronautical design engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Avionics Engineer',
-        'key_skills': ['avionics systems', 'aircraft electronics', 'navigation systems', 'communication systems', 'radar', 'flight instruments'],
-        'patterns': ['avionics engineer', 'avionics technician', 'aircraft electronics engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Flight Test Engineer',
-        'key_skills': ['flight testing', 'test engineering', 'data analysis', 'aviation', 'aircraft performance', 'instrumentation'],
-        'patterns': ['flight test engineer', 'test pilot engineer', 'flight operations engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Aircraft Structural Engineer',
-        'key_skills': ['structural analysis', 'stress analysis', 'fatigue analysis', 'composite materials', 'fea', 'catia'],
-        'patterns': ['aircraft structural engineer', 'structures engineer', 'airframe engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Propulsion Engineer',
-        'key_skills': ['jet engines', 'turbine engines', 'engine performance', 'propulsion systems', 'thermodynamics'],
-        'patterns': ['propulsion engineer', 'engine engineer', 'powerplant engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Commercial Pilot',
-        'key_skills': ['flight operations', 'cpl license', 'atpl', 'aircraft operation', 'navigation', 'flight safety', 'aviation regulations'],
-        'patterns': ['commercial pilot', 'airline pilot', 'cpl', 'captain', 'first officer', 'co-pilot'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Private Pilot',
-        'key_skills': ['ppl license', 'flight operations', 'aircraft operation', 'navigation', 'flight planning'],
-        'patterns': ['private pilot', 'ppl', 'pilot trainee'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Helicopter Pilot',
-        'key_skills': ['helicopter operations', 'rotary wing', 'flight operations', 'aviation', 'helicopter flying'],
-        'patterns': ['helicopter pilot', 'chopper pilot', 'rotary wing pilot'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Flight Instructor',
-        'key_skills': ['flight training', 'aviation training', 'cfi', 'aircraft operation', 'flight instruction'],
-        'patterns': ['flight instructor', 'flying instructor', 'cfi', 'aviation instructor'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Air Traffic Controller',
-        'key_skills': ['air traffic control', 'atc', 'radar operations', 'aviation safety', 'communication', 'flight coordination'],
-        'patterns': ['air traffic controller', 'atc', 'air traffic control officer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Flight Dispatcher',
-        'key_skills': ['flight planning', 'weather analysis', 'route planning', 'fuel calculation', 'aviation regulations'],
-        'patterns': ['flight dispatcher', 'flight operations officer', 'dispatcher'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Cabin Crew / Flight Attendant',
-        'key_skills': ['customer service', 'safety procedures', 'emergency response', 'hospitality', 'passenger care', 'in-flight service'],
-        'patterns': ['cabin crew', 'flight attendant', 'air hostess', 'airhostess', 'steward', 'stewardess', 'flight steward'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Ground Staff',
-        'key_skills': ['airport operations', 'passenger handling', 'check-in', 'baggage handling', 'customer service'],
-        'patterns': ['ground staff', 'ground handling', 'airport staff', 'airport operations'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Airport Operations Manager',
-        'key_skills': ['airport management', 'operations management', 'aviation', 'safety management', 'coordination'],
-        'patterns': ['airport operations manager', 'airport manager', 'aviation operations manager'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Aviation Safety Officer',
-        'key_skills': ['aviation safety', 'safety management', 'accident investigation', 'risk assessment', 'compliance'],
-        'patterns': ['aviation safety officer', 'flight safety officer', 'safety manager aviation'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Drone Pilot / UAV Operator',
-        'key_skills': ['drone operation', 'uav', 'remote pilot', 'aerial photography', 'dgca rpas'],
-        'patterns': ['drone pilot', 'uav operator', 'drone operator', 'rpas pilot', 'unmanned aircraft pilot'],
-        'weight': 1.0
-    },
-
-    
-    {
-        'role': 'Locomotive Pilot / Train Driver',
-        'key_skills': ['train operation', 'locomotive driving', 'railway safety', 'signaling', 'railway operations'],
-        'patterns': ['locomotive pilot', 'loco pilot', 'train driver', 'engine driver', 'motorman', 'train operator'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Assistant Loco Pilot',
-        'key_skills': ['train assistance', 'locomotive operations', 'railway safety', 'signaling'],
-        'patterns': ['assistant loco pilot', 'alp', 'assistant train driver', 'assistant locomotive pilot'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Railway Engineer',
-        'key_skills': ['railway engineering', 'track maintenance', 'signaling', 'railway infrastructure'],
-        'patterns': ['railway engineer', 'permanent way engineer', 'track engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Signal & Telecom Engineer',
-        'key_skills': ['railway signaling', 'telecommunications', 'interlocking', 'signal maintenance'],
-        'patterns': ['signal engineer', 'telecom engineer railway', 's&t engineer', 'signaling engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Railway Technician',
-        'key_skills': ['railway maintenance', 'electrical systems', 'mechanical systems', 'troubleshooting'],
-        'patterns': ['railway technician', 'train technician', 'railway mechanic'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Train Conductor / Guard',
-        'key_skills': ['train operations', 'passenger safety', 'ticketing', 'railway operations'],
-        'patterns': ['train conductor', 'train guard', 'railway guard', 'ticket collector'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Station Master',
-        'key_skills': ['station management', 'railway operations', 'passenger coordination', 'train scheduling'],
-        'patterns': ['station master', 'station manager', 'railway station master'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Metro Train Operator',
-        'key_skills': ['metro operations', 'train driving', 'urban transport', 'safety protocols'],
-        'patterns': ['metro train operator', 'metro driver', 'subway operator'],
-        'weight': 1.0
-    },
-    
-    
-    {
-        'role': 'Civil Engineer',
-        'key_skills': ['autocad', 'civil 3d', 'structural design', 'construction', 'surveying', 'revit', 'site planning'],
-        'patterns': ['civil engineer', 'structural engineer', 'construction engineer', 'site engineer', 'civil engineering'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Structural Engineer',
-        'key_skills': ['structural analysis', 'staad pro', 'etabs', 'structural design', 'rcc design', 'steel structures'],
-        'patterns': ['structural engineer', 'structural design engineer', 'structure engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Construction Manager',
-        'key_skills': ['construction management', 'project management', 'site supervision', 'planning', 'scheduling'],
-        'patterns': ['construction manager', 'project manager construction', 'site manager'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Site Engineer',
-        'key_skills': ['site supervision', 'construction', 'quality control', 'safety management', 'civil work'],
-        'patterns': ['site engineer', 'site supervisor', 'civil site engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Quantity Surveyor',
-        'key_skills': ['quantity surveying', 'cost estimation', 'bill of quantities', 'tendering', 'contract management'],
-        'patterns': ['quantity surveyor', 'qs', 'estimator', 'cost estimator'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Highway Engineer',
-        'key_skills': ['highway design', 'transportation engineering', 'pavement design', 'traffic engineering', 'road construction'],
-        'patterns': ['highway engineer', 'road engineer', 'transportation engineer', 'traffic engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Geotechnical Engineer',
-        'key_skills': ['soil mechanics', 'foundation design', 'geotechnical investigation', 'soil testing', 'ground improvement'],
-        'patterns': ['geotechnical engineer', 'soil engineer', 'foundation engineer', 'geo engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Water Resources Engineer',
-        'key_skills': ['hydrology', 'water resources', 'irrigation', 'drainage', 'hydraulic design'],
-        'patterns': ['water resources engineer', 'irrigation engineer', 'hydraulic engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Bridge Engineer',
-        'key_skills': ['bridge design', 'structural analysis', 'bridge construction', 'staad pro'],
-        'patterns': ['bridge engineer', 'bridge design engineer', 'bridge construction engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Urban Planner',
-        'key_skills': ['urban planning', 'land use planning', 'gis', 'city planning', 'development planning'],
-        'patterns': ['urban planner', 'town planner', 'city planner'],
-        'weight': 1.0
-    },
-    
-    {
-        'role': 'Mechanical Engineer',
-        'key_skills': ['autocad', 'solidworks', 'catia', 'mechanical design', 'manufacturing', 'cad', 'thermodynamics'],
-        'patterns': ['mechanical engineer', 'design engineer', 'mechanical design engineer', 'product design engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Mechanical Design Engineer',
-        'key_skills': ['solidworks', 'catia', 'creo', 'cad', '3d modeling', 'mechanical design', 'product development'],
-        'patterns': ['mechanical design engineer', 'design engineer mechanical', 'cad design engineer'],
-        'weight': 1.0
-    },
-
-    {
-        'role': 'Manufacturing Engineer',
-        'key_skills': ['manufacturing processes', 'production planning', 'quality control', 'lean manufacturing', 'process optimization'],
-        'patterns': ['manufacturing engineer', 'production engineer', 'process engineer manufacturing'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Production Engineer',
-        'key_skills': ['production planning', 'quality control', 'manufacturing', 'operations', 'process improvement'],
-        'patterns': ['production engineer', 'production manager', 'production supervisor'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Maintenance Engineer',
-        'key_skills': ['preventive maintenance', 'troubleshooting', 'equipment maintenance', 'reliability', 'tpm'],
-        'patterns': ['maintenance engineer', 'plant maintenance engineer', 'maintenance manager'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Quality Engineer',
-        'key_skills': ['quality control', 'quality assurance', 'six sigma', 'iso', 'inspection', 'testing'],
-        'patterns': ['quality engineer', 'quality control engineer', 'qa engineer manufacturing'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Automobile Engineer',
-        'key_skills': ['automotive engineering', 'vehicle design', 'catia', 'automotive systems', 'engine design'],
-        'patterns': ['automobile engineer', 'automotive engineer', 'vehicle engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'HVAC Engineer',
-        'key_skills': ['hvac', 'air conditioning', 'ventilation', 'refrigeration', 'thermal systems'],
-        'patterns': ['hvac engineer', 'hvac design engineer', 'mechanical hvac'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Tool & Die Maker',
-        'key_skills': ['tool design', 'die making', 'cnc programming', 'machining', 'precision engineering'],
-        'patterns': ['tool and die maker', 'tool designer', 'die designer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'CNC Programmer',
-        'key_skills': ['cnc programming', 'machining', 'g-code', 'cnc operation', 'manufacturing'],
-        'patterns': ['cnc programmer', 'cnc operator', 'cnc machinist'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Welding Engineer',
-        'key_skills': ['welding', 'welding inspection', 'welding codes', 'ndt', 'fabrication'],
-        'patterns': ['welding engineer', 'welding inspector', 'welding supervisor'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Marine Engineer',
-        'key_skills': ['marine engineering', 'ship systems', 'marine machinery', 'propulsion systems'],
-        'patterns': ['marine engineer', 'ship engineer', 'naval architect'],
-        'weight': 1.0
-    },
-    
-    
-    {
-        'role': 'Hotel Manager',
-        'key_skills': ['hotel management', 'hospitality', 'guest relations', 'operations management', 'front office'],
-        'patterns': ['hotel manager', 'hospitality manager', 'general manager hotel', 'hotel operations manager'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Front Office Manager',
-        'key_skills': ['front office operations', 'guest services', 'hotel management', 'reception', 'booking'],
-        'patterns': ['front office manager', 'fom', 'reception manager'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Housekeeping Manager',
-        'key_skills': ['housekeeping', 'hotel operations', 'staff management', 'cleanliness standards'],
-        'patterns': ['housekeeping manager', 'housekeeping supervisor', 'executive housekeeper'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Food & Beverage Manager',
-        'key_skills': ['food and beverage', 'restaurant management', 'menu planning', 'hospitality', 'service'],
-        'patterns': ['food and beverage manager', 'f&b manager', 'restaurant manager'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Chef / Cook',
-        'key_skills': ['cooking', 'culinary', 'food preparation', 'menu planning', 'kitchen management'],
-        'patterns': ['chef', 'executive chef', 'head chef', 'cook', 'sous chef', 'pastry chef'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Bartender',
-        'key_skills': ['bartending', 'mixology', 'beverage service', 'customer service', 'cocktails'],
-        'patterns': ['bartender', 'mixologist', 'bar manager'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Travel Consultant',
-        'key_skills': ['travel planning', 'tour packages', 'itinerary planning', 'customer service', 'ticketing'],
-        'patterns': ['travel consultant', 'travel agent', 'tour consultant', 'travel advisor'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Tour Guide',
-        'key_skills': ['tour guiding', 'tourism', 'customer service', 'local knowledge', 'languages'],
-        'patterns': ['tour guide', 'tourist guide', 'travel guide'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Event Manager',
-        'key_skills': ['event planning', 'event management', 'coordination', 'logistics', 'vendor management'],
-        'patterns': ['event manager', 'event planner', 'event coordinator'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Cruise Ship Staff',
-        'key_skills': ['hospitality', 'customer service', 'cruise operations', 'entertainment', 'guest services'],
-        'patterns': ['cruise ship staff', 'cruise director', 'cruise attendant'],
-        'weight': 1.0
-    },
-    
-    
-    {
-        'role': 'Store Manager',
-        'key_skills': ['retail management', 'inventory management', 'sales', 'customer service', 'staff management'],
-        'patterns': ['store manager', 'retail manager', 'shop manager'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Sales Associate',
-        'key_skills': ['customer service', 'sales', 'product knowledge', 'retail', 'cash handling'],
-        'patterns': ['sales associate', 'retail associate', 'sales representative retail'],
-        'weight': 1.0
-    },
-    {
-        'role': 'E-commerce Manager',
-        'key_skills': ['e-commerce', 'online retail', 'digital marketing', 'inventory management', 'analytics'],
-        'patterns': ['e-commerce manager', 'ecommerce manager', 'online retail manager'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Merchandiser',
-        'key_skills': ['merchandising', 'product placement', 'inventory', 'visual merchandising', 'retail'],
-        'patterns': ['merchandiser', 'visual merchandiser', 'retail merchandiser'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Category Manager',
-        'key_skills': ['category management', 'product assortment', 'pricing', 'vendor management', 'analytics'],
-        'patterns': ['category manager', 'product category manager'],
-        'weight': 1.0
-    },
-    
-    
-    {
-        'role': 'Agricultural Engineer',
-        'key_skills': ['agricultural engineering', 'farm machinery', 'irrigation', 'soil science', 'crop production'],
-        'patterns': ['agricultural engineer', 'farm engineer', 'agri engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Agronomist',
-        'key_skills': ['agronomy', 'crop science', 'soil management', 'pest control', 'farming'],
-        'patterns': ['agronomist', 'crop consultant', 'agricultural scientist'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Horticulturist',
-        'key_skills': ['horticulture', 'plant science', 'gardening', 'landscaping', 'crop cultivation'],
-        'patterns': ['horticulturist', 'horticulture specialist', 'garden specialist'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Agricultural Officer',
-        'key_skills': ['agriculture', 'farm management', 'crop planning', 'extension services', 'rural development'],
-        'patterns': ['agricultural officer', 'agriculture officer', 'farm officer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Veterinarian',
-        'key_skills': ['veterinary medicine', 'animal care', 'surgery', 'diagnosis', 'animal health'],
-        'patterns': ['veterinarian', 'vet', 'veterinary doctor', 'animal doctor'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Dairy Farm Manager',
-        'key_skills': ['dairy farming', 'livestock management', 'milk production', 'animal husbandry'],
-        'patterns': ['dairy farm manager', 'dairy manager', 'livestock manager'],
-        'weight': 1.0
-    },
-    
-    
-    {
-        'role': 'Fashion Designer',
-        'key_skills': ['fashion design', 'sketching', 'pattern making', 'garment construction', 'textiles'],
-        'patterns': ['fashion designer', 'clothing designer', 'apparel designer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Textile Engineer',
-        'key_skills': ['textile engineering', 'fabric technology', 'quality control', 'textile testing'],
-        'patterns': ['textile engineer', 'textile technologist', 'fabric engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Merchandiser (Fashion)',
-        'key_skills': ['fashion merchandising', 'buying', 'trend analysis', 'product development', 'vendor management'],
-        'patterns': ['fashion merchandiser', 'apparel merchandiser', 'garment merchandiser'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Pattern Maker',
-        'key_skills': ['pattern making', 'garment construction', 'technical drawing', 'fashion design'],
-        'patterns': ['pattern maker', 'pattern cutter', 'garment technician'],
-        'weight': 1.0
-    },
-    
-    
-    {
-        'role': 'Video Editor',
-        'key_skills': ['video editing', 'adobe premiere', 'final cut pro', 'after effects', 'color grading'],
-        'patterns': ['video editor', 'film editor', 'post production editor'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Content Writer',
-        'key_skills': ['content writing', 'copywriting', 'seo writing', 'blogging', 'creative writing'],
-        'patterns': ['content writer', 'copywriter', 'writer', 'content creator'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Journalist',
-        'key_skills': ['journalism', 'reporting', 'news writing', 'interviewing', 'research'],
-        'patterns': ['journalist', 'reporter', 'news reporter', 'correspondent'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Photographer',
-        'key_skills': ['photography', 'photo editing', 'lightroom', 'photoshop', 'lighting', 'composition'],
-        'patterns': ['photographer', 'commercial photographer', 'wedding photographer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Cinematographer',
-        'key_skills': ['cinematography', 'camera operation', 'lighting', 'shot composition', 'filmmaking'],
-        'patterns': ['cinematographer', 'director of photography', 'dop', 'camera operator'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Sound Engineer',
-        'key_skills': ['audio engineering', 'sound mixing', 'recording', 'pro tools', 'sound design'],
-        'patterns': ['sound engineer', 'audio engineer', 'sound technician', 'mixing engineer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Radio Jockey (RJ)',
-        'key_skills': ['radio broadcasting', 'voice modulation', 'entertainment', 'communication', 'hosting'],
-        'patterns': ['radio jockey', 'rj', 'radio host', 'radio presenter'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Anchor / TV Presenter',
-        'key_skills': ['anchoring', 'presentation', 'communication', 'hosting', 'broadcasting'],
-        'patterns': ['anchor', 'tv anchor', 'tv presenter', 'news anchor', 'host'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Actor',
-        'key_skills': ['acting', 'performance', 'theatre', 'improvisation', 'voice modulation'],
-        'patterns': ['actor', 'actress', 'theatre artist', 'performer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Director',
-        'key_skills': ['directing', 'filmmaking', 'storytelling', 'shot composition', 'production'],
-        'patterns': ['director', 'film director', 'creative director media'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Animation Artist',
-        'key_skills': ['animation', '2d animation', '3d animation', 'maya', 'blender', 'character design'],
-        'patterns': ['animator', 'animation artist', '3d animator', '2d animator'],
-        'weight': 1.0
-    },
-    {
-        'role': 'VFX Artist',
-        'key_skills': ['vfx', 'visual effects', 'compositing', 'nuke', 'after effects', 'cg'],
-        'patterns': ['vfx artist', 'visual effects artist', 'compositing artist'],
-        'weight': 1.0
-    },
-    
-    
-    {
-        'role': 'Personal Trainer',
-        'key_skills': ['fitness training', 'exercise programs', 'nutrition', 'strength training', 'cardio'],
-        'patterns': ['personal trainer', 'fitness trainer', 'gym trainer', 'fitness coach'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Sports Coach',
-        'key_skills': ['coaching', 'sports training', 'athlete development', 'strategy', 'motivation'],
-        'patterns': ['sports coach', 'coach', 'athletic coach', 'team coach'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Yoga Instructor',
-        'key_skills': ['yoga', 'asanas', 'meditation', 'pranayama', 'wellness', 'fitness'],
-        'patterns': ['yoga instructor', 'yoga teacher', 'yoga trainer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Physiotherapist',
-        'key_skills': ['physiotherapy', 'rehabilitation', 'exercise therapy', 'sports injuries', 'manual therapy'],
-        'patterns': ['physiotherapist', 'physical therapist', 'rehab specialist'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Sports Manager',
-        'key_skills': ['sports management', 'event management', 'athlete management', 'sports marketing'],
-        'patterns': ['sports manager', 'sports administrator', 'athletic director'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Dietitian / Nutritionist',
-        'key_skills': ['nutrition', 'diet planning', 'meal planning', 'health assessment', 'weight management'],
-        'patterns': ['dietitian', 'nutritionist', 'diet consultant', 'nutrition specialist'],
-        'weight': 1.0
-    },
-    
-    {
-        'role': 'Beautician / Cosmetologist',
-        'key_skills': ['beauty treatments', 'makeup', 'skincare', 'hair styling', 'facials'],
-        'patterns': ['beautician', 'cosmetologist', 'beauty therapist', 'makeup artist'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Hair Stylist',
-        'key_skills': ['hair styling', 'hair cutting', 'hair coloring', 'salon management'],
-        'patterns': ['hair stylist', 'hairdresser', 'hairstylist', 'salon professional'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Salesforce Developer',
-        'key_skills': ['salesforce', 'apex', 'visualforce', 'lightning', 'crm', 'soql'],
-        'patterns': ['salesforce developer', 'salesforce engineer', 'sfdc developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'SAP Consultant',
-        'key_skills': ['sap', 'abap', 'sap hana', 'sap mm', 'sap sd', 'sap fico'],
-        'patterns': ['sap consultant', 'sap developer', 'sap functional', 'sap technical'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Oracle Developer',
-        'key_skills': ['oracle', 'pl/sql', 'oracle forms', 'oracle reports', 'database'],
-        'patterns': ['oracle developer', 'oracle consultant', 'pl/sql developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Shopify Developer',
-        'key_skills': ['shopify', 'liquid', 'e-commerce', 'shopify apps', 'theme development'],
-        'patterns': ['shopify developer', 'shopify expert', 'shopify theme developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'WordPress Developer',
-        'key_skills': ['wordpress', 'php', 'mysql', 'woocommerce', 'theme development', 'plugin development'],
-        'patterns': ['wordpress developer', 'wp developer', 'wordpress theme developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'RPA Developer',
-        'key_skills': ['rpa', 'uipath', 'automation anywhere', 'blue prism', 'process automation'],
-        'patterns': ['rpa developer', 'automation developer', 'uipath developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'ServiceNow Developer',
-        'key_skills': ['servicenow', 'itsm', 'javascript', 'workflows', 'service portal'],
-        'patterns': ['servicenow developer', 'servicenow consultant', 'snow developer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Workday Consultant',
-        'key_skills': ['workday', 'hcm', 'financials', 'integration', 'workday studio'],
-        'patterns': ['workday consultant', 'workday developer', 'workday specialist'],
-        'weight': 1.0
-    },
-    
-    
-    {
-        'role': 'Investment Banker',
-        'key_skills': ['investment banking', 'financial modeling', 'valuation', 'mergers acquisitions', 'capital markets'],
-        'patterns': ['investment banker', 'ib analyst', 'investment banking analyst'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Equity Research Analyst',
-        'key_skills': ['equity research', 'financial analysis', 'stock analysis', 'valuation', 'modeling'],
-        'patterns': ['equity research analyst', 'equity analyst', 'research analyst'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Credit Analyst',
-        'key_skills': ['credit analysis', 'risk assessment', 'financial modeling', 'loan evaluation'],
-        'patterns': ['credit analyst', 'credit risk analyst', 'loan analyst'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Portfolio Manager',
-        'key_skills': ['portfolio management', 'asset allocation', 'investment strategy', 'risk management'],
-        'patterns': ['portfolio manager', 'fund manager', 'investment manager'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Risk Manager',
-        'key_skills': ['risk management', 'risk assessment', 'compliance', 'regulatory', 'internal controls'],
-        'patterns': ['risk manager', 'risk analyst', 'enterprise risk manager'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Actuary',
-        'key_skills': ['actuarial science', 'statistics', 'risk modeling', 'insurance', 'pension'],
-        'patterns': ['actuary', 'actuarial analyst', 'actuarial consultant'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Treasury Manager',
-        'key_skills': ['treasury management', 'cash management', 'liquidity', 'forex', 'financial planning'],
-        'patterns': ['treasury manager', 'treasury analyst', 'cash manager'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Tax Consultant',
-        'key_skills': ['taxation', 'tax planning', 'gst', 'income tax', 'tax compliance'],
-        'patterns': ['tax consultant', 'tax advisor', 'tax manager'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Compliance Officer',
-        'key_skills': ['compliance', 'regulatory', 'aml', 'kyc', 'risk management', 'audit'],
-        'patterns': ['compliance officer', 'compliance manager', 'regulatory compliance'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Insurance Underwriter',
-        'key_skills': ['underwriting', 'risk assessment', 'insurance', 'policy analysis'],
-        'patterns': ['underwriter', 'insurance underwriter', 'underwriting analyst'],
-        'weight': 1.0
-    },
-    
-    
-    {
-        'role': 'Corporate Lawyer',
-        'key_skills': ['corporate law', 'contract law', 'mergers acquisitions', 'compliance', 'legal drafting'],
-        'patterns': ['corporate lawyer', 'corporate counsel', 'in-house counsel'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Legal Advisor',
-        'key_skills': ['legal advisory', 'contract review', 'legal compliance', 'litigation support'],
-        'patterns': ['legal advisor', 'legal consultant', 'legal analyst'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Patent Attorney',
-        'key_skills': ['patent law', 'intellectual property', 'patent drafting', 'trademark', 'ip litigation'],
-        'patterns': ['patent attorney', 'ip attorney', 'patent agent'],
-        'weight': 1.0
-    },
-    
-   
-    {
-        'role': 'Research Scientist',
-        'key_skills': ['research', 'scientific analysis', 'data analysis', 'publications', 'experimentation'],
-        'patterns': ['research scientist', 'scientist', 'research associate', 'researcher'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Professor',
-        'key_skills': ['teaching', 'research', 'curriculum development', 'academic writing', 'mentoring'],
-        'patterns': ['professor', 'assistant professor', 'associate professor'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Librarian',
-        'key_skills': ['library management', 'cataloging', 'information management', 'research assistance'],
-        'patterns': ['librarian', 'library manager', 'information specialist'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Educational Counselor',
-        'key_skills': ['counseling', 'career guidance', 'student advising', 'educational planning'],
-        'patterns': ['educational counselor', 'career counselor', 'academic counselor'],
-        'weight': 1.0
-    },
-    
-    
-    {
-        'role': 'Social Worker',
-        'key_skills': ['social work', 'community development', 'counseling', 'case management', 'advocacy'],
-        'patterns': ['social worker', 'community worker', 'welfare officer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'NGO Program Manager',
-        'key_skills': ['program management', 'ngo operations', 'project coordination', 'fundraising', 'community development'],
-        'patterns': ['ngo program manager', 'development officer', 'project manager ngo'],
-        'weight': 1.0
-    },
-    
-   
-    {
-        'role': 'Real Estate Agent',
-        'key_skills': ['real estate', 'property sales', 'negotiation', 'market analysis', 'client relations'],
-        'patterns': ['real estate agent', 'property consultant', 'realtor'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Property Manager',
-        'key_skills': ['property management', 'tenant relations', 'maintenance', 'lease administration'],
-        'patterns': ['property manager', 'facility manager', 'building manager'],
-        'weight': 1.0
-    },
-    
-   
-    {
-        'role': 'Insurance Agent',
-        'key_skills': ['insurance sales', 'policy advising', 'customer service', 'claims processing'],
-        'patterns': ['insurance agent', 'insurance advisor', 'lic agent'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Claims Adjuster',
-        'key_skills': ['claims processing', 'investigation', 'damage assessment', 'negotiation'],
-        'patterns': ['claims adjuster', 'claims examiner', 'insurance adjuster'],
-        'weight': 1.0
-    },
-    
-    
-    {
-        'role': 'Game Designer',
-        'key_skills': ['game design', 'level design', 'game mechanics', 'storytelling', 'prototyping'],
-        'patterns': ['game designer', 'level designer', 'gameplay designer'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Musician',
-        'key_skills': ['music', 'performance', 'composition', 'music theory', 'instruments'],
-        'patterns': ['musician', 'music artist', 'composer', 'singer'],
-        'weight': 1.0
-    },
-    
-  
-    {
-        'role': 'Aircraft Loadmaster',
-        'key_skills': ['load planning', 'weight and balance', 'cargo operations', 'aircraft loading'],
-        'patterns': ['loadmaster', 'cargo specialist', 'load planner'],
-        'weight': 1.0
-    },
-    
-   
-    {
-        'role': 'Warehouse Manager',
-        'key_skills': ['warehouse management', 'inventory', 'logistics', 'operations', 'wms'],
-        'patterns': ['warehouse manager', 'warehouse supervisor', 'warehouse operations'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Logistics Coordinator',
-        'key_skills': ['logistics', 'supply chain', 'coordination', 'shipping', 'transportation'],
-        'patterns': ['logistics coordinator', 'logistics executive', 'logistics analyst'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Customs Officer',
-        'key_skills': ['customs clearance', 'import export', 'documentation', 'compliance', 'trade regulations'],
-        'patterns': ['customs officer', 'customs executive', 'customs specialist'],
-        'weight': 1.0
-    },
-    
- 
-    {
-        'role': 'Ship Captain',
-        'key_skills': ['navigation', 'maritime operations', 'crew management', 'safety', 'ship handling'],
-        'patterns': ['ship captain', 'master mariner', 'ship master'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Port Manager',
-        'key_skills': ['port operations', 'cargo handling', 'logistics', 'maritime management'],
-        'patterns': ['port manager', 'harbor master', 'port operations manager'],
-        'weight': 1.0
-    },
-    
- 
-    {
-        'role': 'Mining Engineer',
-        'key_skills': ['mining', 'excavation', 'mineral processing', 'mine planning', 'safety'],
-        'patterns': ['mining engineer', 'mine engineer', 'mining professional'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Geologist',
-        'key_skills': ['geology', 'geological survey', 'mineral exploration', 'rock analysis'],
-        'patterns': ['geologist', 'exploration geologist', 'geological engineer'],
-        'weight': 1.0
-    },
-    
-  
-    {
-        'role': 'Translator',
-        'key_skills': ['translation', 'language proficiency', 'localization', 'interpretation'],
-        'patterns': ['translator', 'language translator', 'localization specialist'],
-        'weight': 1.0
-    },
-    {
-        'role': 'Interpreter',
-        'key_skills': ['interpretation', 'language proficiency', 'simultaneous interpretation', 'communication'],
-        'patterns': ['interpreter', 'language interpreter', 'conference interpreter'],
-        'weight': 1.0
-    }
-        ]
-
-        
-        # STEP 1: Find Primary Match (becomes Priority 1)
-        primary_match = None
-        primary_score = 0
-        
-        for role_pattern in role_detection_patterns:
-            role_name = role_pattern['role']
-            patterns = role_pattern['patterns']
-            key_skills = role_pattern['key_skills']
-            
-            # Calculate match score for this role
-            pattern_matches = 0
-            skill_matches = 0
-            
-            # Check pattern matches in job title/description
-            for pattern in patterns:
-                if pattern in all_text:
-                    pattern_matches += 1
-            
-            # Check skill matches in primary skills
-            if primary_skills:
-                for skill in key_skills:
-                    if any(skill.lower() in ps.lower() for ps in primary_skills):
-                        skill_matches += 1
-            
-            # Calculate total match score
-            total_score = (pattern_matches * 2) + skill_matches  # Pattern matches get 2x weight
-            
-            # Check if this is the best match so far
-            if total_score > primary_score:
-                primary_score = total_score
-                primary_match = role_pattern.copy()
+        # One pass over the JD text via the precompiled role index
+        primary_index, secondary_indices = ROLE_INDEX.detect(all_text, primary_skills, secondary_skills)
         
-        # STEP 2: Set Primary Match as Priority 1
-        if primary_match and primary_score > 0:
+        # STEP 1 + 2: Set Primary Match as Priority 1
+        if primary_index is not None:
+            primary_match = ROLE_DETECTION_PATTERNS[primary_index].copy()
             primary_match['priority'] = 1
             priorities.append(primary_match)
         
-        # STEP 3: Find Secondary Matches (Priority 2 & 3)
-        if len(priorities) < 3:
-            secondary_candidates = []
-            
-            for role_pattern in role_detection_patterns:
-                # Skip if this is already the primary match
-                if primary_match and role_pattern['role'] == primary_match['role']:
-                    continue
-                
-                role_name = role_pattern['role']
-                patterns = role_pattern['patterns']
-                key_skills = role_pattern['key_skills']
-                
-                # Calculate secondary match score
-                pattern_matches = sum(1 for pattern in patterns if pattern in all_text)
-                skill_matches = 0
-                
-                # Check in secondary skills
-                if secondary_skills:
-                    for skill in key_skills:
-                        if any(skill.lower() in ss.lower() for ss in secondary_skills):
-                            skill_matches += 1
-                
-                # Also check in primary skills but with lower weight
-                if primary_skills:
-                    for skill in key_skills:
-                        if any(skill.lower() in ps.lower() for ps in primary_skills):
-                            skill_matches += 0.5
-                
-                total_score = pattern_matches + skill_matches
-                
-                if total_score > 0:
-                    secondary_candidates.append({
-                        'role_pattern': role_pattern.copy(),
-                        'score': total_score
-                    })
-            
-            # Sort secondary candidates by score and add top 2
-            secondary_candidates.sort(key=lambda x: x['score'], reverse=True)
-            
-            for i, candidate in enumerate(secondary_candidates[:2]):
-                role_pattern = candidate['role_pattern']
-                priority_level = i + 2  # Priority 2, 3
-                role_pattern['priority'] = priority_level
-                role_pattern['weight'] = 0.8 if priority_level == 2 else 0.6
-                priorities.append(role_pattern)
+        # STEP 3: Secondary Matches (Priority 2 & 3)
+        for i, role_index in enumerate(secondary_indices):
+            role_pattern = ROLE_DETECTION_PATTERNS[role_index].copy()
+            priority_level = i + 2  # Priority 2, 3
+            role_pattern['priority'] = priority_level
+            role_pattern['weight'] = 0.8 if priority_level == 2 else 0.6
+            priorities.append(role_pattern)
         
         # FALLBACK 1: Use Primary Skills if no matches
         if not priorities and primary_skills:
             # Determine role from primary skills
             primary_skills_lower = [skill.lower() for skill in primary_skills]
             
-            # Technology-based role detection
-            role_mappings = [
-                (['python', 'django', 'flask', 'fastapi'], 'Python Developer', ['python', 'django', 'flask', 'fastapi']),
-                (['java', 'spring', 'hibernate', 'jsp'], 'Java Developer', ['java', 'spring', 'hibernate', 'maven']),
-                (['.net', 'c#', 'asp.net', 'mvc'], '.NET Developer', ['c#', '.net', 'asp.net', 'mvc']),
-                (['javascript', 'react', 'angular', 'vue', 'node.js'], 'JavaScript Developer', ['javascript', 'react', 'angular', 'node.js']),
-                (['php', 'laravel', 'codeigniter'], 'PHP Developer', ['php', 'laravel', 'mysql']),
-                (['docker', 'kubernetes', 'jenkins', 'terraform', 'aws'], 'DevOps Engineer', ['docker', 'kubernetes', 'aws', 'jenkins']),
-                (['android', 'ios', 'react native', 'flutter'], 'Mobile Developer', ['android', 'ios', 'react native', 'flutter'])
-            ]
-            
             best_role = None
             best_match_count = 0
             
-            for tech_list, role_name, key_skills in role_mappings:
+            # Technology-based role detection
+            for tech_list, role_name, key_skills in ROLE_SKILL_FALLBACKS:
                 match_count = sum(1 for tech in tech_list if any(tech in skill for skill in primary_skills_lower))
                 if match_count > best_match_count:
                     best_match_count = match_count
@@ -3514,11 +1817,15 @@ class MatchingEngine:
         
         return 1.0
     
-    def _get_default_score(self, error_msg: str) -> dict:
+    def _get_default_result(self, error_msg: str) -> ATSScoreResult:
         # Default score structure
-        return {
-            "overall_score": 0,
-            "skill_match_score": 0,
-            "experience_score": 0,
-            "detailed_analysis": {"error": error_msg}
-        }
+        return ATSScoreResult(
+            overall_score=0,
+            skill_match_score=0,
+            experience_score=0,
+            detailed_analysis={"error": error_msg},
+            error=error_msg
+        )
+    
+    def _get_default_score(self, error_msg: str) -> dict:
+        return self._get_default_result(error_msg).to_dict()
@@ -0,0 +1,260 @@
+import hashlib
+import multiprocessing
+import os
+import pickle
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config import settings
+from .matching_engine import MatchingEngine, JDScoringPlan
+from .model_registry import model_registry
+
+
+EXECUTOR_MODES = ("thread", "process")
+
+# Concurrent agentic/LLM calls are bounded by the remote API, not by local cores
+IO_BOUND_MAX_WORKERS = 4
+
+# (resume_id, filename, structured_data) - all a process worker needs per resume
+ResumePayload = Tuple[int, str, Dict[str, Any]]
+
+# Resumes per process task: the pickled JD plan travels once per chunk, not per resume
+MAX_CHUNK_SIZE = 16
+
+# JD plans each process worker keeps unpickled (a few sessions matching at once)
+WORKER_PLAN_CACHE_SIZE = 4
+
+
+@dataclass
+class ResumeProcessingResult:
+    resume_id: int
+    filename: str
+    candidate_name: str
+    ats_score: dict = None
+    error: str = None
+    processing_time: float = 0.0
+    skill_vector: dict = None  # traditional scoring only (see ATSScoreResult.skill_vector)
+
+
+def resume_payload(resume: Any) -> ResumePayload:
+    """Compact, picklable view of a Resume row (no ORM state crosses the process boundary)"""
+    return (resume.id, resume.filename, resume.structured_data or {})
+
+
+def resolve_executor_mode(io_bound: bool = False) -> str:
+    """Thread pool for I/O-bound (agentic/LLM) matching, configured backend otherwise"""
+    if io_bound:
+        return "thread"
+
+    mode = (settings.MATCHING_EXECUTOR or "process").lower()
+    if mode not in EXECUTOR_MODES:
+        print(f"⚠️ Unknown MATCHING_EXECUTOR '{mode}', using 'process'")
+        mode = "process"
+    return mode
+
+
+def resolve_max_workers(task_count: int, io_bound: bool = False) -> int:
+    """Worker count sized to the CPU cores (MATCHING_MAX_WORKERS=0) and never above the task count"""
+    if io_bound:
+        limit = IO_BOUND_MAX_WORKERS
+    else:
+        limit = settings.MATCHING_MAX_WORKERS or os.cpu_count() or 1
+    return max(1, min(limit, task_count))
+
+
+def _process_context():
+    # fork shares the parent's preloaded (gc-frozen) spaCy pages copy-on-write;
+    # spawn is the safe default where fork is unavailable or unreliable (macOS)
+    if "fork" in multiprocessing.get_all_start_methods() and sys.platform != "darwin":
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context("spawn")
+
+
+# Per-process worker state: the engine is built once by _init_process_worker,
+# JD plans are unpickled on first use and kept by key
+_worker_engine: Optional[MatchingEngine] = None
+_worker_plans: Dict[str, Tuple[Dict, Dict, JDScoringPlan]] = {}
+
+
+def _init_process_worker():
+    """Runs once per worker process: load spaCy (a no-op after fork) and build the engine"""
+    global _worker_engine
+
+    model_registry.preload(freeze=False)
+    _worker_engine = MatchingEngine()
+
+
+def _worker_plan(plan_key: str, plan_bytes: bytes) -> Tuple[Dict, Dict, JDScoringPlan]:
+    bundle = _worker_plans.get(plan_key)
+    if bundle is None:
+        if len(_worker_plans) >= WORKER_PLAN_CACHE_SIZE:
+            _worker_plans.pop(next(iter(_worker_plans)))
+        bundle = pickle.loads(plan_bytes)
+        _worker_plans[plan_key] = bundle
+    return bundle
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def score_payloads(plan_key: str, plan_bytes: bytes, payloads: List[ResumePayload]) -> List[ResumeProcessingResult]:
+    """Traditional scoring of a chunk of resumes inside a process worker"""
+    jd_data, skills_weightage, plan = _worker_plan(plan_key, plan_bytes)
+    return [score_payload(payload, jd_data, skills_weightage, plan) for payload in payloads]
+
+
+def score_payload(
+    payload: ResumePayload, jd_data: Dict, skills_weightage: Dict, plan: JDScoringPlan
+) -> ResumeProcessingResult:
+    """Traditional scoring of one resume inside a process worker"""
+    resume_id, filename, resume_data = payload
+    start_time = time.time()
+
+    try:
+        score_result = _worker_engine.score_resume(
+            jd_data, resume_data, skills_weightage, plan=plan,
+            scores_only=settings.MATCHING_SCORES_ONLY,
+        )
+        detailed_analysis = score_result.detailed_analysis
+        detailed_analysis["scoring_method"] = "Traditional"
+
+        return ResumeProcessingResult(
+            resume_id=resume_id,
+            filename=filename,
+            candidate_name=resume_data.get("name", "Unknown") if resume_data else "Unknown",
+            ats_score={
+                "overall_score": round(score_result.overall_score, 2),
+                "skill_match_score": round(score_result.skill_match_score, 2),
+                "experience_score": round(score_result.experience_score, 2),
+                "detailed_analysis": detailed_analysis,
+            },
+            skill_vector=score_result.skill_vector,
+            processing_time=time.time() - start_time,
+        )
+
+    except Exception as e:
+        print(f"❌ Error processing {filename}: {str(e)}")
+        traceback.print_exc()
+        return ResumeProcessingResult(
+            resume_id=resume_id,
+            filename=filename,
+            candidate_name=resume_data.get("name", "Unknown") if resume_data else "Unknown",
+            error=str(e),
+            processing_time=time.time() - start_time,
+        )
+
+
+# One pool per app process, started at app startup (warm_process_pool) so workers
+# fork before request threads hold any locks, and reused by every matching run
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _pool_size() -> int:
+    return max(1, settings.MATCHING_MAX_WORKERS or os.cpu_count() or 1)
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _process_pool_lock:
+        # A worker that died (e.g. OOM-killed) breaks the pool for good: start a new one
+        if _process_pool is not None and getattr(_process_pool, "_broken", False):
+            print("⚠️ Matching process pool broken, restarting it")
+            _process_pool = None
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=_pool_size(),
+                mp_context=_process_context(),
+                initializer=_init_process_worker,
+            )
+        return _process_pool
+
+
+def warm_process_pool():
+    """Start the matching workers now (app startup) instead of on the first matching run"""
+    start = time.time()
+    get_process_pool().submit(_ping).result()
+    print(f"🔥 Matching process pool ready ({_pool_size()} workers, {time.time() - start:.2f}s)")
+
+
+def shutdown_process_pool():
+    """Stop the shared matching workers (app shutdown)"""
+    global _process_pool
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+class MatchingExecutor:
+    """
+    Runs per-resume matching on one of two backends
+
+    - "process": traditional scoring is CPU-bound (regex + spaCy) and serialized
+      by the GIL in threads, so it runs on the shared, persistent process pool.
+      Tasks are chunks of compact resume payloads; the JD plan is pickled once
+      per run and unpickled once per worker (keyed by its hash).
+    - "thread": the agentic/LLM path is I/O-bound and keeps using threads.
+
+    Use as a context manager; submit_all() maps each Future (a list of
+    ResumeProcessingResult) to the resumes it scores.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        max_workers: int,
+        jd_data: Dict,
+        skills_weightage: Dict,
+        plan: JDScoringPlan,
+    ):
+        self.mode = mode
+        self.max_workers = max_workers
+        self._pool = None
+
+        if mode == "process":
+            try:
+                self._pool = get_process_pool()
+                self._plan_bytes = pickle.dumps((jd_data, skills_weightage, plan))
+                self._plan_key = hashlib.sha256(self._plan_bytes).hexdigest()
+            except (OSError, ValueError, NotImplementedError, pickle.PicklingError) as e:
+                print(f"⚠️ Process pool unavailable ({e}), falling back to threads")
+                self.mode = "thread"
+
+        if self.mode == "thread":
+            self._pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit_all(
+        self, resumes: List[Any], thread_task: Callable[[Any], ResumeProcessingResult]
+    ) -> Dict[Future, List[Any]]:
+        """Score resumes: thread_task(resume) per resume in thread mode, score_payloads() per chunk in process mode"""
+        if self.mode == "thread":
+            return {self._pool.submit(lambda r: [thread_task(r)], resume): [resume] for resume in resumes}
+
+        chunk_size = max(1, min(MAX_CHUNK_SIZE, len(resumes) // (self.max_workers * 4)))
+        futures = {}
+        for start in range(0, len(resumes), chunk_size):
+            chunk = resumes[start:start + chunk_size]
+            future = self._pool.submit(
+                score_payloads, self._plan_key, self._plan_bytes, [resume_payload(r) for r in chunk]
+            )
+            futures[future] = chunk
+        return futures
+
+    def shutdown(self):
+        # The process pool is shared and outlives the run
+        if self.mode == "thread":
+            self._pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.shutdown()
+        return False
@@ -0,0 +1,195 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+JOB_STATUSES = ("queued", "running", "completed", "failed")
+
+# Finished jobs kept in memory for polling; the oldest are dropped first
+MAX_FINISHED_JOBS = 100
+
+
+class MatchingJob:
+    """
+    Progress and partial results of one background matching run
+
+    Workers call record_result() as each resume finishes; readers poll
+    snapshot()/results_since() or follow the event log (events_since) for SSE.
+    All access goes through one lock, so it is safe across threads.
+    """
+
+    def __init__(self, session_id: str, total: int):
+        self.job_id = uuid.uuid4().hex
+        self.session_id = session_id
+        self.total = total
+        self.status = "queued"
+        self.completed = 0
+        self.failed = 0
+        self.results: List[Dict[str, Any]] = []
+        self.events: List[Dict[str, Any]] = []
+        self.summary: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def start(self):
+        with self._lock:
+            self.status = "running"
+            self.started_at = time.time()
+            self._add_event("started", {"total": self.total})
+
+    def record_result(self, result: Any):
+        """Record one finished resume (a ResumeProcessingResult)"""
+        with self._lock:
+            if result.ats_score:
+                self.completed += 1
+                entry = {
+                    "resume_id": result.resume_id,
+                    "filename": result.filename,
+                    "candidate_name": result.candidate_name,
+                    "overall_score": result.ats_score["overall_score"],
+                    "skill_match_score": result.ats_score["skill_match_score"],
+                    "experience_score": result.ats_score["experience_score"],
+                    "scoring_method": result.ats_score["detailed_analysis"].get("scoring_method", "Unknown"),
+                    "processing_time": round(result.processing_time, 3),
+                }
+                self.results.append(entry)
+                self._add_event("result", entry)
+            else:
+                self.failed += 1
+                self._add_event("error", {
+                    "resume_id": result.resume_id,
+                    "filename": result.filename,
+                    "error": result.error,
+                })
+
+    def finish(self, summary: Dict[str, Any]):
+        with self._lock:
+            self.status = "completed"
+            self.summary = summary
+            self.finished_at = time.time()
+            self._add_event("completed", self._progress())
+
+    def fail(self, error: str):
+        with self._lock:
+            self.status = "failed"
+            self.error = error
+            self.finished_at = time.time()
+            self._add_event("failed", {"error": error})
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Progress view for the polling endpoint"""
+        with self._lock:
+            snapshot = {
+                "job_id": self.job_id,
+                "session_id": self.session_id,
+                "status": self.status,
+                "created_at": self.created_at.isoformat(),
+                **self._progress(),
+            }
+            if self.error:
+                snapshot["error"] = self.error
+            if self.summary is not None:
+                snapshot["summary"] = self.summary
+            return snapshot
+
+    def results_since(self, offset: int = 0) -> Dict[str, Any]:
+        """Results finished after `offset`, plus a provisional ranking of everything so far"""
+        with self._lock:
+            offset = max(0, offset)
+            new_results = self.results[offset:]
+            ranking = sorted(self.results, key=lambda r: r["overall_score"], reverse=True)
+            return {
+                "job_id": self.job_id,
+                "status": self.status,
+                "new_results": new_results,
+                "next_offset": len(self.results),
+                "provisional_ranking": [
+                    {"rank": rank, "resume_id": r["resume_id"], "overall_score": r["overall_score"]}
+                    for rank, r in enumerate(ranking, 1)
+                ],
+                **self._progress(),
+            }
+
+    def events_since(self, offset: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            return self.events[offset:]
+
+    def _progress(self) -> Dict[str, Any]:
+        # Caller must hold self._lock
+        processed = self.completed + self.failed
+        elapsed = 0.0
+        if self.started_at:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+        return {
+            "total": self.total,
+            "processed": processed,
+            "completed": self.completed,
+            "failed": self.failed,
+            "percent": round(processed / self.total * 100, 1) if self.total else 100.0,
+            "elapsed_seconds": round(elapsed, 2),
+        }
+
+    def _add_event(self, event: str, data: Dict[str, Any]):
+        # Caller must hold self._lock
+        self.events.append({"id": len(self.events), "event": event, "data": data})
+
+
+class MatchingJobConflict(Exception):
+    """Another matching (job or synchronous run) is already running for the session"""
+
+    status_code = 409
+
+    def __init__(self, job: "MatchingJob"):
+        super().__init__(f"Matching job {job.job_id} is already running for this session")
+        self.job = job
+
+
+class MatchingJobRegistry:
+    """In-memory registry of matching jobs (per API process)"""
+
+    def __init__(self, max_finished: int = MAX_FINISHED_JOBS):
+        self.max_finished = max_finished
+        self._jobs: "OrderedDict[str, MatchingJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, session_id: str, total: int) -> MatchingJob:
+        """New job for the session; raises MatchingJobConflict while another one is unfinished"""
+        job = MatchingJob(session_id, total)
+        with self._lock:
+            # Checked under the same lock as the insert, so two requests can't both start
+            for other in self._jobs.values():
+                if other.session_id == session_id and not other.is_finished:
+                    raise MatchingJobConflict(other)
+            self._jobs[job.job_id] = job
+            self._prune()
+        return job
+
+    def get(self, job_id: str) -> Optional[MatchingJob]:
+        return self._jobs.get(job_id)
+
+    def active_for_session(self, session_id: str) -> Optional[MatchingJob]:
+        with self._lock:
+            for job in self._jobs.values():
+                if job.session_id == session_id and not job.is_finished:
+                    return job
+        return None
+
+    def _prune(self):
+        # Caller must hold self._lock
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+
+# Singleton instance
+matching_jobs = MatchingJobRegistry()
@@ -0,0 +1,149 @@
+import gc
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import spacy
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Preferred pipelines, best first. The first one that loads wins.
+DEFAULT_SPACY_MODELS = ["en_core_web_md", "en_core_web_sm"]
+
+
+def _current_rss_mb() -> float:
+    """Resident set size of this process in MB (0.0 if unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    if resource is not None:
+        # ru_maxrss is KB on Linux, bytes on macOS - good enough as a fallback
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return 0.0
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of spaCy pipelines
+
+    - Each pipeline is loaded at most once per process
+    - Every MatchingEngine receives the same shared handle (inference is read-only)
+    - preload() + gc.freeze() keeps the vector tables in pages that forked
+      workers share copy-on-write instead of duplicating them
+    """
+
+    def __init__(self):
+        self._models: Dict[str, Any] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._failed: set = set()
+        self._default_name: Optional[str] = None
+        self._default_resolved = False
+        self._frozen = False
+        self._lock = threading.Lock()
+
+        # A fork while another thread holds the lock would deadlock the child
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+
+    def _after_fork_in_child(self):
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[Any]:
+        """Return the pipeline `name`, loading it on first use (None if not installed)"""
+        nlp = self._models.get(name)
+        if nlp is not None:
+            return nlp
+
+        with self._lock:
+            # Another thread may have finished the load while we waited
+            if name in self._models:
+                return self._models[name]
+            if name in self._failed:
+                return None
+            return self._load(name)
+
+    def get_default(self) -> Optional[Any]:
+        """Return the first available pipeline from DEFAULT_SPACY_MODELS"""
+        if self._default_resolved:
+            return self._models.get(self._default_name) if self._default_name else None
+
+        for name in DEFAULT_SPACY_MODELS:
+            nlp = self.get(name)
+            if nlp is not None:
+                self._default_name = name
+                self._default_resolved = True
+                return nlp
+
+        self._default_resolved = True
+        print("spaCy model not found, using basic matching")
+        return None
+
+    def preload(self, freeze: bool = True) -> Optional[Any]:
+        """
+        Load the default pipeline up-front (call before forking workers)
+
+        Args:
+            freeze: Move everything allocated so far into the permanent GC
+                    generation so collections in forked children never touch
+                    (and therefore never copy) the model's pages
+        """
+        nlp = self.get_default()
+        if freeze and hasattr(gc, "freeze") and not self._frozen:
+            gc.collect()
+            gc.freeze()
+            self._frozen = True
+        return nlp
+
+    def stats(self) -> Dict[str, Any]:
+        """Load time / memory footprint of every pipeline, for /api/status"""
+        return {
+            "pid": os.getpid(),
+            "default_model": self._default_name,
+            "frozen_for_fork": self._frozen,
+            "models": {name: dict(info) for name, info in self._stats.items()},
+            "unavailable": sorted(self._failed),
+        }
+
+    def _load(self, name: str) -> Optional[Any]:
+        # Caller must hold self._lock
+        rss_before = _current_rss_mb()
+        start_time = time.time()
+
+        try:
+            nlp = spacy.load(name)
+        except OSError:
+            self._failed.add(name)
+            print(f"spaCy model '{name}' not installed")
+            return None
+
+        load_time = time.time() - start_time
+        self._models[name] = nlp
+        self._stats[name] = {
+            "load_time_seconds": round(load_time, 3),
+            "rss_delta_mb": round(max(0.0, _current_rss_mb() - rss_before), 1),
+            "vectors": int(nlp.vocab.vectors.n_keys),
+            "vector_width": int(nlp.vocab.vectors_length),
+            "pipeline": list(nlp.pipe_names),
+            "loaded_at": datetime.utcnow().isoformat(),
+            "loaded_in_pid": os.getpid(),
+        }
+        print(f"spaCy model '{name}' loaded in {load_time:.2f}s")
+        return nlp
+
+
+# Singleton instance
+model_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    return model_registry
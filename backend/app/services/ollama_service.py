@@ -1,8 +1,10 @@
-import requests
+import httpx
 import json
 import re
 from typing import Dict, Any, List
 from backend.app.config import settings
+from backend.app.services.http_client import http_clients
+from backend.app.services.rate_limiter import rate_limits
 
 
 class OllamaService:
@@ -24,9 +26,9 @@ class OllamaService:
         
         print(f"✅ OllamaService initialized: {self.base_url} | Model: {self.model}")
     
-    def _make_request(self, prompt: str, system_prompt: str = None, temperature: float = 0.2) -> str:
+    async def _make_request(self, prompt: str, system_prompt: str = None, temperature: float = 0.2) -> str:
         """
-        Make a request to Ollama inference endpoint
+        Make a request to Ollama inference endpoint (pooled keep-alive connection)
         
         Args:
             prompt: User prompt
@@ -57,13 +59,13 @@ class OllamaService:
             print(f"   Model: {self.model}")
             print(f"   Prompt Length: {len(prompt)} chars")
             
-            # Make request
-            response = requests.post(
+            # Make request (waits for the Ollama budget, backs off on 429)
+            client = http_clients.get("ollama")
+            response = await rate_limits.get("ollama").send(lambda: client.post(
                 f"{self.base_url}/api/generate",
                 json=payload,
-                timeout=self.timeout,
                 headers={"Content-Type": "application/json"}
-            )
+            ))
             
             response.raise_for_status()
             result = response.json()
@@ -78,16 +80,16 @@ class OllamaService:
             
             return generated_text.strip()
         
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             raise Exception(f"Ollama request timeout after {self.timeout}s")
-        except requests.exceptions.ConnectionError:
+        except httpx.ConnectError:
             raise Exception(f"Cannot connect to Ollama at {self.base_url}")
-        except requests.exceptions.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             raise Exception(f"Ollama HTTP error: {e.response.status_code} - {e.response.text}")
         except Exception as e:
             raise Exception(f"Ollama request failed: {str(e)}")
     
-    def structure_job_description(self, jd_text: str) -> Dict[str, Any]:
+    async def structure_job_description(self, jd_text: str) -> Dict[str, Any]:
         """
         Extract structured data from job description
         """
@@ -117,12 +119,12 @@ Job Description:
 Return ONLY the JSON object, no explanations.
 """
         
-        response = self._make_request(prompt, system_prompt, temperature=0.1)
+        response = await self._make_request(prompt, system_prompt, temperature=0.1)
         
         # Parse JSON from response
         return self._parse_json_response(response, "job description")
     
-    def extract_resume_information(self, resume_text: str) -> Dict[str, Any]:
+    async def extract_resume_information(self, resume_text: str) -> Dict[str, Any]:
         """
         Extract structured data from resume
         """
@@ -166,7 +168,7 @@ Resume Text:
 Return ONLY valid JSON.
 """
         
-        response = self._make_request(prompt, system_prompt, temperature=0.1)
+        response = await self._make_request(prompt, system_prompt, temperature=0.1)
         
         # Parse and normalize
         parsed = self._parse_json_response(response, "resume")
@@ -184,7 +186,7 @@ Return ONLY valid JSON.
         
         return parsed
     
-    def refine_structure_based_on_feedback(self, current_structure: Dict, feedback: str) -> Dict[str, Any]:
+    async def refine_structure_based_on_feedback(self, current_structure: Dict, feedback: str) -> Dict[str, Any]:
         """
         Refine JD structure based on user feedback
         """
@@ -210,7 +212,7 @@ Instructions:
 Return the updated structure:
 """
         
-        response = self._make_request(prompt, system_prompt, temperature=0.1)
+        response = await self._make_request(prompt, system_prompt, temperature=0.1)
         
         return self._parse_json_response(response, "refinement")
     
@@ -244,9 +246,9 @@ Return the updated structure:
             print(f"Parse error in {operation}: {str(e)}")
             return {"error": f"Failed to parse {operation}", "exception": str(e)}
     
-    def health_check(self) -> bool:
+    async def health_check(self) -> bool:
         try:
-            response = requests.get(
+            response = await http_clients.get("ollama").get(
                 f"{self.base_url}/api/tags",
                 timeout=5
             )
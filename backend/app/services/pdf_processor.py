@@ -1,26 +1,165 @@
-import fitz  # PyMuPDF
+import io
+import multiprocessing
 import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, BinaryIO, List, Optional, Union
+
+import fitz  # PyMuPDF
+
+from ..config import settings
+
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
+
+
+PDF_BACKENDS = ("pymupdf", "pypdf2")
+
+# In-memory bytes, an open/spooled binary handle, or a path
+PDFSource = Union[bytes, bytearray, memoryview, BinaryIO, str, os.PathLike]
+
+
+@dataclass
+class PDFExtractionResult:
+    text: str
+    page_count: int = 0
+    pages_read: int = 0
+    truncated: bool = False  # a page or character cap was hit
+    backend: str = "pymupdf"
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def _read_source(source: PDFSource) -> Union[bytes, str]:
+    """Bytes for in-memory sources and handles, a filesystem path otherwise"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, "read"):
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return source.read()
+    return os.fspath(source)
+
 
 class PDFProcessor:
-    def __init__(self):
-        pass
-    
+    """
+    PDF text extraction engine shared by resume ingestion and JD uploads
+
+    - Opens from bytes, a (spooled) file handle or a path, without temp files
+    - Joins pages once (no quadratic string concatenation)
+    - Stops at max_pages / max_chars so one huge scan cannot stall a batch
+    - Backends: PyMuPDF (default, fastest) and PyPDF2
+    - submit() / extract_many() run on a shared, persistent process pool;
+      PyMuPDF holds the GIL while parsing, so threads would not run pages in
+      parallel
+    """
+
+    def __init__(self, backend: str = None, max_pages: int = None, max_chars: int = None):
+        self.backend = (backend or settings.PDF_BACKEND or "pymupdf").lower()
+        if self.backend not in PDF_BACKENDS or (self.backend == "pypdf2" and PyPDF2 is None):
+            print(f"⚠️ PDF backend '{self.backend}' unavailable, using 'pymupdf'")
+            self.backend = "pymupdf"
+        self.max_pages = settings.PDF_MAX_PAGES if max_pages is None else max_pages
+        self.max_chars = settings.PDF_MAX_CHARS if max_chars is None else max_chars
+
+    def extract(self, source: PDFSource) -> PDFExtractionResult:
+        """Extract text and page statistics; raises on unreadable PDFs"""
+        start = time.perf_counter()
+        data = _read_source(source)
+        if self.backend == "pypdf2":
+            result = self._extract_pypdf2(data)
+        else:
+            result = self._extract_pymupdf(data)
+        result.seconds = time.perf_counter() - start
+        return result
+
+    def extract_text(self, source: PDFSource) -> str:
+        return self.extract(source).text
+
     def extract_text_from_pdf(self, file_path: str) -> str:
-        # Extract text from PDF file using PyMuPDF
+        # Extract text from PDF file (path, bytes or handle)
         try:
-            doc = fitz.open(file_path)
-            text = ""
-            
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                text += page.get_text()
-            
-            doc.close()
-            return text.strip()
-        
+            return self.extract(file_path).text
         except Exception as e:
             raise Exception(f"Error extracting text from PDF: {str(e)}")
-    
+
+    def _collect(self, pages: Any, page_count: int, page_text) -> PDFExtractionResult:
+        limit = min(page_count, self.max_pages) if self.max_pages else page_count
+        parts: List[str] = []
+        chars = 0
+        pages_read = 0
+        for index in range(limit):
+            text = page_text(pages, index)
+            parts.append(text)
+            chars += len(text)
+            pages_read += 1
+            if self.max_chars and chars >= self.max_chars:
+                break
+
+        text = "".join(parts)
+        truncated = pages_read < page_count or bool(self.max_chars and len(text) > self.max_chars)
+        if self.max_chars:
+            text = text[:self.max_chars]
+        return PDFExtractionResult(
+            text=text.strip(),
+            page_count=page_count,
+            pages_read=pages_read,
+            truncated=truncated,
+            backend=self.backend,
+        )
+
+    def _extract_pymupdf(self, data: Union[bytes, str]) -> PDFExtractionResult:
+        doc = fitz.open(stream=data, filetype="pdf") if isinstance(data, bytes) else fitz.open(data)
+        try:
+            return self._collect(doc, doc.page_count, lambda d, i: d.load_page(i).get_text())
+        finally:
+            doc.close()
+
+    def _extract_pypdf2(self, data: Union[bytes, str]) -> PDFExtractionResult:
+        reader = PyPDF2.PdfReader(io.BytesIO(data) if isinstance(data, bytes) else data)
+
+        def page_text(r, i):
+            try:
+                return (r.pages[i].extract_text() or "") + "\n"
+            except Exception as e:
+                print(f"Error extracting page {i}: {e}")
+                return ""
+
+        return self._collect(reader, len(reader.pages), page_text)
+
+    def submit(self, source: PDFSource) -> Future:
+        """Extract on the shared process pool; the future's result carries `error` instead of raising"""
+        payload = source if isinstance(source, (str, os.PathLike)) else _read_source(source)
+        return get_process_pool().submit(_extract_one, self.backend, self.max_pages, self.max_chars, payload)
+
+    def extract_many(self, sources: List[PDFSource], max_workers: int = None) -> List[PDFExtractionResult]:
+        """
+        Extract a batch in parallel, results in input order
+
+        Failures do not abort the batch: they come back with `error` set.
+        max_workers=1 extracts in this process.
+        """
+        payloads = [s if isinstance(s, (str, os.PathLike)) else _read_source(s) for s in sources]
+        workers = max_workers or _pool_size()
+        workers = max(1, min(workers, len(payloads)))
+
+        if workers == 1:
+            return [_extract_one(self.backend, self.max_pages, self.max_chars, p) for p in payloads]
+
+        return list(get_process_pool().map(
+            _extract_one,
+            [self.backend] * len(payloads),
+            [self.max_pages] * len(payloads),
+            [self.max_chars] * len(payloads),
+            payloads,
+            chunksize=max(1, len(payloads) // (workers * 4)),
+        ))
+
     def is_valid_pdf(self, file_path: str) -> bool:
         # Check if the file is a valid PDF
         try:
@@ -29,3 +168,50 @@ class PDFProcessor:
             return True
         except:
             return False
+
+
+# Shared by every extraction in this process and reused; the app starts the workers at
+# startup (warm_process_pool), before request threads hold locks a fork would copy
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _pool_size() -> int:
+    return max(1, settings.PDF_MAX_WORKERS or os.cpu_count() or 1)
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=_pool_size(), mp_context=_process_context())
+        return _process_pool
+
+
+def warm_process_pool():
+    """Start the extraction workers now (app startup) instead of on the first upload"""
+    get_process_pool().submit(_pool_size).result()
+
+
+def shutdown_process_pool():
+    """Stop the shared extraction workers (app shutdown)"""
+    global _process_pool
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def _process_context():
+    # fork starts workers without re-importing the app; spawn where fork is unreliable (macOS)
+    if "fork" in multiprocessing.get_all_start_methods() and sys.platform != "darwin":
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context("spawn")
+
+
+def _extract_one(backend: str, max_pages: int, max_chars: int, source: Union[bytes, str]) -> PDFExtractionResult:
+    """Pool task: never raises, so one bad file cannot fail the batch"""
+    try:
+        return PDFProcessor(backend, max_pages, max_chars).extract(source)
+    except Exception as e:
+        return PDFExtractionResult(text="", backend=backend, error=str(e))
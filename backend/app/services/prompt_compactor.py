@@ -0,0 +1,215 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .resume_processor import ResumeProcessor
+
+
+# Rough tokens-per-character for English resume text; no tokenizer is
+# shipped for the remote models, so savings are reported as estimates
+CHARS_PER_TOKEN = 4
+
+# Relative share of the token budget when sections compete for it
+SECTION_WEIGHTS = {
+    "experience": 3.0,
+    "skills": 2.0,
+    "header": 1.0,
+    "summary": 1.0,
+    "education": 1.0,
+    "projects": 1.0,
+    "certifications": 0.5,
+}
+DEFAULT_SECTION_WEIGHT = 0.5
+
+# Headers the processor does not know about but that start a section
+EXTRA_SECTION_HEADERS = ("summary", "profile", "objective", "about me")
+
+_BOILERPLATE = [
+    re.compile(r'^page\s+\d+(\s+of\s+\d+)?$', re.IGNORECASE),
+    re.compile(r'^\d{1,3}$'),  # bare page numbers
+    re.compile(r'^(curriculum\s+vitae|resume|cv)$', re.IGNORECASE),
+    re.compile(r'^references?\s+(are\s+)?available\s+(up)?on\s+request\.?$', re.IGNORECASE),
+    re.compile(r'^[\W_]+$'),  # rules, bullets and other symbol-only lines
+]
+_BULLET = re.compile(r'^[•◦▪●■►→*\-–]+\s*')
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _line_cost(line: str) -> int:
+    return estimate_tokens(line) + 1  # + newline
+
+
+@dataclass
+class CompactionResult:
+    text: str
+    original_tokens: int
+    compacted_tokens: int
+    section_tokens: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.original_tokens - self.compacted_tokens)
+
+
+class PromptCompactor:
+    """
+    Section-aware compaction of resume text before it is put in a prompt
+
+    1. Normalize whitespace and bullets, drop boilerplate (page numbers,
+       "References available on request", rules) and lines repeated on
+       every page (headers/footers)
+    2. Split into sections with ResumeProcessor's header detection; a
+       repeated header ("Experience (cont.)") continues its section
+    3. Share the token budget between sections by weight (experience and
+       skills first); short sections give their unused share to long ones.
+       Within a capped section, entry lines (job titles, dates) are kept
+       first and bullets are taken round-robin across entries, so every
+       job keeps its leading bullets
+
+    Unlike a plain text[:N] cut, every section survives compaction.
+    """
+
+    def __init__(self, token_budget: int, processor: Optional[ResumeProcessor] = None):
+        self.token_budget = token_budget
+        self.processor = processor or ResumeProcessor()
+
+    def compact(self, text: str) -> CompactionResult:
+        original_tokens = estimate_tokens(text or "")
+        sections = self._split_sections(self._clean_lines(text or ""))
+        # Section labels and blank separators come out of the budget too
+        overhead = sum(_line_cost(name) + 1 for name, _ in sections if name != "header")
+        budgets = self._allocate(sections, max(0, self.token_budget - overhead))
+
+        parts = []
+        section_tokens = {}
+        for name, lines in sections:
+            kept = self._cap(lines, budgets[name])
+            if not kept:
+                continue
+            body = "\n".join(kept)
+            section_tokens[name] = estimate_tokens(body)
+            parts.append(body if name == "header" else f"{name.upper()}\n{body}")
+
+        compacted = "\n\n".join(parts)
+        return CompactionResult(
+            text=compacted,
+            original_tokens=original_tokens,
+            compacted_tokens=estimate_tokens(compacted),
+            section_tokens=section_tokens,
+        )
+
+    def _clean_lines(self, text: str) -> List[str]:
+        raw = [re.sub(r'\s+', ' ', line).strip() for line in text.splitlines()]
+        raw = [_BULLET.sub('- ', line) if _BULLET.match(line) and len(line) > 2 else line for line in raw]
+
+        counts: Dict[str, int] = {}
+        for line in raw:
+            if line:
+                counts[line.lower()] = counts.get(line.lower(), 0) + 1
+
+        lines, seen = [], set()
+        for line in raw:
+            key = line.lower()
+            if not line or any(p.match(line) for p in _BOILERPLATE):
+                continue
+            # Page headers/footers repeat verbatim; keep their first occurrence
+            if key in seen and counts[key] > 1 and not self._section_name(line):
+                continue
+            seen.add(key)
+            lines.append(line)
+        return lines
+
+    def _section_name(self, line: str) -> Optional[str]:
+        """Section a header line opens, or None for content lines"""
+        head = line.split(':', 1)[0].strip().lower()
+        if len(head.split()) > 4 or any(ch.isdigit() for ch in head):
+            return None
+        if self.processor._is_experience_section_header(head):
+            return "experience"
+        if self.processor._is_new_section_header(head) or any(h in head for h in EXTRA_SECTION_HEADERS):
+            for name in ("skills", "education", "projects", "certifications", "summary", "profile", "objective"):
+                if name in head or (name == "certifications" and "certification" in head):
+                    return "summary" if name in ("profile", "objective") else name
+            return re.sub(r'[^a-z ]', '', head).strip() or "other"
+        if head in ("technical skills", "tech stack", "core competencies", "technologies"):
+            return "skills"
+        return None
+
+    def _split_sections(self, lines: List[str]) -> List[Tuple[str, List[str]]]:
+        sections: Dict[str, List[str]] = {"header": []}
+        current = "header"
+        for line in lines:
+            name = self._section_name(line)
+            if name:
+                current = name
+                sections.setdefault(current, [])
+                # "Skills: Python, SQL" carries content on the header line
+                inline = line.split(':', 1)[1].strip() if ':' in line else ""
+                if inline:
+                    sections[current].append(inline)
+                continue
+            sections[current].append(line)
+        return [(name, body) for name, body in sections.items() if body]
+
+    @staticmethod
+    def _allocate(sections: List[Tuple[str, List[str]]], budget: int) -> Dict[str, int]:
+        """Weighted max-min fair split of the budget across sections"""
+        sizes = {name: sum(_line_cost(line) for line in body) for name, body in sections}
+        weights = {name: SECTION_WEIGHTS.get(name, DEFAULT_SECTION_WEIGHT) for name in sizes}
+        budgets: Dict[str, int] = {}
+        remaining = budget
+        pending = dict(sizes)
+
+        while pending and remaining > 0:
+            total_weight = sum(weights[name] for name in pending)
+            satisfied = {
+                name: size for name, size in pending.items()
+                if size <= remaining * weights[name] / total_weight
+            }
+            if not satisfied:
+                for name in pending:
+                    budgets[name] = int(remaining * weights[name] / total_weight)
+                return budgets
+            for name, size in satisfied.items():
+                budgets[name] = size
+                remaining -= size
+                del pending[name]
+
+        for name in pending:
+            budgets[name] = 0
+        return budgets
+
+    @staticmethod
+    def _cap(lines: List[str], budget: int) -> List[str]:
+        if sum(_line_cost(line) for line in lines) <= budget:
+            return lines
+
+        # Entries are the non-bullet lines; each owns the bullets below it
+        entries: List[int] = []
+        bullets: List[List[int]] = []
+        for i, line in enumerate(lines):
+            if line.startswith('- ') and bullets:
+                bullets[-1].append(i)
+            else:
+                entries.append(i)
+                bullets.append([])
+
+        order = list(entries)
+        depth = 0
+        while any(depth < len(group) for group in bullets):
+            order.extend(group[depth] for group in bullets if depth < len(group))
+            depth += 1
+
+        keep, used = set(), 0
+        for i in order:
+            cost = _line_cost(lines[i])
+            if used + cost <= budget:
+                keep.add(i)
+                used += cost
+
+        if not keep and budget > 1:
+            return [lines[0][:(budget - 1) * CHARS_PER_TOKEN].rstrip()]
+        return [line for i, line in enumerate(lines) if i in keep]
@@ -0,0 +1,292 @@
+import asyncio
+import contextlib
+import email.utils
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+from ..config import settings
+
+
+# Adaptive rate control (AIMD): halve on 429, creep back on success
+BACKOFF_FACTOR = 0.5
+RECOVERY_STEP = 0.1  # fraction of the configured rate regained per success
+MIN_RATE_FRACTION = 0.05
+
+
+class _PrepaidSlot:
+    """A slot taken ahead of a guarded call, for that call's first send()"""
+
+    def __init__(self, bucket: "TokenBucket"):
+        self.bucket = bucket
+        self.paid = False
+
+
+_prepaid: ContextVar[Optional[_PrepaidSlot]] = ContextVar("rate_limit_prepaid", default=None)
+
+
+class RateLimitExceeded(Exception):
+    """The wait for a request slot would exceed the caller's max_wait (backpressure)"""
+
+    status_code = 429
+
+    def __init__(self, backend: str, wait: float):
+        super().__init__(f"{backend} rate limit: next slot in {wait:.1f}s")
+        self.backend = backend
+        self.wait = wait
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After header (seconds or HTTP date) -> seconds to wait"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Best effort for clients (crewai/litellm) that raise instead of returning a 429"""
+    if getattr(error, "status_code", None) == 429:
+        return True
+    message = str(error).lower()
+    return "429" in message or "rate limit" in message or "too many requests" in message
+
+
+class TokenBucket:
+    """
+    Token-bucket limiter shared by threads and coroutines
+
+    Callers reserve a slot under the lock (the bucket may go negative, which
+    queues them in arrival order) and then wait *outside* the lock, with
+    time.sleep in threads or asyncio.sleep on the event loop, so one waiting
+    caller never blocks the others.
+
+    On HTTP 429 the rate is halved and a Retry-After pause is honoured by
+    every caller; each success wins back a little of the configured rate.
+    """
+
+    def __init__(self, name: str, rate_per_minute: float, burst: int = 1, max_wait: Optional[float] = None):
+        self.name = name
+        self.base_rate = rate_per_minute / 60.0
+        self.rate = self.base_rate
+        self.capacity = float(max(1, burst))
+        self.max_wait = max_wait
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.waiting = 0
+        self.max_waiting = 0
+        self.acquired = 0
+        self.rejected = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.base_rate > 0
+
+    def _reserve(self, max_wait: Optional[float]) -> float:
+        """Take a token (possibly on credit) and return how long to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            wait = max(0.0, -(self._tokens - 1) / self.rate, self._blocked_until - now)
+            if max_wait is not None and wait > max_wait:
+                self.rejected += 1
+                raise RateLimitExceeded(self.name, wait)
+
+            self._tokens -= 1
+            self.acquired += 1
+            if wait > 0:
+                self.waiting += 1
+                self.max_waiting = max(self.max_waiting, self.waiting)
+            return wait
+
+    def _pause_left(self) -> float:
+        with self._lock:
+            return max(0.0, self._blocked_until - time.monotonic())
+
+    def _done_waiting(self, waited: float):
+        with self._lock:
+            self.waiting -= 1
+            self.total_wait += waited
+            self.max_wait_seen = max(self.max_wait_seen, waited)
+
+    def acquire(self, max_wait: Optional[float] = None) -> float:
+        """Block the calling thread until a slot is free; returns seconds waited"""
+        if not self.enabled:
+            return 0.0
+        start = time.monotonic()
+        wait = self._reserve(self.max_wait if max_wait is None else max_wait)
+        if wait <= 0:
+            return 0.0
+        while wait > 0:
+            time.sleep(wait)
+            wait = self._pause_left()  # a 429 may have paused the backend meanwhile
+        waited = time.monotonic() - start
+        self._done_waiting(waited)
+        return waited
+
+    async def acquire_async(self, max_wait: Optional[float] = None) -> float:
+        """Wait for a slot without blocking the event loop; returns seconds waited"""
+        if not self.enabled:
+            return 0.0
+        start = time.monotonic()
+        wait = self._reserve(self.max_wait if max_wait is None else max_wait)
+        if wait <= 0:
+            return 0.0
+        try:
+            while wait > 0:
+                await asyncio.sleep(wait)
+                wait = self._pause_left()
+        finally:
+            self._done_waiting(time.monotonic() - start)
+        return time.monotonic() - start
+
+    @contextlib.contextmanager
+    def prepaid(self) -> Iterator[None]:
+        """
+        Scope in which acquire_prepaid() queues for the slot up front and the
+        first send() uses it instead of queueing again, so a circuit breaker
+        can time the backend call without the rate-limit wait
+        """
+        token = _prepaid.set(_PrepaidSlot(self))
+        try:
+            yield
+        finally:
+            _prepaid.reset(token)
+
+    async def acquire_prepaid(self, max_wait: Optional[float] = None) -> float:
+        """acquire_async() for the enclosing prepaid() scope, within both max_wait and the bucket's own"""
+        if max_wait is None or (self.max_wait is not None and self.max_wait < max_wait):
+            max_wait = self.max_wait
+        waited = await self.acquire_async(max_wait)
+        slot = _prepaid.get()
+        if slot is not None and slot.bucket is self:
+            slot.paid = True
+        return waited
+
+    def _take_prepaid(self) -> bool:
+        slot = _prepaid.get()
+        if slot is None or slot.bucket is not self or not slot.paid:
+            return False
+        slot.paid = False
+        return True
+
+    def throttle(self, retry_after: Optional[float] = None):
+        """The backend answered 429: slow down, and pause for Retry-After if given"""
+        with self._lock:
+            self.throttled += 1
+            if self.enabled:
+                self.rate = max(self.base_rate * MIN_RATE_FRACTION, self.rate * BACKOFF_FACTOR)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+                self._tokens = min(self._tokens, 0.0)
+        print(f"🐢 {self.name} rate limited (429): {self.rate * 60:.1f} req/min"
+              + (f", pausing {retry_after:.1f}s" if retry_after else ""))
+
+    def recover(self):
+        """A request went through: regain part of the configured rate"""
+        if self.rate < self.base_rate:
+            with self._lock:
+                self.rate = min(self.base_rate, self.rate + self.base_rate * RECOVERY_STEP)
+
+    def observe(self, response: Any) -> bool:
+        """Adapt to an HTTP response; True when it was a 429"""
+        if getattr(response, "status_code", None) == 429:
+            self.throttle(parse_retry_after(response.headers.get("Retry-After")))
+            return True
+        self.recover()
+        return False
+
+    async def send(self, request: Callable[[], Awaitable[Any]], retries: Optional[int] = None) -> Any:
+        """
+        Rate-limited HTTP call: waits for a slot, retries on 429 after the
+        limiter has slowed down, and returns the last response
+        """
+        retries = settings.LLM_RATE_LIMIT_RETRIES if retries is None else retries
+        for attempt in range(retries + 1):
+            if not (attempt == 0 and self._take_prepaid()):
+                await self.acquire_async()
+            response = await request()
+            if not self.observe(response) or attempt == retries:
+                return response
+            print(f"🔁 Retrying {self.name} request after 429 ({attempt + 1}/{retries})")
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "configured_per_minute": round(self.base_rate * 60, 2),
+                "current_per_minute": round(self.rate * 60, 2),
+                "burst": int(self.capacity),
+                "queue_depth": self.waiting,
+                "max_queue_depth": self.max_waiting,
+                "acquired": self.acquired,
+                "rejected": self.rejected,
+                "throttled_429": self.throttled,
+                "total_wait_seconds": round(self.total_wait, 3),
+                "avg_wait_seconds": round(self.total_wait / self.acquired, 3) if self.acquired else 0.0,
+                "max_wait_seconds": round(self.max_wait_seen, 3),
+                "paused_seconds": round(max(0.0, self._blocked_until - time.monotonic()), 3),
+            }
+
+
+class RateLimiterRegistry:
+    """One shared TokenBucket per LLM backend, built from settings on first use"""
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _budgets() -> Dict[str, float]:
+        return {
+            "ollama": settings.OLLAMA_REQUESTS_PER_MINUTE,
+            "perplexity": settings.PERPLEXITY_REQUESTS_PER_MINUTE,
+            "agentic": settings.AGENTIC_REQUESTS_PER_MINUTE,
+        }
+
+    def get(self, backend: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(backend)
+            if bucket is None:
+                bucket = TokenBucket(
+                    backend,
+                    rate_per_minute=self._budgets().get(backend, 0),
+                    burst=settings.LLM_RATE_LIMIT_BURST,
+                    max_wait=settings.LLM_RATE_LIMIT_MAX_WAIT,
+                )
+                self._buckets[backend] = bucket
+            return bucket
+
+    def reset(self):
+        """Drop the buckets so they are rebuilt from the current settings"""
+        with self._lock:
+            self._buckets.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {name: bucket.stats() for name, bucket in buckets.items()}
+
+
+# Singleton instance
+rate_limits = RateLimiterRegistry()
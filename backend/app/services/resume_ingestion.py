@@ -0,0 +1,381 @@
+import asyncio
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import settings
+from ..models.resume_models import Resume
+from .extraction_cache import ExtractionCache, text_hash
+from .pdf_processor import PDFProcessor
+from .tiered_extractor import TieredResumeExtractor
+from .upload_storage import spool_upload
+
+
+RESUME_UPLOAD_DIR = "./data/uploads/resumes"
+
+# Longest a partial batch waits for more rows before it is committed anyway
+COMMIT_LINGER_SECONDS = 1.0
+
+# Marks the end of a stage's input
+_DONE = object()
+
+def super_normalize(filename: str) -> str:
+    """Ultra-aggressive normalization for duplicate detection"""
+    name = filename.lower().strip()
+    if name.endswith('.pdf'):
+        name = name[:-4]
+    name = re.sub(r'[^\w]', '', name)
+    return name
+
+
+def normalize_structured_skills(structured_data: Dict) -> Dict:
+    """Coerce the LLM's `skills` field into a list of strings"""
+    if 'skills' in structured_data:
+        if isinstance(structured_data['skills'], dict):
+            structured_data['skills'] = list(structured_data['skills'].values())
+        elif isinstance(structured_data['skills'], str):
+            structured_data['skills'] = [s.strip() for s in structured_data['skills'].split(',')]
+        elif not isinstance(structured_data['skills'], list):
+            structured_data['skills'] = []
+    else:
+        structured_data['skills'] = []
+    return structured_data
+
+
+@dataclass
+class IngestionItem:
+    index: int
+    filename: str
+    normalized: str
+    file_path: str = ""
+    resume_text: str = ""
+    structured_data: Dict[str, Any] = field(default_factory=dict)
+    content_hash: str = ""
+    text_hash: Optional[str] = None
+    cache_hit: str = ""  # "", "content" or "text"
+    prompt_tokens_saved: int = 0
+
+
+class ResumeIngestionPipeline:
+    """
+    Staged, concurrent resume ingestion
+
+    spool to disk (request coroutine) -> [pdf queue] -> PDF extraction (shared
+                          process pool, RESUME_PDF_WORKERS files in flight)
+        -> [llm queue] -> tiered extraction: heuristics, then the LLM for
+                          low-confidence fields (RESUME_LLM_CONCURRENCY at once)
+        -> [db queue] -> batched commits (RESUME_COMMIT_BATCH_SIZE per commit)
+
+    Queues are bounded, so a 500-file upload never holds more than a few
+    extracted texts in flight, and total time tracks LLM throughput instead
+    of the sum of every file's latency.
+
+    Files already extracted in any session (same bytes, or same text) are
+    served from the extraction cache and pass through the PDF and LLM stages.
+    """
+
+    def __init__(self, db: Any, llm_service: Any, session_id: str):
+        self.db = db
+        self.llm_service = llm_service
+        self.session_id = session_id
+        self.pdf_processor = PDFProcessor()
+        self.extractor = TieredResumeExtractor(llm_service)
+        self.cache = ExtractionCache(db, "resume", self.extractor.cache_identity())
+
+        self.pdf_workers = max(1, settings.RESUME_PDF_WORKERS)
+        self.llm_concurrency = max(1, settings.RESUME_LLM_CONCURRENCY)
+        self.commit_batch_size = max(1, settings.RESUME_COMMIT_BATCH_SIZE)
+        # The session is not thread-safe: one DB call at a time, off the event loop
+        self._db_lock = asyncio.Lock()
+
+        self.processed: List[Dict[str, Any]] = []
+        self.skipped: List[Dict[str, Any]] = []
+        self.failed: List[Dict[str, Any]] = []
+
+        self.existing_filenames: Dict[str, str] = {}
+        self.current_batch_filenames: set = set()
+
+        self.metrics = {
+            "pdf_seconds": 0.0,
+            "extraction_seconds": 0.0,
+            "db_seconds": 0.0,
+            "commits": 0,
+            "llm_calls": 0,
+            "heuristic_only": 0,
+            "prompt_tokens": 0,
+            "prompt_tokens_saved": 0,
+            "cache_content_hits": 0,
+            "cache_text_hits": 0,
+        }
+
+    async def run(self, files: List[Any]) -> Dict[str, Any]:
+        """Ingest all uploaded files and return the upload summary"""
+        start_time = time.time()
+
+        existing_resumes = await self._db_call(
+            lambda: self.db.query(Resume.filename).filter(Resume.session_id == self.session_id).all()
+        )
+        self.existing_filenames = {
+            super_normalize(filename): filename for (filename,) in existing_resumes
+        }
+        print(f"📋 Found {len(self.existing_filenames)} existing resumes in session")
+
+        queue_size = 2 * max(self.pdf_workers, self.llm_concurrency)
+        pdf_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        llm_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        db_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+        pdf_tasks = [asyncio.create_task(self._pdf_worker(pdf_queue, llm_queue)) for _ in range(self.pdf_workers)]
+        llm_tasks = [asyncio.create_task(self._llm_worker(llm_queue, db_queue)) for _ in range(self.llm_concurrency)]
+        db_task = asyncio.create_task(self._db_writer(db_queue))
+
+        try:
+            await self._save_uploads(files, pdf_queue)
+            await self._close_stage(pdf_queue, pdf_tasks)
+            await self._close_stage(llm_queue, llm_tasks)
+            await self._close_stage(db_queue, [db_task])
+        except BaseException:
+            for task in pdf_tasks + llm_tasks + [db_task]:
+                task.cancel()
+            raise
+
+        self.processed.sort(key=lambda r: r.pop("_index"))
+        self.metrics["total_seconds"] = time.time() - start_time
+
+        return {
+            "session_id": self.session_id,
+            "total_uploaded": len(files),
+            "successfully_processed": len(self.processed),
+            "skipped_count": len(self.skipped),
+            "failed_count": len(self.failed),
+            "skipped_files": self.skipped,
+            "failed_files": self.failed,
+            "resumes": self.processed,
+            "extraction_mode": self.extractor.mode,
+            "performance_metrics": {
+                **{k: round(v, 2) if isinstance(v, float) else v for k, v in self.metrics.items()},
+                "pdf_workers": self.pdf_workers,
+                "llm_concurrency": self.llm_concurrency,
+                "commit_batch_size": self.commit_batch_size,
+            },
+        }
+
+    @staticmethod
+    async def _close_stage(queue: asyncio.Queue, tasks: List[asyncio.Task]):
+        for _ in tasks:
+            await queue.put(_DONE)
+        await asyncio.gather(*tasks)
+
+    # STAGE 1: Duplicate checks + spool to disk (in upload order)
+    async def _save_uploads(self, files: List[Any], pdf_queue: asyncio.Queue):
+        for index, file in enumerate(files):
+            original_filename = file.filename
+            normalized_filename = super_normalize(original_filename)
+
+            # CHECK 1: Already exists in database?
+            if normalized_filename in self.existing_filenames:
+                existing_name = self.existing_filenames[normalized_filename]
+                if normalized_filename not in self.current_batch_filenames:
+                    print(f"⚠️ DUPLICATE (DB): {original_filename} matches '{existing_name}' - SKIPPING")
+                    self.skipped.append({
+                        "filename": original_filename,
+                        "matched_existing": existing_name,
+                        "reason": "Already uploaded in this session (database)",
+                        "status": "skipped"
+                    })
+                    continue
+
+            # CHECK 2: Already in current batch?
+            if normalized_filename in self.current_batch_filenames:
+                print(f"⚠️ DUPLICATE (BATCH): {original_filename} - SKIPPING")
+                self.skipped.append({
+                    "filename": original_filename,
+                    "reason": "Duplicate in current upload batch",
+                    "status": "skipped"
+                })
+                continue
+
+            # Add to tracking BEFORE processing
+            self.current_batch_filenames.add(normalized_filename)
+            self.existing_filenames[normalized_filename] = original_filename
+
+            item = IngestionItem(index=index, filename=original_filename, normalized=normalized_filename)
+            try:
+                # Streamed in chunks (size-limited); the file is never held in memory
+                spooled = await spool_upload(
+                    file, f"{RESUME_UPLOAD_DIR}/{self.session_id}_{original_filename}"
+                )
+                item.file_path = spooled.file_path
+                item.content_hash = spooled.content_hash
+
+                # Same bytes extracted before (any session)? Skip PDF + LLM
+                cached = await self._db_call(self._cache_lookup, content_hash=item.content_hash)
+                if cached is not None:
+                    item.resume_text, item.text_hash, item.structured_data = cached
+                    item.cache_hit = "content"
+                    self.metrics["cache_content_hits"] += 1
+                    print(f"♻️ CACHED: {original_filename}")
+            except Exception as e:
+                self._fail(item, e)
+                continue
+
+            await pdf_queue.put(item)
+
+    # STAGE 2: PDF text extraction on the shared process pool
+    async def _pdf_worker(self, pdf_queue: asyncio.Queue, llm_queue: asyncio.Queue):
+        while True:
+            item = await pdf_queue.get()
+            if item is _DONE:
+                return
+            if item.cache_hit:
+                await llm_queue.put(item)
+                continue
+            try:
+                start = time.time()
+                result = await asyncio.wrap_future(self.pdf_processor.submit(item.file_path))
+                if result.error:
+                    raise Exception(f"Error extracting text from PDF: {result.error}")
+                item.resume_text = result.text
+                self.metrics["pdf_seconds"] += time.time() - start
+            except Exception as e:
+                self._fail(item, e)
+                continue
+            await llm_queue.put(item)
+
+    # STAGE 3: LLM extraction, at most llm_concurrency calls in flight
+    async def _llm_worker(self, llm_queue: asyncio.Queue, db_queue: asyncio.Queue):
+        while True:
+            item = await llm_queue.get()
+            if item is _DONE:
+                return
+            if item.cache_hit:
+                await db_queue.put(item)
+                continue
+            try:
+                # Same text extracted before (renamed or re-exported file)? Skip the LLM.
+                # Empty/near-empty text has no hash: neither looked up nor stored
+                item.text_hash = text_hash(item.resume_text)
+                cached = await self._db_call(self._cache_lookup, text_hash=item.text_hash) if item.text_hash else None
+                if cached is not None:
+                    item.structured_data = cached[2]
+                    item.cache_hit = "text"
+                    self.metrics["cache_text_hits"] += 1
+                    print(f"♻️ CACHED: {item.filename}")
+                else:
+                    start = time.time()
+                    result = await self.extractor.extract(item.resume_text)
+                    self.metrics["extraction_seconds"] += time.time() - start
+                    if result.llm_fields:
+                        self.metrics["llm_calls"] += 1
+                    else:
+                        self.metrics["heuristic_only"] += 1
+                    self.metrics["prompt_tokens"] += result.prompt_tokens
+                    self.metrics["prompt_tokens_saved"] += result.prompt_tokens_saved
+                    item.prompt_tokens_saved = result.prompt_tokens_saved
+                    item.structured_data = normalize_structured_skills(result.structured_data)
+                    if result.complete:
+                        await self._db_call(
+                            self.cache.store, item.content_hash, item.text_hash, item.resume_text, item.structured_data
+                        )
+                    print(f"✅ PROCESSED: {item.filename}")
+            except Exception as e:
+                self._fail(item, e)
+                continue
+            await db_queue.put(item)
+
+    # STAGE 4: Batched commits
+    async def _db_writer(self, db_queue: asyncio.Queue):
+        batch: List[IngestionItem] = []
+        while True:
+            try:
+                # Wait for more rows, but never sit on a partial batch for long
+                item = await asyncio.wait_for(db_queue.get(), timeout=COMMIT_LINGER_SECONDS if batch else None)
+            except asyncio.TimeoutError:
+                item = None
+            if item is not None and item is not _DONE:
+                batch.append(item)
+            if batch and (item is None or item is _DONE or len(batch) >= self.commit_batch_size):
+                await self._db_call(self._commit_batch, batch)
+                batch = []
+            if item is _DONE:
+                return
+
+    async def _db_call(self, fn, *args, **kwargs):
+        """Run a blocking session call on a worker thread, so the other stages keep running"""
+        async with self._db_lock:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+    def _cache_lookup(self, **hashes) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        """Cached (text, text hash, structured data), copied out while the entry is loaded"""
+        entry = self.cache.lookup(**hashes)
+        if entry is None:
+            return None
+        return entry.extracted_text or "", entry.text_hash, ExtractionCache.structured_copy(entry)
+
+    def _commit_batch(self, batch: List[IngestionItem]):
+        start = time.time()
+        resumes = [
+            Resume(
+                filename=item.filename,
+                file_path=item.file_path,
+                extracted_text=item.resume_text,
+                structured_data=item.structured_data,
+                skills_extracted=item.structured_data.get('skills', []),
+                experience_years=item.structured_data.get('total_experience', 0),
+                session_id=self.session_id
+            )
+            for item in batch
+        ]
+
+        try:
+            self.db.add_all(resumes)
+            self.db.flush()
+            # Read ids before commit: commit expires the instances, and reading
+            # an attribute afterwards would reload each row
+            resume_ids = [resume.id for resume in resumes]
+            self.db.commit()  # Single commit for the whole batch
+        except Exception as e:
+            print(f"❌ Batch commit error: {e}")
+            self.db.rollback()
+            for item in batch:
+                self._fail(item, Exception(f"Batch commit failed: {str(e)}"))
+            return
+        finally:
+            self.metrics["db_seconds"] += time.time() - start
+
+        self.metrics["commits"] += 1
+        for item, resume_id in zip(batch, resume_ids):
+            self.processed.append({
+                "_index": item.index,
+                "id": resume_id,
+                "filename": item.filename,
+                "structured_data": item.structured_data,
+                "from_cache": bool(item.cache_hit),
+                "prompt_tokens_saved": item.prompt_tokens_saved,
+                "processing_status": "success"
+            })
+        print(f"✅ Committed {len(batch)} resumes")
+
+    def _fail(self, item: IngestionItem, error: Exception):
+        print(f"❌ ERROR: {item.filename} - {str(error)}")
+        failure = {
+            "filename": item.filename,
+            "processing_status": "failed",
+            "error": str(error)
+        }
+        if getattr(error, "status_code", None):
+            failure["status_code"] = error.status_code  # e.g. 413 for oversized files
+        self.failed.append(failure)
+
+        # Remove from tracking so a retry isn't reported as a duplicate
+        self.current_batch_filenames.discard(item.normalized)
+        self.existing_filenames.pop(item.normalized, None)
+
+        # No row references the spooled copy: don't leave it behind
+        if item.file_path:
+            try:
+                os.remove(item.file_path)
+            except OSError:
+                pass
@@ -1,10 +1,17 @@
-import PyPDF2
 import re
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
-import io
 import traceback
 
+from .pdf_processor import PDFProcessor
+
+
+# "Jan 2020 - Present", "03/2018 to 06/2021", "2019 – 2021"
+_MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?'
+_DATE = rf'(?:{_MONTH}\s+\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}})'
+_DATE_RANGE = re.compile(rf'{_DATE}\s*(?:-|–|—|to)\s*(?:{_DATE}|present|current|now)', re.IGNORECASE)
+_FIELD_SEPARATORS = ' \t|•·,()[]-–—'
+
 
 class ResumeProcessor:
     def __init__(self):
@@ -85,23 +92,10 @@ class ResumeProcessor:
             Extracted text string
         """
         try:
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-            text = ""
-            
-            for page_num, page in enumerate(pdf_reader.pages):
-                try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                except Exception as e:
-                    print(f"Error extracting page {page_num}: {e}")
-                    continue
-            
-            # Clean up the text
-            text = re.sub(r'\n+', '\n', text)  # Remove multiple newlines
-            text = re.sub(r'\s+', ' ', text)   # Remove multiple spaces
+            text = PDFProcessor().extract_text(file_content)
             
-            return text.strip()
+            # Clean up the text: one pass collapses newlines and spaces alike
+            return " ".join(text.split())
             
         except Exception as e:
             print(f"Error extracting PDF text: {e}")
@@ -285,8 +279,28 @@ class ResumeProcessor:
             if not in_experience_section:
                 continue
             
-            # Look for company and role patterns
-            company_role = self._extract_company_role(line)
+            # "Acme Corp | Jan 2020 - Present": keep the dates out of the company/role
+            body, dates = self._split_date_range(line)
+            
+            # Company line under a role-only line ("Senior Developer" / "Acme Corp | 2020 - 2022")
+            if (
+                current_experience and not current_experience['company']
+                and not current_experience['responsibilities']
+                and body and not self._is_responsibility_line(body)
+                and not any(indicator in body.lower() for indicator in self.role_indicators)
+            ):
+                current_experience['company'] = body
+                if dates:
+                    current_experience['duration'] = dates
+                continue
+            
+            if not body and dates and current_experience and not current_experience.get('duration'):
+                current_experience['duration'] = dates
+                continue
+            
+            # Look for company and role patterns (bullets are responsibilities, not new jobs)
+            is_bullet = line[0] in '•◦-*→'
+            company_role = self._extract_company_role(body) if body and not is_bullet else None
             if company_role:
                 # Save previous experience if exists
                 if current_experience:
@@ -300,8 +314,8 @@ class ResumeProcessor:
                     'responsibilities': []
                 }
                 
-                # Look for duration in nearby lines
-                duration = self._find_duration_nearby(lines, i)
+                # Dates on the same line, else look for duration in nearby lines
+                duration = dates or self._find_duration_nearby(lines, i)
                 if duration:
                     current_experience['duration'] = duration
                 
@@ -577,8 +591,8 @@ class ResumeProcessor:
         if match:
             return {'role': match.group(1).strip(), 'company': match.group(2).strip()}
         
-        # Pattern 2: "Google Inc. - Software Engineer"
-        dash_pattern = r'(.+?)\s*[-–]\s*(.+?)(?:\s*,|\s*$)'
+        # Pattern 2: "Google Inc. - Software Engineer", "Software Engineer | Google Inc."
+        dash_pattern = r'(.+?)\s*[-–|]\s*(.+?)(?:\s*,|\s*$)'
         match = re.search(dash_pattern, line)
         if match:
             part1, part2 = match.group(1).strip(), match.group(2).strip()
@@ -596,6 +610,14 @@ class ResumeProcessor:
         
         return None
     
+    def _split_date_range(self, line: str) -> Tuple[str, str]:
+        """Split a line into its text and its date range ("" when there is none)"""
+        match = _DATE_RANGE.search(line)
+        if not match:
+            return line.strip(), ''
+        body = (line[:match.start()] + ' ' + line[match.end():]).strip(_FIELD_SEPARATORS)
+        return ' '.join(body.split()), match.group(0).strip()
+    
     def _find_duration_nearby(self, lines: List[str], current_index: int) -> str:
         """Find duration in nearby lines"""
         # Check next few lines for duration
@@ -614,6 +636,9 @@ class ResumeProcessor:
     
     def _extract_duration_from_line(self, line: str) -> str:
         """Extract duration from a line"""
+        _, dates = self._split_date_range(line)
+        if dates:
+            return dates
         for pattern in self.duration_patterns:
             match = re.search(pattern, line, re.IGNORECASE)
             if match:
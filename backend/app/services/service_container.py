@@ -0,0 +1,144 @@
+import hashlib
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from ..config import settings
+
+
+# How often (seconds) the configuration is re-read to detect changes
+CONFIG_CHECK_INTERVAL = 1.0
+
+
+def _config_fingerprint() -> Tuple:
+    """Everything backend detection in LLMService / EnhancedAgenticATSService reads"""
+    secrets = "|".join(os.getenv(name, "") for name in ("PERPLEXITY_API_KEY", "GROQ_API_KEY", "OPENAI_API_KEY"))
+    return (
+        settings.USE_OLLAMA,
+        settings.OLLAMA_BASE_URL,
+        settings.OLLAMA_MODEL,
+        settings.OLLAMA_TIMEOUT,
+        settings.PERPLEXITY_MODEL,
+        settings.GROQ_MODEL,
+        getattr(settings, "OPENAI_MODEL", None),
+        os.getenv("USE_AGENTIC_AI", "false").lower(),
+        os.getenv("USE_PERPLEXITY", "true").lower(),
+        os.getenv("USE_GROQ", "true").lower(),
+        hashlib.sha256(secrets.encode("utf-8")).hexdigest(),  # keys are never kept in clear
+    )
+
+
+class ServiceContainer:
+    """
+    Process-wide home of the LLM backends
+
+    - llm_service(): one LLMService per process; backend detection, the
+      Ollama client and the CrewAI agents are built once and shared by
+      every request (the service holds no per-request state)
+    - agentic_service(): one EnhancedAgenticATSService per worker thread,
+      reused across resumes, because CrewAI agents are not safe to drive
+      from several threads at once
+    - Both are rebuilt when the configuration they were built from changes
+      (re-checked at most every CONFIG_CHECK_INTERVAL), or on reload()
+    """
+
+    def __init__(self):
+        self._llm_service: Optional[Any] = None
+        self._fingerprint: Optional[Tuple] = None
+        self._checked_at = 0.0
+        self._generation = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+        self.builds = 0
+        self.agentic_builds = 0
+        self.reloads = 0
+        self.build_seconds = 0.0
+
+        # A fork while another thread holds the lock would deadlock the child
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+
+    def _after_fork_in_child(self):
+        self._lock = threading.Lock()
+
+    def _check_config(self):
+        # Caller must hold self._lock
+        self._checked_at = time.monotonic()
+        fingerprint = _config_fingerprint()
+        if self._fingerprint is not None and fingerprint != self._fingerprint:
+            print("🔄 LLM configuration changed, rebuilding backends")
+            self._reset()
+        self._fingerprint = fingerprint
+
+    def _reset(self):
+        # Caller must hold self._lock
+        from . import ollama_service
+        from .circuit_breaker import circuit_breakers
+        from .rate_limiter import rate_limits
+
+        self._llm_service = None
+        self._generation += 1  # per-thread agentic services rebuild lazily
+        ollama_service._ollama_service = None
+        circuit_breakers.reset()
+        rate_limits.reset()
+        self.reloads += 1
+
+    def llm_service(self) -> Any:
+        """The shared LLMService, built on first use"""
+        service = self._llm_service
+        if service is not None and time.monotonic() - self._checked_at < CONFIG_CHECK_INTERVAL:
+            return service  # hot path: no lock, no config read
+
+        with self._lock:
+            self._check_config()
+            if self._llm_service is None:
+                from .llm_service import LLMService
+
+                start = time.perf_counter()
+                self._llm_service = LLMService()
+                self.build_seconds += time.perf_counter() - start
+                self.builds += 1
+            return self._llm_service
+
+    def agentic_service(self) -> Any:
+        """This thread's EnhancedAgenticATSService, built on first use"""
+        if time.monotonic() - self._checked_at >= CONFIG_CHECK_INTERVAL:
+            with self._lock:
+                self._check_config()
+        generation = self._generation
+
+        service = getattr(self._local, "agentic_service", None)
+        if service is None or getattr(self._local, "generation", None) != generation:
+            from .agentic_service import EnhancedAgenticATSService
+
+            start = time.perf_counter()
+            service = EnhancedAgenticATSService()
+            with self._lock:
+                self.build_seconds += time.perf_counter() - start
+                self.agentic_builds += 1
+            self._local.agentic_service = service
+            self._local.generation = generation
+        return service
+
+    def reload(self):
+        """Drop every backend so the next call rebuilds it from the current settings"""
+        with self._lock:
+            self._reset()
+            self._fingerprint = _config_fingerprint()
+            self._checked_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        service = self._llm_service
+        return {
+            "llm_backend": service.model_identity() if service is not None else None,
+            "llm_service_builds": self.builds,
+            "agentic_service_builds": self.agentic_builds,
+            "reloads": self.reloads,
+            "build_seconds": round(self.build_seconds, 3),
+        }
+
+
+# Singleton instance
+services = ServiceContainer()
@@ -0,0 +1,254 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from ..config import settings
+from .prompt_compactor import PromptCompactor, estimate_tokens
+from .resume_processor import ResumeProcessor
+
+
+EXTRACTION_MODES = ("llm", "tiered", "heuristic")
+
+# Bump when the heuristics or the confidence rules change (part of the extraction cache key)
+HEURISTIC_VERSION = "heuristic-v2"
+
+# Fields the LLM is asked for when the heuristics are not confident enough.
+# Contact links and certifications are often genuinely absent, so a miss
+# there is not worth an LLM call on its own.
+LLM_FIELDS = ("name", "current_role", "total_experience", "skills", "education", "experience_timeline")
+
+NO_EDUCATION = "No education information available"
+NO_CERTIFICATIONS = "No certifications available"
+
+_EXPLICIT_YEARS = re.compile(r'(\d{1,2}(?:\.\d)?)\+?\s*(?:years?|yrs?)\s+(?:of\s+)?(?:professional\s+|total\s+|industry\s+)?experience', re.IGNORECASE)
+_DEGREE = re.compile(r'\b(bachelor|master|b\.tech|m\.tech|btech|mtech|b\.e\.|m\.e\.|b\.sc|m\.sc|bsc|msc|mba|ph\.?d|diploma)', re.IGNORECASE)
+_DATE_ONLY = re.compile(
+    r'^[\s\W]*(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+)?(?:\d{1,2}/)?(?:\d{4}|present|current)[\s\W]*$',
+    re.IGNORECASE,
+)
+_SECTION_WORDS = {"skills", "education", "experience", "projects", "certifications", "summary", "present", "current"}
+
+
+@dataclass
+class TieredExtractionResult:
+    structured_data: Dict[str, Any]
+    field_confidence: Dict[str, float]
+    llm_fields: List[str] = field(default_factory=list)
+    mode: str = "tiered"
+    complete: bool = True  # False when the LLM tier failed; such results are not cached
+    prompt_tokens: int = 0  # estimated tokens of resume text sent to the LLM
+    prompt_tokens_saved: int = 0  # estimated tokens removed by prompt compaction
+
+
+def resolve_extraction_mode() -> str:
+    mode = (settings.RESUME_EXTRACTION_MODE or "tiered").lower()
+    if mode not in EXTRACTION_MODES:
+        print(f"⚠️ Unknown RESUME_EXTRACTION_MODE '{mode}', using 'tiered'")
+        mode = "tiered"
+    return mode
+
+
+class TieredResumeExtractor:
+    """
+    Heuristic-first resume extraction
+
+    Tier 1: ResumeProcessor's regex/section parsers fill every field and give
+    each one a confidence in [0, 1].
+    Tier 2: only LLM_FIELDS below RESUME_MIN_FIELD_CONFIDENCE go to the LLM,
+    with a prompt that asks for just those fields.
+
+    Modes (RESUME_EXTRACTION_MODE): "llm" (full LLM extraction, as before),
+    "tiered" (default) and "heuristic" (never calls the LLM; for bulk
+    screening when the LLM backend is saturated).
+
+    Whatever goes to the LLM is first compacted section by section
+    (RESUME_PROMPT_COMPACTION / RESUME_PROMPT_TOKEN_BUDGET); the heuristic
+    tier always sees the full text.
+    """
+
+    def __init__(self, llm_service: Any, mode: str = None, min_confidence: float = None):
+        self.llm_service = llm_service
+        self.mode = mode or resolve_extraction_mode()
+        self.min_confidence = (
+            settings.RESUME_MIN_FIELD_CONFIDENCE if min_confidence is None else min_confidence
+        )
+        self.processor = ResumeProcessor()
+        self.compactor = (
+            PromptCompactor(settings.RESUME_PROMPT_TOKEN_BUDGET, self.processor)
+            if settings.RESUME_PROMPT_COMPACTION else None
+        )
+
+    def cache_identity(self) -> str:
+        """Model identity for the extraction cache: results differ per mode"""
+        if self.mode == "heuristic":
+            return HEURISTIC_VERSION
+        identity = self.llm_service.model_identity()
+        if self.compactor:
+            identity = f"{identity}+compact{self.compactor.token_budget}"
+        if self.mode == "tiered":
+            return f"{identity}+{HEURISTIC_VERSION}@{self.min_confidence}"
+        return identity
+
+    async def extract(self, resume_text: str) -> TieredExtractionResult:
+        if self.mode == "llm":
+            result = TieredExtractionResult(
+                structured_data={},
+                field_confidence={},
+                llm_fields=list(LLM_FIELDS),
+                mode=self.mode,
+            )
+            prompt_text = self._prompt_text(resume_text, result)
+            result.structured_data = await self.llm_service.extract_resume_information(prompt_text)
+            return result
+
+        data, confidence = self.extract_heuristic(resume_text)
+        result = TieredExtractionResult(structured_data=data, field_confidence=confidence, mode=self.mode)
+
+        if self.mode == "tiered":
+            missing = [f for f in LLM_FIELDS if confidence.get(f, 0.0) < self.min_confidence]
+            if missing:
+                prompt_text = self._prompt_text(resume_text, result)
+                llm_data = await self.llm_service.extract_resume_fields(prompt_text, missing)
+                if "error" in llm_data:
+                    print(f"⚠️ LLM tier failed to parse, keeping heuristic values: {llm_data['error']}")
+                    result.complete = False
+                else:
+                    for name in missing:
+                        if llm_data.get(name) not in (None, "", [], {}):
+                            data[name] = llm_data[name]
+                    result.llm_fields = missing
+
+        data["extraction"] = {
+            "method": "tiered" if result.llm_fields else "heuristic",
+            "field_confidence": {k: round(v, 2) for k, v in confidence.items()},
+            "llm_fields": result.llm_fields,
+        }
+        return result
+
+    def _prompt_text(self, resume_text: str, result: TieredExtractionResult) -> str:
+        """Compacted resume text for the LLM prompt; records the token savings on `result`"""
+        if not self.compactor:
+            result.prompt_tokens = estimate_tokens(resume_text)
+            return resume_text
+        compacted = self.compactor.compact(resume_text)
+        result.prompt_tokens = compacted.compacted_tokens
+        result.prompt_tokens_saved = compacted.tokens_saved
+        return compacted.text
+
+    def extract_heuristic(self, resume_text: str) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """Tier 1: structured data in the LLM's schema plus a confidence per field"""
+        processor = self.processor
+        info = processor.extract_personal_info(resume_text)
+        timeline = self._clean_timeline(processor.parse_experience_timeline(resume_text))
+        for exp in timeline:
+            # The LLM schema's free-text description, which the matching engine reads
+            exp["description"] = " ".join(exp.get("responsibilities", []))
+        skills = self._clean_skills(processor.normalize_skills_to_array(processor.extract_skills_from_text(resume_text)))
+        education = self._clean_education(processor.extract_education_details(resume_text))
+        certifications = processor.extract_certifications_details(resume_text)
+
+        total_experience, experience_confidence = self._total_experience(resume_text, timeline)
+
+        data = {
+            "name": info.get("name") or "",
+            "email": info.get("email") or "",
+            "phone": info.get("phone") or "",
+            "linkedin": info.get("linkedin") or "Not provided",
+            "github": info.get("github") or "Not provided",
+            "portfolio": "Not provided",
+            "current_role": timeline[0]["role"] if timeline else "",
+            "total_experience": total_experience,
+            "skills": skills,
+            "education": education,
+            "certifications": certifications,
+            "experience_timeline": timeline,
+        }
+
+        confidence = {
+            "name": 0.8 if data["name"] else 0.0,
+            "email": 0.95 if data["email"] else 0.0,
+            "phone": 0.8 if len(re.sub(r'\D', '', data["phone"])) >= 10 else 0.0,
+            "linkedin": 0.9 if info.get("linkedin") else 0.5,
+            "github": 0.9 if info.get("github") else 0.5,
+            "portfolio": 0.5,
+            "current_role": 0.7 if timeline and timeline[0].get("company") else (0.4 if timeline else 0.0),
+            "total_experience": experience_confidence,
+            "skills": self._skills_confidence(skills, self._known_skills()),
+            "education": self._education_confidence(education),
+            "certifications": 0.5 if certifications == [NO_CERTIFICATIONS] else 0.8,
+            "experience_timeline": self._timeline_confidence(timeline),
+        }
+        return data, confidence
+
+    def _total_experience(self, resume_text: str, timeline: List[Dict]) -> Tuple[float, float]:
+        # An explicit "N years of experience" statement beats summed durations
+        match = _EXPLICIT_YEARS.search(resume_text)
+        if match:
+            return float(match.group(1)), 0.85
+
+        total = self.processor.calculate_total_experience(timeline)
+        if total <= 0:
+            return 0.0, 0.0
+        return total, 0.8 * self._timeline_confidence(timeline)
+
+    def _known_skills(self) -> set:
+        return {skill for skills in self.processor.skill_categories.values() for skill in skills}
+
+    @staticmethod
+    def _clean_skills(skills: List[str]) -> List[str]:
+        """Drop the sentences and headers the section parser lets through"""
+        cleaned, seen = [], set()
+        for skill in skills:
+            key = skill.lower().strip()
+            if (
+                not key or key in seen or key in _SECTION_WORDS
+                or len(key) > 30 or len(key.split()) > 3
+                or _DATE_ONLY.match(key)
+            ):
+                continue
+            seen.add(key)
+            cleaned.append(skill)
+        return cleaned
+
+    @staticmethod
+    def _clean_timeline(timeline: List[Dict]) -> List[Dict]:
+        """Fold date lines mis-parsed as jobs back into the job they belong to"""
+        cleaned: List[Dict] = []
+        for exp in timeline:
+            if _DATE_ONLY.match(exp.get("role", "")) or _DATE_ONLY.match(exp.get("company", "")):
+                if cleaned:
+                    previous = cleaned[-1]
+                    previous["technologies_used"] = sorted(set(previous["technologies_used"]) | set(exp.get("technologies_used", [])))
+                    previous["responsibilities"].extend(exp.get("responsibilities", []))
+                continue
+            cleaned.append(exp)
+        return cleaned
+
+    @staticmethod
+    def _clean_education(education: List[str]) -> List[str]:
+        """Keep the entries that name a degree when there are any"""
+        degrees = [entry for entry in education if _DEGREE.search(entry)]
+        return degrees or education
+
+    @staticmethod
+    def _skills_confidence(skills: List[str], known_skills: set) -> float:
+        # Only skills from the curated vocabulary count towards confidence
+        known = sum(1 for skill in skills if skill.lower() in known_skills)
+        if known >= 8:
+            return 0.9
+        if known >= 4:
+            return 0.7
+        return 0.4 if skills else 0.0
+
+    @staticmethod
+    def _education_confidence(education: List[str]) -> float:
+        if not education or education == [NO_EDUCATION]:
+            return 0.0
+        return 0.8 if any(_DEGREE.search(entry) for entry in education) else 0.5
+
+    @staticmethod
+    def _timeline_confidence(timeline: List[Dict]) -> float:
+        if not timeline:
+            return 0.0
+        complete = sum(1 for exp in timeline if exp.get("duration") and exp.get("company"))
+        return 0.3 + 0.6 * complete / len(timeline)
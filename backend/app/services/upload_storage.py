@@ -0,0 +1,78 @@
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from ..config import settings
+
+
+# Copy buffer: upload memory use is bounded by this, not by the file size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLarge(Exception):
+    """An uploaded file exceeds settings.MAX_FILE_SIZE"""
+
+    status_code = 413
+
+    def __init__(self, filename: str, max_size: int):
+        self.filename = filename
+        self.max_size = max_size
+        super().__init__(
+            f"{filename} exceeds the maximum upload size of {max_size / (1024 * 1024):.1f} MB"
+        )
+
+
+@dataclass
+class SpooledUpload:
+    file_path: str
+    size: int
+    content_hash: str  # SHA-256 of the file bytes, computed while copying
+
+
+def _copy_stream(source: BinaryIO, file_path: str, filename: str, max_size: int) -> SpooledUpload:
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        source.seek(0)
+        with open(file_path, "wb") as out:
+            while True:
+                chunk = source.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLarge(filename, max_size)
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        # Never leave a truncated file behind
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+
+    return SpooledUpload(file_path=file_path, size=size, content_hash=digest.hexdigest())
+
+
+async def spool_upload(file: Any, file_path: str, max_size: Optional[int] = None) -> SpooledUpload:
+    """
+    Stream an UploadFile to file_path in fixed-size chunks
+
+    Starlette already spools request bodies to a temporary file, so the copy
+    goes disk to disk on a worker thread and the bytes are never held in
+    memory. Files over max_size (default settings.MAX_FILE_SIZE) raise
+    UploadTooLarge, early when the size is known up front.
+    """
+    max_size = max_size or settings.MAX_FILE_SIZE
+    filename = file.filename or "upload"
+
+    known_size = getattr(file, "size", None)
+    if known_size is not None and known_size > max_size:
+        raise UploadTooLarge(filename, max_size)
+
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    return await run_in_threadpool(_copy_stream, file.file, file_path, filename, max_size)
+
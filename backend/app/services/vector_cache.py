@@ -0,0 +1,196 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..config import settings
+
+
+# Marker for strings whose doc has no vector (so we don't re-run the pipeline for them)
+_NO_VECTOR = object()
+
+
+class SkillVectorCache:
+    """
+    Bounded LRU cache of unit-normalized spaCy vectors
+
+    Keys are normalized skill strings (lowercased, stripped). Because every stored
+    vector has length 1, cosine similarity is a plain dot product and matches
+    spaCy's Doc.similarity() without re-running the pipeline.
+    """
+
+    def __init__(self, nlp: Any, max_size: int = 20000):
+        self.nlp = nlp
+        self.max_size = max_size
+        self._vectors: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return text.lower().strip()
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """Unit vector for `text`, or None if the pipeline has no vector for it"""
+        key = self.normalize(text)
+
+        with self._lock:
+            cached = self._vectors.get(key)
+            if cached is not None:
+                self._vectors.move_to_end(key)
+                self.hits += 1
+                return None if cached is _NO_VECTOR else cached
+            self.misses += 1
+
+        # Run the pipeline outside the lock so other threads aren't blocked
+        vector = self._compute(key)
+
+        with self._lock:
+            self._vectors[key] = _NO_VECTOR if vector is None else vector
+            self._vectors.move_to_end(key)
+            while len(self._vectors) > self.max_size:
+                self._vectors.popitem(last=False)
+                self.evictions += 1
+
+        return vector
+
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Unit vectors for many strings; misses are computed in one nlp.pipe() batch"""
+        keys = [self.normalize(text) for text in texts]
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+
+        with self._lock:
+            for key in keys:
+                if key in found:
+                    continue
+                cached = self._vectors.get(key)
+                if cached is not None:
+                    self._vectors.move_to_end(key)
+                    found[key] = cached
+                    self.hits += 1
+                else:
+                    found[key] = None
+                    missing.append(key)
+                    self.misses += 1
+
+        if missing:
+            computed = [
+                self._vector_from_doc(doc) if key else None
+                for key, doc in zip(missing, self.nlp.pipe(missing))
+            ]
+            with self._lock:
+                for key, vector in zip(missing, computed):
+                    found[key] = _NO_VECTOR if vector is None else vector
+                    self._vectors[key] = found[key]
+                    self._vectors.move_to_end(key)
+                while len(self._vectors) > self.max_size:
+                    self._vectors.popitem(last=False)
+                    self.evictions += 1
+
+        return [None if found[key] is _NO_VECTOR else found[key] for key in keys]
+
+    def matrix(self, texts: List[str]) -> Optional[np.ndarray]:
+        """
+        Stack unit vectors into an N x D float32 matrix
+
+        Strings without a vector get a zero row, so they score 0.0 against
+        everything. Returns None when no string has a vector at all.
+        """
+        vectors = self.get_many(texts)
+        width = next((len(v) for v in vectors if v is not None), 0)
+        if not width:
+            return None
+
+        stacked = np.zeros((len(vectors), width), dtype=np.float32)
+        for row, vector in enumerate(vectors):
+            if vector is not None:
+                stacked[row] = vector
+        return stacked
+
+    def similarity(self, text1: str, text2: str) -> Optional[float]:
+        """Cosine similarity of two strings, or None if either has no vector"""
+        vec1 = self.get(text1)
+        vec2 = self.get(text2)
+        if vec1 is None or vec2 is None:
+            return None
+        return float(np.dot(vec1, vec2))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._vectors),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._vectors.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def _compute(self, key: str) -> Optional[np.ndarray]:
+        if not key:
+            return None
+        return self._vector_from_doc(self.nlp(key))
+
+    @staticmethod
+    def _vector_from_doc(doc: Any) -> Optional[np.ndarray]:
+        if not doc.has_vector:
+            return None
+
+        vector = np.asarray(doc.vector, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            # spaCy scores zero-norm vectors as 0.0 similarity; a zero vector does the same
+            return np.zeros_like(vector)
+        return vector / norm
+
+
+# One cache per spaCy pipeline (all engines share the registry's pipeline)
+_caches: Dict[int, SkillVectorCache] = {}
+_caches_lock = threading.Lock()
+
+
+def _reset_locks_after_fork():
+    # A fork while another thread holds a lock would deadlock the child
+    global _caches_lock
+    _caches_lock = threading.Lock()
+    for cache in _caches.values():
+        cache._lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_locks_after_fork)
+
+
+def get_skill_vector_cache(nlp: Any) -> Optional[SkillVectorCache]:
+    """Get or create the shared vector cache for a pipeline (None if no pipeline)"""
+    if nlp is None:
+        return None
+
+    cache = _caches.get(id(nlp))
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(id(nlp))
+            if cache is None:
+                cache = SkillVectorCache(nlp, max_size=settings.SKILL_VECTOR_CACHE_SIZE)
+                _caches[id(nlp)] = cache
+    return cache
+
+
+def vector_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of every live cache, for /api/status"""
+    stats = {}
+    for key, cache in list(_caches.items()):
+        meta = getattr(cache.nlp, "meta", {}) or {}
+        name = f"{meta.get('lang', '')}_{meta.get('name', '')}".strip("_") or str(key)
+        stats[name] = cache.stats()
+    return stats
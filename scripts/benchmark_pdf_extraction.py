@@ -0,0 +1,112 @@
+"""
+PDF extraction benchmark: PyMuPDF vs. PyPDF2, legacy loop vs. engine, serial vs. pool
+
+Builds a synthetic corpus of resume-like PDFs in memory, then times:
+  - the legacy PyMuPDF path (file path, text += page) kept as a reference
+  - the engine with each backend, from bytes, one file at a time
+  - PDFProcessor.extract_many on the process pool
+and checks the engine returns the legacy text for the same backend.
+
+Usage:
+    python scripts/benchmark_pdf_extraction.py [--pdfs 200] [--pages 3] [--workers 0] [--seed 7]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+
+from backend.app.services.pdf_processor import PDFProcessor
+
+SKILLS = ["Python", "FastAPI", "Django", "PostgreSQL", "Redis", "Docker", "Kubernetes",
+          "AWS", "React", "TypeScript", "Spark", "Airflow", "Terraform", "Go", "Java"]
+VERBS = ["Built", "Designed", "Led", "Migrated", "Optimized", "Automated", "Maintained"]
+
+
+def synthetic_pdf(rng: random.Random, pages: int) -> bytes:
+    doc = fitz.open()
+    for page_no in range(pages):
+        lines = [f"Candidate {rng.randint(1, 10**6)} - page {page_no + 1}", "EXPERIENCE"]
+        for _ in range(40):
+            lines.append(f"- {rng.choice(VERBS)} {rng.choice(SKILLS)} and {rng.choice(SKILLS)} services "
+                         f"for {rng.randint(2, 500)}k users, cutting latency by {rng.randint(5, 80)}%")
+        lines += ["SKILLS", ", ".join(rng.sample(SKILLS, 8))]
+        doc.new_page().insert_textbox(fitz.Rect(36, 36, 576, 806), "\n".join(lines), fontsize=8)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def legacy_extract(file_path: str) -> str:
+    """The original PDFProcessor loop, kept verbatim as the reference"""
+    doc = fitz.open(file_path)
+    text = ""
+    for page_num in range(len(doc)):
+        page = doc.load_page(page_num)
+        text += page.get_text()
+    doc.close()
+    return text.strip()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def report(label: str, seconds: float, count: int, chars: int):
+    print(f"{label:<34} {seconds:8.3f}s | {seconds / count * 1000:7.2f} ms/pdf | "
+          f"{count / seconds:8.1f} pdf/s | {chars:>10,} chars")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdfs", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=0, help="extract_many pool size (0 = one per CPU core)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [synthetic_pdf(rng, args.pages) for _ in range(args.pdfs)]
+    print(f"Corpus: {args.pdfs} PDFs x {args.pages} pages, "
+          f"{sum(map(len, corpus)) / 1024 / 1024:.1f} MB, {os.cpu_count()} CPU core(s)\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i, data in enumerate(corpus):
+            path = os.path.join(tmp, f"resume_{i}.pdf")
+            with open(path, "wb") as f:
+                f.write(data)
+            paths.append(path)
+
+        legacy, seconds = timed(lambda: [legacy_extract(p) for p in paths])
+        report("legacy pymupdf (path, +=)", seconds, len(paths), sum(map(len, legacy)))
+
+        engine = PDFProcessor("pymupdf", max_pages=0, max_chars=0)
+        texts, seconds = timed(lambda: [engine.extract_text(data) for data in corpus])
+        report("engine pymupdf (bytes)", seconds, len(corpus), sum(map(len, texts)))
+        assert texts == legacy, "engine output differs from the legacy PyMuPDF path"
+
+        pypdf2 = PDFProcessor("pypdf2", max_pages=0, max_chars=0)
+        texts, seconds = timed(lambda: [pypdf2.extract_text(data) for data in corpus])
+        report("engine pypdf2 (bytes)", seconds, len(corpus), sum(map(len, texts)))
+
+        results, seconds = timed(lambda: engine.extract_many(paths, max_workers=args.workers or None))
+        assert [r.text for r in results] == legacy and not any(r.error for r in results)
+        report("engine pymupdf extract_many", seconds, len(paths), sum(len(r.text) for r in results))
+
+        capped = PDFProcessor("pymupdf", max_pages=1, max_chars=2000)
+        results, seconds = timed(lambda: [capped.extract(data) for data in corpus])
+        report("engine pymupdf (1 page, 2k chars)", seconds, len(corpus), sum(len(r.text) for r in results))
+        print(f"\nCapped extractions truncated: {sum(r.truncated for r in results)}/{len(results)}")
+
+
+if __name__ == "__main__":
+    main()
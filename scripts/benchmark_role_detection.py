@@ -0,0 +1,69 @@
+"""
+Role detection benchmark: compiled RoleIndex vs. the original linear scan
+
+Builds a synthetic corpus of job descriptions from the role table, runs both
+implementations of _auto_detect_job_priorities on every JD, checks that the
+chosen priorities are identical and prints the timings.
+
+Usage:
+    python scripts/benchmark_role_detection.py [--jds 500] [--seed 7]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app.services.matching_engine import MatchingEngine
+from tests.role_detection_reference import build_corpus, legacy_detect_job_priorities
+
+
+def run_benchmark(jd_count: int = 500, seed: int = 7) -> dict:
+    engine = MatchingEngine(load_model=False)  # role detection never touches spaCy
+    corpus = build_corpus(jd_count, seed)
+
+    start = time.perf_counter()
+    legacy_results = [legacy_detect_job_priorities(jd) for jd in corpus]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed_results = [engine._auto_detect_job_priorities(jd) for jd in corpus]
+    indexed_time = time.perf_counter() - start
+
+    # The legacy reference covers the pattern stage only; when it finds nothing,
+    # both versions fall through to the same (unchanged) skill-based fallbacks
+    mismatches = [
+        i for i, (legacy, indexed) in enumerate(zip(legacy_results, indexed_results))
+        if legacy and legacy != indexed
+    ]
+
+    return {
+        "jds": len(corpus),
+        "mismatches": mismatches,
+        "legacy_ms_per_jd": legacy_time / len(corpus) * 1000,
+        "indexed_ms_per_jd": indexed_time / len(corpus) * 1000,
+        "speedup": legacy_time / indexed_time if indexed_time else float("inf"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark role detection")
+    parser.add_argument("--jds", type=int, default=500, help="Number of synthetic JDs")
+    parser.add_argument("--seed", type=int, default=7, help="Corpus random seed")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.jds, args.seed)
+
+    print(f"JDs checked:        {results['jds']}")
+    print(f"Priority mismatches: {len(results['mismatches'])}")
+    print(f"Linear scan:        {results['legacy_ms_per_jd']:.3f} ms/JD")
+    print(f"Role index:         {results['indexed_ms_per_jd']:.3f} ms/JD")
+    print(f"Speedup:            {results['speedup']:.1f}x")
+
+    sys.exit(1 if results['mismatches'] else 0)
+
+
+if __name__ == "__main__":
+    main()
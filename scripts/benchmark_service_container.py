@@ -0,0 +1,66 @@
+"""
+LLM service setup benchmark: per-request construction vs. the service container
+
+Simulates the request handlers' setup step (upload_resumes, upload_jd,
+approve_structure, InterviewService) the old way, building an LLMService per
+request, and the new way, asking the process-wide container for the shared
+one. Backend detection follows the current environment/.env, so run it with
+the configuration you deploy (USE_OLLAMA, USE_AGENTIC_AI, API keys).
+
+Usage:
+    python scripts/benchmark_service_container.py [--requests 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app.services.llm_service import LLMService
+from backend.app.services.service_container import ServiceContainer
+
+
+def time_setup(setup, requests: int) -> list:
+    timings = []
+    with redirect_stdout(StringIO()):  # backend detection is chatty
+        for _ in range(requests):
+            start = time.perf_counter()
+            setup()
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(label: str, timings: list):
+    print(
+        f"{label:<28} total {sum(timings) * 1000:9.2f} ms | "
+        f"mean {statistics.mean(timings) * 1e6:10.1f} µs | "
+        f"max {max(timings) * 1e6:10.1f} µs"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    per_request = time_setup(LLMService, args.requests)
+
+    container = ServiceContainer()
+    with redirect_stdout(StringIO()):
+        container.llm_service()  # warmed at app startup
+    shared = time_setup(container.llm_service, args.requests)
+
+    print(f"Backend: {container.stats()['llm_backend']} | {args.requests} simulated requests\n")
+    report("LLMService() per request", per_request)
+    report("services.llm_service()", shared)
+    print(f"\nBackend builds: {args.requests} -> {container.stats()['llm_service_builds']} (at startup)")
+    print(f"Setup time saved per request: {(statistics.mean(per_request) - statistics.mean(shared)) * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,17 @@
+import asyncio
 import sys
 import os
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from backend.app.services.http_client import http_clients
 from backend.app.services.ollama_service import get_ollama_service
 from dotenv import load_dotenv
 
 load_dotenv()
 
-def test_ollama_connection():
+async def run_checks():
     print("\n" + " "*60)
     print("TESTING OLLAMA CONNECTION")
     print(" "*60 + "\n")
@@ -20,7 +22,7 @@ def test_ollama_connection():
         
         # Health check
         print("1️. Testing health check...")
-        if ollama.health_check():
+        if await ollama.health_check():
             print(" Health check passed\n")
         else:
             print(" Health check failed\n")
@@ -29,7 +31,7 @@ def test_ollama_connection():
         # Test simple prompt
         print("2️. Testing simple prompt...")
         test_prompt = "Say 'Hello from Ollama!' in exactly those words."
-        response = ollama._make_request(test_prompt, temperature=0.0)
+        response = await ollama._make_request(test_prompt, temperature=0.0)
         print(f"   Response: {response[:100]}...")
         print(" Simple prompt test passed\n")
         
@@ -42,7 +44,7 @@ def test_ollama_connection():
     "test": true
 }
 """
-        response = ollama._make_request(json_prompt, temperature=0.0)
+        response = await ollama._make_request(json_prompt, temperature=0.0)
         parsed = ollama._parse_json_response(response, "test")
         
         if "error" not in parsed:
@@ -61,6 +63,14 @@ def test_ollama_connection():
         import traceback
         traceback.print_exc()
         return False
+    finally:
+        # Pooled clients are bound to this loop: close them before it goes away
+        await http_clients.aclose()
+
+
+def test_ollama_connection():
+    # One event loop for every check, so they share one pooled client
+    return asyncio.run(run_checks())
 
 if __name__ == "__main__":
     success = test_ollama_connection()
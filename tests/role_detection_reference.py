@@ -0,0 +1,113 @@
+"""
+Reference implementation of role detection, for parity checks
+
+legacy_detect_job_priorities is the original per-role linear scan that the
+compiled RoleIndex replaced; build_corpus makes synthetic JDs to compare the
+two on. Used by tests/test_matching.py and scripts/benchmark_role_detection.py.
+"""
+
+import random
+
+from backend.app.services.role_patterns import ROLE_DETECTION_PATTERNS
+
+FILLER = [
+    "We are looking for a motivated professional to join our growing team.",
+    "You will collaborate with cross-functional stakeholders and own delivery.",
+    "Competitive salary, remote-friendly culture and learning budget.",
+    "Strong communication skills and attention to detail are essential.",
+    "Experience in a fast-paced environment is a plus.",
+    "Minimum 3 years of experience in a similar position.",
+]
+
+
+def legacy_detect_job_priorities(jd_data: dict) -> list:
+    """The original per-role linear scan, kept verbatim as the parity reference"""
+    job_title = jd_data.get('job_title', '').lower()
+    job_description = jd_data.get('description', '').lower()
+    primary_skills = jd_data.get('primary_skills', [])
+    secondary_skills = jd_data.get('secondary_skills', [])
+
+    all_text = f"{job_title} {job_description}"
+    priorities = []
+
+    primary_match = None
+    primary_score = 0
+    for role_pattern in ROLE_DETECTION_PATTERNS:
+        pattern_matches = sum(1 for pattern in role_pattern['patterns'] if pattern in all_text)
+        skill_matches = 0
+        if primary_skills:
+            for skill in role_pattern['key_skills']:
+                if any(skill.lower() in ps.lower() for ps in primary_skills):
+                    skill_matches += 1
+        total_score = (pattern_matches * 2) + skill_matches
+        if total_score > primary_score:
+            primary_score = total_score
+            primary_match = role_pattern.copy()
+
+    if primary_match and primary_score > 0:
+        primary_match['priority'] = 1
+        priorities.append(primary_match)
+
+    secondary_candidates = []
+    for role_pattern in ROLE_DETECTION_PATTERNS:
+        if primary_match and role_pattern['role'] == primary_match['role']:
+            continue
+        pattern_matches = sum(1 for pattern in role_pattern['patterns'] if pattern in all_text)
+        skill_matches = 0
+        if secondary_skills:
+            for skill in role_pattern['key_skills']:
+                if any(skill.lower() in ss.lower() for ss in secondary_skills):
+                    skill_matches += 1
+        if primary_skills:
+            for skill in role_pattern['key_skills']:
+                if any(skill.lower() in ps.lower() for ps in primary_skills):
+                    skill_matches += 0.5
+        total_score = pattern_matches + skill_matches
+        if total_score > 0:
+            secondary_candidates.append({'role_pattern': role_pattern.copy(), 'score': total_score})
+
+    secondary_candidates.sort(key=lambda x: x['score'], reverse=True)
+    for i, candidate in enumerate(secondary_candidates[:2]):
+        role_pattern = candidate['role_pattern']
+        role_pattern['priority'] = i + 2
+        role_pattern['weight'] = 0.8 if i == 0 else 0.6
+        priorities.append(role_pattern)
+
+    return priorities
+
+
+def build_corpus(count: int, seed: int = 7) -> list:
+    """Synthetic JDs mixing role patterns, key skills and filler text"""
+    rng = random.Random(seed)
+    corpus = []
+
+    for _ in range(count):
+        roles = rng.sample(ROLE_DETECTION_PATTERNS, rng.randint(1, 3))
+        main_role = roles[0]
+
+        description_parts = rng.sample(FILLER, 3)
+        for role in roles:
+            description_parts.extend(rng.sample(role['patterns'], min(2, len(role['patterns']))))
+        rng.shuffle(description_parts)
+
+        primary_skills = [
+            skill.title() if rng.random() < 0.5 else f"{skill} (advanced)"
+            for skill in rng.sample(main_role['key_skills'], min(4, len(main_role['key_skills'])))
+        ]
+        secondary_skills = [
+            skill for role in roles[1:] for skill in rng.sample(role['key_skills'], 2)
+        ]
+
+        jd = {
+            "job_title": main_role['role'] if rng.random() < 0.8 else "Team Member",
+            "description": " ".join(description_parts),
+            "primary_skills": primary_skills if rng.random() < 0.9 else [],
+            "secondary_skills": secondary_skills,
+        }
+        corpus.append(jd)
+
+    # A few edge cases: empty JD, unknown role, skills only
+    corpus.append({})
+    corpus.append({"job_title": "Chief Happiness Officer", "description": "Spread joy."})
+    corpus.append({"primary_skills": ["Python", "Django"], "secondary_skills": ["Docker"]})
+    return corpus
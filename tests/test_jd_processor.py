@@ -0,0 +1,346 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.app.services import llm_service, ollama_service
+from backend.app.services.circuit_breaker import circuit_breakers
+from backend.app.services.http_client import http_clients
+from backend.app.services.llm_cache import LLMResponseCache, make_cache_key
+from backend.app.services.rate_limiter import TokenBucket, rate_limits
+from backend.app.services import agentic_service, service_container
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    connections = set()
+    delay = 0.0
+    requests = 0
+    throttle = 0  # answer this many requests with 429 first
+
+    def do_POST(self):
+        FakeOllamaHandler.requests += 1
+        FakeOllamaHandler.connections.add(self.client_address)
+        self.rfile.read(int(self.headers["Content-Length"]))
+        if FakeOllamaHandler.throttle:
+            FakeOllamaHandler.throttle -= 1
+            self.send_response(429)
+            self.send_header("Retry-After", "0.3")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        time.sleep(self.delay)
+        body = json.dumps({"response": json.dumps({"job_title": "Data Engineer", "primary_skills": ["Python"]})}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # /api/tags health check
+        body = json.dumps({"models": [{"name": "fake-model"}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_ollama(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOllamaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    FakeOllamaHandler.connections = set()
+    FakeOllamaHandler.requests = 0
+    FakeOllamaHandler.throttle = 0
+
+    monkeypatch.setattr(ollama_service.settings, "OLLAMA_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setattr(ollama_service.settings, "OLLAMA_MODEL", "fake-model")
+    yield ollama_service.OllamaService()
+    server.shutdown()
+
+
+def test_ollama_calls_reuse_pooled_connections_without_blocking(fake_ollama):
+    async def scenario():
+        # Sequential calls ride one keep-alive connection
+        for _ in range(5):
+            jd = await fake_ollama.structure_job_description("Data Engineer, Python")
+            assert jd["job_title"] == "Data Engineer"
+        assert len(FakeOllamaHandler.connections) == 1
+
+        # Concurrent calls overlap instead of stalling the event loop
+        FakeOllamaHandler.delay = 0.2
+        start = time.time()
+        await asyncio.gather(*(fake_ollama.structure_job_description("x") for _ in range(4)))
+        elapsed = time.time() - start
+        FakeOllamaHandler.delay = 0.0
+
+        await http_clients.aclose()
+        return elapsed
+
+    assert asyncio.run(scenario()) < 4 * 0.2 * 0.75
+
+
+def test_llm_response_cache_ttl_and_lru(tmp_path):
+    cache = LLMResponseCache(path=str(tmp_path / "llm.sqlite3"), ttl_seconds=3600, max_entries=3)
+    keys = [make_cache_key("ollama", "m", "jd-v1", 0.1, f"jd {i}") for i in range(4)]
+    assert len(set(keys)) == 4
+    assert make_cache_key("ollama", "m", "jd-v2", 0.1, "jd 0") != keys[0]
+
+    for key in keys[:3]:
+        cache.put(key, {"job_title": key[:6]})
+    assert cache.get(keys[0]) == {"job_title": keys[0][:6]}  # most recently used now
+
+    cache.put(keys[3], {"job_title": "new"})
+    assert cache.get(keys[1]) is None  # least recently used was evicted
+    assert cache.get(keys[0]) is not None
+    stats = cache.stats()
+    assert stats["entries"] == 3 and stats["evictions"] == 1
+    assert stats["hits"] == 2 and stats["misses"] == 1
+
+    short_lived = LLMResponseCache(path=str(tmp_path / "ttl.sqlite3"), ttl_seconds=0.05)
+    short_lived.put(keys[0], {"a": 1})
+    time.sleep(0.1)
+    assert short_lived.get(keys[0]) is None
+
+
+def test_llm_service_serves_repeated_prompts_from_cache(fake_ollama, tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_service.settings, "USE_OLLAMA", True)
+    monkeypatch.setattr(llm_service.settings, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(ollama_service, "_ollama_service", fake_ollama)
+    cache = LLMResponseCache(path=str(tmp_path / "llm.sqlite3"))
+    monkeypatch.setattr(llm_service, "llm_cache", cache)
+
+    async def scenario():
+        service = llm_service.LLMService()
+        first = await service.structure_job_description("Data Engineer, Python")
+        second = await service.structure_job_description("Data Engineer, Python")
+        await service.structure_job_description("Something else")
+        await http_clients.aclose()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == second
+    assert FakeOllamaHandler.requests == 2
+    assert cache.stats()["hits"] == 1
+
+
+def test_token_bucket_waits_outside_the_lock():
+    bucket = TokenBucket("test", rate_per_minute=60, burst=1)  # one per second
+    assert bucket.acquire() == 0.0
+
+    waiter = threading.Thread(target=bucket.acquire)
+    waiter.start()
+    time.sleep(0.1)
+    start = time.time()
+    stats = bucket.stats()  # needs the lock the old limiter slept under
+    assert time.time() - start < 0.1
+    assert stats["queue_depth"] == 1
+
+    async def second_waiter():
+        return await bucket.acquire_async()
+
+    waited = asyncio.run(second_waiter())  # queued behind the thread's slot
+    waiter.join()
+    assert waited > 1.5
+    stats = bucket.stats()
+    assert stats["queue_depth"] == 0 and stats["max_queue_depth"] == 2
+    assert stats["acquired"] == 3 and stats["max_wait_seconds"] >= waited - 0.01
+
+
+def test_ollama_backs_off_on_429_and_retry_after(fake_ollama, monkeypatch):
+    monkeypatch.setattr(ollama_service.settings, "OLLAMA_REQUESTS_PER_MINUTE", 600)
+    rate_limits.reset()
+    FakeOllamaHandler.throttle = 1
+
+    async def scenario():
+        start = time.time()
+        jd = await fake_ollama.structure_job_description("Data Engineer, Python")
+        await http_clients.aclose()
+        return jd, time.time() - start
+
+    jd, elapsed = asyncio.run(scenario())
+    assert jd["job_title"] == "Data Engineer"  # retried after the 429
+    assert FakeOllamaHandler.requests == 2
+    assert elapsed >= 0.3  # Retry-After was honoured
+
+    stats = rate_limits.stats()["ollama"]
+    assert stats["throttled_429"] == 1
+    assert stats["current_per_minute"] < stats["configured_per_minute"]
+    rate_limits.reset()
+
+
+def test_circuit_breaker_skips_a_hung_backend_and_probes_it_back(fake_ollama, tmp_path, monkeypatch):
+    settings = llm_service.settings
+    monkeypatch.setattr(settings, "USE_OLLAMA", True)
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "LLM_REQUEST_DEADLINE_SECONDS", 0.3)
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_MIN_CALLS", 2)
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_OPEN_SECONDS", 0.5)
+    monkeypatch.setattr(ollama_service, "_ollama_service", fake_ollama)
+    circuit_breakers.reset()
+
+    async def scenario():
+        service = llm_service.LLMService()
+        FakeOllamaHandler.delay = 1.0  # tunnel up, model hung
+        for _ in range(2):
+            with pytest.raises(EnvironmentError):  # deadline hit, no fallback configured
+                await service.structure_job_description("Data Engineer")
+
+        start = time.time()
+        with pytest.raises(EnvironmentError):
+            await service.structure_job_description("Data Engineer")
+        skipped_in = time.time() - start
+        requests_while_open = FakeOllamaHandler.requests
+
+        FakeOllamaHandler.delay = 0.0
+        await asyncio.sleep(0.6)  # open period over: /api/tags probe, then the real call
+        jd = await service.structure_job_description("Data Engineer")
+        await http_clients.aclose()
+        return skipped_in, requests_while_open, jd
+
+    skipped_in, requests_while_open, jd = asyncio.run(scenario())
+    assert skipped_in < 0.05
+    assert requests_while_open == 2  # the open circuit never touched the network
+    assert jd["job_title"] == "Data Engineer"
+
+    stats = circuit_breakers.stats()["ollama"]
+    assert stats["state"] == "closed"
+    assert stats["times_opened"] == 1 and stats["rejected"] == 1 and stats["probes"] == 1
+    circuit_breakers.reset()
+
+
+def test_circuit_breaker_keeps_explicit_zero_and_ignores_cancelled_calls():
+    from backend.app.services.circuit_breaker import CircuitBreaker
+
+    breaker = CircuitBreaker("test", min_calls=1, failure_rate=1.0, open_seconds=0)
+    assert breaker.open_seconds == 0 and breaker.min_calls == 1
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def fail():
+        raise ConnectionError("down")
+
+    async def ok():
+        return "ok"
+
+    async def scenario():
+        call = asyncio.create_task(breaker.call(hang))
+        await asyncio.sleep(0.05)
+        call.cancel()  # client disconnected
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        cancelled_stats = breaker.stats()
+
+        with pytest.raises(ConnectionError):
+            await breaker.call(fail)
+        opened_stats = breaker.stats()
+        # A zero cooldown lets the very next call through as the half-open trial
+        return cancelled_stats, opened_stats, await breaker.call(ok)
+
+    cancelled_stats, opened_stats, result = asyncio.run(scenario())
+    assert cancelled_stats["state"] == "closed"
+    assert cancelled_stats["calls"] == 0 and cancelled_stats["failures"] == 0
+    assert opened_stats["state"] == "open" and opened_stats["times_opened"] == 1
+    assert result == "ok" and breaker.state == "closed"
+
+
+def test_rate_limit_queueing_is_not_backend_latency(fake_ollama, monkeypatch):
+    settings = llm_service.settings
+    monkeypatch.setattr(settings, "USE_OLLAMA", True)
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "OLLAMA_REQUESTS_PER_MINUTE", 120)  # one slot every 0.5s
+    monkeypatch.setattr(settings, "LLM_RATE_LIMIT_BURST", 1)
+    monkeypatch.setattr(settings, "LLM_REQUEST_DEADLINE_SECONDS", 0.7)
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_MIN_CALLS", 2)
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_FAILURE_RATE", 0.5)
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_SLOW_CALL_SECONDS", 0.4)
+    monkeypatch.setattr(ollama_service, "_ollama_service", fake_ollama)
+    rate_limits.reset()
+    circuit_breakers.reset()
+
+    async def scenario():
+        service = llm_service.LLMService()
+        results = await asyncio.gather(
+            *(service.structure_job_description("Data Engineer") for _ in range(3)), return_exceptions=True
+        )
+        await http_clients.aclose()
+        return results
+
+    # Slots at 0s and 0.5s; the third (1.0s) is past the deadline and never sent
+    first, second, third = asyncio.run(scenario())
+    assert first["job_title"] == second["job_title"] == "Data Engineer"
+    assert isinstance(third, EnvironmentError)
+    assert FakeOllamaHandler.requests == 2
+
+    limiter = rate_limits.stats()["ollama"]
+    assert limiter["acquired"] == 2 and limiter["rejected"] == 1  # one slot per request, not two
+    breaker = circuit_breakers.stats()["ollama"]
+    assert breaker["state"] == "closed"
+    assert breaker["calls"] == 2 and breaker["failures"] == 0
+    assert breaker["window_failure_rate"] == 0.0  # the 0.5s queue wait was not a slow call
+    rate_limits.reset()
+    circuit_breakers.reset()
+
+
+def test_concurrent_agentic_calls_each_drive_their_own_service(monkeypatch):
+    from backend.app.services.llm_service import LLMService
+
+    in_flight = threading.Barrier(3, timeout=5)
+    used = []
+
+    class FakeAgentic:
+        async def analyze_resume(self, resume_text):
+            in_flight.wait()  # all three calls run at the same time
+            used.append((self, threading.get_ident()))
+            return {"name": resume_text}
+
+    monkeypatch.setattr(agentic_service, "EnhancedAgenticATSService", FakeAgentic)
+    monkeypatch.setattr(service_container, "services", service_container.ServiceContainer())
+
+    async def scenario():
+        return await asyncio.gather(*(LLMService._run_agentic("analyze_resume", f"R{i}") for i in range(3)))
+
+    assert asyncio.run(scenario()) == [{"name": "R0"}, {"name": "R1"}, {"name": "R2"}]
+    assert len({id(service) for service, _ in used}) == 3
+    assert len({thread for _, thread in used}) == 3
+
+
+def test_service_container_builds_backends_once_and_reloads_on_config_change(monkeypatch):
+    built = []
+
+    class FakeAgentic:
+        def __init__(self):
+            built.append(threading.get_ident())
+
+    monkeypatch.setattr(agentic_service, "EnhancedAgenticATSService", FakeAgentic)
+    monkeypatch.setattr(service_container, "CONFIG_CHECK_INTERVAL", 0.0)
+    container = service_container.ServiceContainer()
+
+    first = container.llm_service()
+    assert all(container.llm_service() is first for _ in range(10))
+    assert container.stats()["llm_service_builds"] == 1
+
+    # One agentic service per worker thread, reused across that thread's resumes
+    def worker():
+        assert container.agentic_service() is container.agentic_service()
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(built) == 3
+
+    monkeypatch.setattr(service_container.settings, "PERPLEXITY_MODEL", "another-model")
+    rebuilt = container.llm_service()
+    assert rebuilt is not first and rebuilt.model == "another-model"
+    stats = container.stats()
+    assert stats["llm_service_builds"] == 2 and stats["reloads"] == 1
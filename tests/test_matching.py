@@ -57,3 +57,706 @@ def test_matching_engine_success(engine):
     result = engine.calculate_ats_score(jd_data, resume_data, skills_weightage)
     
     assert result["overall_score"] > 0.0
+
+def test_engines_share_one_spacy_load(monkeypatch):
+    # Every MatchingEngine must reuse the registry handle instead of reloading spaCy
+    import spacy
+    from backend.app.services import model_registry as registry_module
+
+    calls = []
+
+    def fake_load(name):
+        calls.append(name)
+        return spacy.blank("en")
+
+    monkeypatch.setattr(registry_module.spacy, "load", fake_load)
+    registry = registry_module.ModelRegistry()
+    monkeypatch.setattr("backend.app.services.matching_engine.model_registry", registry)
+
+    first = MatchingEngine()
+    second = MatchingEngine()
+
+    assert first.nlp is second.nlp
+    assert calls == ["en_core_web_md"]
+    assert registry.stats()["default_model"] == "en_core_web_md"
+
+
+@pytest.fixture
+def vector_nlp():
+    # Tiny blank pipeline with hand-made vectors so similarity is deterministic
+    import numpy as np
+    import spacy
+
+    nlp = spacy.blank("en")
+    vectors = {
+        "python": [1.0, 0.1, 0.0],
+        "django": [0.9, 0.3, 0.0],
+        "flask": [0.95, 0.2, 0.05],
+        "java": [0.0, 1.0, 0.2],
+        "spring": [0.1, 0.9, 0.3],
+        "excel": [0.0, 0.0, 1.0],
+    }
+    for word, vec in vectors.items():
+        nlp.vocab.set_vector(word, np.asarray(vec, dtype="float32"))
+    return nlp
+
+
+def test_vector_cache_matches_spacy_similarity(vector_nlp):
+    from backend.app.services.vector_cache import SkillVectorCache
+
+    cache = SkillVectorCache(vector_nlp, max_size=2)
+    expected = vector_nlp("python").similarity(vector_nlp("django"))
+
+    assert cache.similarity("Python", "django ") == pytest.approx(expected, abs=1e-6)
+    assert cache.similarity("python", "django") == pytest.approx(expected, abs=1e-6)
+    assert cache.similarity("python", "kubernetes") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 3
+    assert stats["misses"] == 3
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+
+
+def test_similarity_matrix_matches_pairwise_loop(vector_nlp):
+    engine = MatchingEngine(nlp=vector_nlp)
+    required = ["python", "java", "excel", "kubernetes", ""]
+    resume = ["django", "spring", "flask", "go"]
+
+    matrix = engine._skill_similarity_matrix(required, resume)
+
+    for row, req_skill in enumerate(required):
+        best_sim, best_match = 0.0, ""
+        for res_skill in resume:
+            sim = engine._calculate_semantic_similarity(req_skill, res_skill)
+            if sim > best_sim:
+                best_sim, best_match = sim, res_skill
+        best_index = int(matrix[row].argmax())
+        assert matrix[row][best_index] == pytest.approx(best_sim, abs=1e-6)
+        if best_sim > 0:
+            assert resume[best_index] == best_match
+
+def test_role_index_matches_linear_scan():
+    from tests.role_detection_reference import build_corpus, legacy_detect_job_priorities
+
+    engine = MatchingEngine(load_model=False)
+    for jd in build_corpus(150, seed=3):
+        legacy = legacy_detect_job_priorities(jd)
+        if legacy:
+            assert engine._auto_detect_job_priorities(jd) == legacy
+
+
+def test_scoring_plan_gives_same_scores_and_is_compiled_once(vector_nlp, monkeypatch):
+    engine = MatchingEngine(nlp=vector_nlp)
+    jd_data = {
+        "job_title": "Python Developer",
+        "description": "Python developer with 2+ years experience in Django and Flask",
+    }
+    skills_weightage = {"python": 90, "django": 70}
+    resumes = [
+        {
+            "total_experience": 3,
+            "skills": ["Python", "Flask", "Java"],
+            "experience_timeline": [
+                {"role": "Python Developer", "company": "Acme", "duration": "2021 - Present",
+                 "description": "Built Django and Flask services"}
+            ],
+        },
+        {
+            "total_experience": 4,
+            "skills": ["Spring", "Django"],
+            "experience_timeline": [
+                {"role": "Backend Developer", "company": "Initech", "duration": "4 years",
+                 "description": "Python APIs with FastAPI and Docker"}
+            ],
+        },
+    ]
+
+    expected = [engine.calculate_ats_score(jd_data, r, skills_weightage) for r in resumes]
+
+    plan = engine.compile_jd_plan(jd_data, skills_weightage)
+    detect_calls = []
+    monkeypatch.setattr(engine, "_auto_detect_job_priorities", lambda jd: detect_calls.append(jd) or [])
+    actual = [engine.calculate_ats_score(jd_data, r, skills_weightage, plan=plan) for r in resumes]
+
+    assert detect_calls == []
+    for want, got in zip(expected, actual):
+        for key in ("overall_score", "skill_match_score", "experience_score"):
+            assert got[key] == pytest.approx(want[key])
+
+
+def test_process_single_resume_computes_each_component_once(vector_nlp, monkeypatch):
+    from types import SimpleNamespace
+    from backend.app.api import matching_routes
+
+    engine = MatchingEngine(nlp=vector_nlp)
+    monkeypatch.setattr(matching_routes, "matching_engine", engine)
+    monkeypatch.setattr(matching_routes, "USE_AGENTIC_AI", False)
+    monkeypatch.setattr(matching_routes.settings, "MATCHING_SCORES_ONLY", False)
+
+    calls = {}
+    for name in (
+        "_auto_detect_job_priorities",
+        "_calculate_complete_skills_score",
+        "_calculate_enhanced_experience_score_v2",
+        "_calculate_enhanced_experience_score",
+        "_get_complete_skills_analysis",
+    ):
+        original = getattr(engine, name)
+
+        def counted(*args, _name=name, _original=original, **kwargs):
+            calls[_name] = calls.get(_name, 0) + 1
+            return _original(*args, **kwargs)
+
+        monkeypatch.setattr(engine, name, counted)
+
+    jd_data = {"job_title": "Python Developer", "description": "Python developer, Django and Flask"}
+    resume = SimpleNamespace(
+        id=1,
+        filename="jane.pdf",
+        structured_data={
+            "name": "Jane",
+            "total_experience": 3,
+            "skills": ["Python", "Flask"],
+            "experience_timeline": [
+                {"role": "Python Developer", "company": "Acme", "duration": "3 years",
+                 "description": "Django and Flask services"}
+            ],
+        },
+    )
+
+    result = matching_routes.process_single_resume(resume, jd_data, {"python": 100}, 1, "s1")
+
+    assert result.error is None
+    assert result.ats_score["overall_score"] > 0
+    assert calls == {
+        "_auto_detect_job_priorities": 1,
+        "_calculate_complete_skills_score": 1,
+        "_calculate_enhanced_experience_score_v2": 1,
+        "_get_complete_skills_analysis": 1,
+    }
+
+
+def test_rate_limit_timeout_falls_back_to_traditional_scoring(monkeypatch):
+    from types import SimpleNamespace
+    from backend.app.api import matching_routes
+    from backend.app.services.rate_limiter import RateLimitExceeded
+
+    engine = CountingEngine()
+    monkeypatch.setattr(matching_routes, "matching_engine", engine)
+    monkeypatch.setattr(matching_routes, "_agentic_ats_score", lambda *args: pytest.fail("no slot, no call"))
+
+    class NoSlot:
+        def acquire(self):
+            raise RateLimitExceeded("agentic", 600)
+
+    resume = SimpleNamespace(id=1, filename="a.pdf", structured_data={"name": "A", "skills": ["Python"]})
+    result = matching_routes.process_single_resume(
+        resume, {}, {}, 1, "s1", rate_limiter=NoSlot(), agentic=True)
+
+    assert result.error is None
+    assert result.ats_score["overall_score"] == 10.0
+    assert result.ats_score["detailed_analysis"]["scoring_method"] == "Traditional (Agentic Fallback)"
+    assert engine.scored == ["A"]
+
+
+def test_process_executor_matches_in_process_scoring():
+    from types import SimpleNamespace
+    from backend.app.services.matching_executor import MatchingExecutor
+
+    engine = MatchingEngine()
+    jd_data = {"job_title": "Python Developer", "description": "Python developer, Django and Flask"}
+    skills_weightage = {"python": 100}
+    plan = engine.compile_jd_plan(jd_data, skills_weightage)
+    resumes = [
+        SimpleNamespace(id=i, filename=f"r{i}.pdf", structured_data={
+            "name": f"Candidate {i}",
+            "total_experience": i,
+            "skills": ["Python", "Flask"][:i],
+            "experience_timeline": [
+                {"role": "Python Developer", "company": "Acme", "duration": f"{i} years",
+                 "description": "Django and Flask services"}
+            ],
+        })
+        for i in (1, 2, 3)
+    ]
+
+    from backend.app.services import matching_executor
+
+    runs = []
+    for _ in range(2):
+        with MatchingExecutor("process", 2, jd_data, skills_weightage, plan) as executor:
+            assert executor.mode == "process"
+            futures = executor.submit_all(resumes, thread_task=None)
+            runs.append(sorted((r for f in futures for r in f.result()), key=lambda r: r.resume_id))
+    # Both runs were served by the same warm workers
+    pool = matching_executor.get_process_pool()
+    assert executor._pool is pool
+    assert [r.ats_score for r in runs[0]] == [r.ats_score for r in runs[1]]
+    results = runs[0]
+
+    for resume, result in zip(resumes, results):
+        expected = engine.score_resume(jd_data, resume.structured_data, skills_weightage, plan=plan)
+        assert result.error is None
+        assert result.resume_id == resume.id
+        assert result.candidate_name == resume.structured_data["name"]
+        assert result.ats_score["overall_score"] == pytest.approx(expected.overall_score)
+        assert result.ats_score["skill_match_score"] == pytest.approx(expected.skill_match_score)
+
+
+def test_matching_job_reports_incremental_progress():
+    from backend.app.services.matching_executor import ResumeProcessingResult
+    from backend.app.services.matching_jobs import MatchingJobRegistry
+
+    registry = MatchingJobRegistry()
+    job = registry.create("s1", total=3)
+    assert registry.active_for_session("s1") is job
+
+    job.start()
+    job.record_result(ResumeProcessingResult(1, "a.pdf", "A", ats_score={
+        "overall_score": 40.0, "skill_match_score": 50.0, "experience_score": 30.0,
+        "detailed_analysis": {"scoring_method": "Traditional"}}))
+    job.record_result(ResumeProcessingResult(2, "b.pdf", "B", error="boom"))
+
+    progress = job.snapshot()
+    assert progress["status"] == "running"
+    assert (progress["processed"], progress["completed"], progress["failed"]) == (2, 1, 1)
+
+    job.record_result(ResumeProcessingResult(3, "c.pdf", "C", ats_score={
+        "overall_score": 80.0, "skill_match_score": 90.0, "experience_score": 70.0,
+        "detailed_analysis": {}}))
+    page = job.results_since(1)
+    assert [r["resume_id"] for r in page["new_results"]] == [3]
+    assert page["next_offset"] == 2
+    assert [r["resume_id"] for r in page["provisional_ranking"]] == [3, 1]
+
+    # No second job (or synchronous run) while this one is running
+    from backend.app.services.matching_jobs import MatchingJobConflict
+    with pytest.raises(MatchingJobConflict):
+        registry.create("s1", total=3)
+
+    job.finish({"status": "completed"})
+    assert registry.active_for_session("s1") is None
+    assert [e["event"] for e in job.events_since(0)] == ["started", "result", "error", "result", "completed"]
+
+
+class CountingEngine:
+    """Scores by skill count and records which resumes were scored"""
+
+    def __init__(self):
+        from types import SimpleNamespace
+        self.plan = SimpleNamespace(job_priorities=[], required_skills={})
+        self.scored = []
+
+    def compile_jd_plan(self, jd_data, skills_weightage):
+        return self.plan
+
+    def score_resume(self, jd_data, resume_data, skills_weightage, plan=None, scores_only=False):
+        from backend.app.services.matching_engine import ATSScoreResult
+        self.scored.append(resume_data["name"])
+        if resume_data.get("broken"):
+            # What MatchingEngine._get_default_result returns when scoring raises
+            return ATSScoreResult(detailed_analysis={"error": "boom"}, error="boom")
+        score = 10.0 * len(resume_data["skills"]) + skills_weightage.get("python", 0) / 10
+        skill_vector = {"skills": {skill: (1.0, float(skill in resume_data["skills"])) for skill in "abc"},
+                        "penalty": None}
+        return ATSScoreResult(overall_score=score, skill_match_score=score, experience_score=score,
+                              skill_vector=skill_vector)
+
+
+def test_rematching_scores_only_new_or_changed_resumes(monkeypatch):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from backend.app.api import matching_routes
+    from backend.app.models.database import Base
+    from backend.app.models.jd_models import JobDescription
+    from backend.app.models.resume_models import MatchingResult, Resume
+
+    engine = CountingEngine()
+    monkeypatch.setattr(matching_routes, "matching_engine", engine)
+    monkeypatch.setattr(matching_routes, "USE_AGENTIC_AI", False)
+    monkeypatch.setattr(matching_routes.settings, "MATCHING_EXECUTOR", "thread")
+
+    db_engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=db_engine, tables=[
+        JobDescription.__table__, Resume.__table__, MatchingResult.__table__])
+    db = sessionmaker(bind=db_engine)()
+    jd = JobDescription(original_text="jd", structured_data={"job_title": "Dev"},
+                        skills_weightage={"python": 50}, is_approved=True, session_id="s1")
+    db.add(jd)
+    for name, skills in (("A", ["Python"]), ("B", ["Python", "SQL"]), ("C", ["Go", "SQL", "AWS"])):
+        db.add(Resume(filename=f"{name}.pdf", file_path="x", session_id="s1",
+                      structured_data={"name": name, "skills": skills}))
+    db.commit()
+
+    def ranking():
+        rows = db.query(MatchingResult).order_by(MatchingResult.rank_position).all()
+        return [(db.get(Resume, row.resume_id).structured_data["name"], row.rank_position) for row in rows]
+
+    first = matching_routes.run_matching("s1", db)
+    assert sorted(engine.scored) == ["A", "B", "C"]
+    assert ranking() == [("C", 1), ("B", 2), ("A", 3)]
+
+    # Nothing changed: nothing is scored, results and ranks are kept
+    engine.scored.clear()
+    second = matching_routes.run_matching("s1", db)
+    assert engine.scored == []
+    assert second["performance_metrics"]["results_reused"] == 3
+    assert [r["resume_id"] for r in second["ranking"]] == [r["resume_id"] for r in first["ranking"]]
+
+    # One new resume and one edited resume: only those two are scored, all are re-ranked
+    db.add(Resume(filename="D.pdf", file_path="x", session_id="s1",
+                  structured_data={"name": "D", "skills": ["a", "b", "c", "d"]}))
+    resume_a = db.query(Resume).filter(Resume.filename == "A.pdf").one()
+    resume_a.structured_data = {"name": "A", "skills": ["Python", "SQL", "AWS", "Go", "K8s"]}
+    db.commit()
+    engine.scored.clear()
+    third = matching_routes.run_matching("s1", db)
+    assert sorted(engine.scored) == ["A", "D"]
+    assert third["performance_metrics"]["results_reused"] == 2
+    assert ranking() == [("A", 1), ("D", 2), ("C", 3), ("B", 4)]
+    assert db.query(MatchingResult).count() == 4
+
+    # A new skills weightage changes every fingerprint
+    jd.skills_weightage = {"python": 80}
+    db.commit()
+    engine.scored.clear()
+    matching_routes.run_matching("s1", db)
+    assert len(engine.scored) == 4
+
+    engine.scored.clear()
+    matching_routes.run_matching("s1", db, force=True)
+    assert len(engine.scored) == 4
+
+    # An engine failure is stored without a fingerprint and retried on every run
+    db.add(Resume(filename="E.pdf", file_path="x", session_id="s1",
+                  structured_data={"name": "E", "skills": [], "broken": True}))
+    db.commit()
+    engine.scored.clear()
+    matching_routes.run_matching("s1", db)
+    assert engine.scored == ["E"]
+    engine.scored.clear()
+    matching_routes.run_matching("s1", db)
+    assert engine.scored == ["E"]
+    failed = db.query(MatchingResult).filter(MatchingResult.overall_score == 0).one()
+    assert failed.fingerprint is None
+    db.close()
+
+
+def test_what_if_ranking_matches_a_full_rematch(vector_nlp, monkeypatch):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from backend.app.api import matching_routes
+    from backend.app.models.database import Base
+    from backend.app.models.jd_models import JobDescription
+    from backend.app.models.resume_models import MatchingResult, Resume
+
+    monkeypatch.setattr(matching_routes, "matching_engine", MatchingEngine(nlp=vector_nlp))
+    monkeypatch.setattr(matching_routes, "USE_AGENTIC_AI", False)
+    monkeypatch.setattr(matching_routes.settings, "MATCHING_EXECUTOR", "thread")
+
+    db_engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=db_engine, tables=[
+        JobDescription.__table__, Resume.__table__, MatchingResult.__table__])
+    db = sessionmaker(bind=db_engine)()
+    jd = JobDescription(original_text="jd", is_approved=True, session_id="s1",
+                        structured_data={"job_title": "Python Developer",
+                                         "description": "Python developer, 2 years, Django and Flask"},
+                        skills_weightage={"python": 50})
+    db.add(jd)
+    job = [{"role": "Python Developer", "company": "Acme", "duration": "3 years",
+            "description": "Django and Flask services"}]
+    for name, skills, timeline in (
+        ("A", ["Python"], job),
+        ("B", ["Django", "Flask"], job),
+        ("C", ["Flask", "Java"], job),
+        ("E", ["Excel"], [{"role": "Accountant", "company": "X", "duration": "5 years"}]),  # rejected
+    ):
+        db.add(Resume(filename=f"{name}.pdf", file_path="x", session_id="s1", structured_data={
+            "name": name, "skills": skills, "experience_timeline": timeline,
+            "total_experience": 3 if timeline else 0}))
+    db.commit()
+
+    matching_routes.run_matching("s1", db)
+    assert db.query(MatchingResult).filter(MatchingResult.skill_vector.isnot(None)).count() == 3
+
+    weights = {"python": 5, "django": 100, "flask": 60}
+    preview = matching_routes.what_if_ranking("s1", weights, db)
+    assert preview["results_rescored"] == 3
+
+    jd.skills_weightage = weights
+    db.commit()
+    rematch = matching_routes.run_matching("s1", db)
+
+    expected = {r["resume_id"]: r["ats_score"] for r in rematch["ranking"]}
+    assert [r["resume_id"] for r in preview["ranking"]] == [r["resume_id"] for r in rematch["ranking"]]
+    for row in preview["ranking"]:
+        assert row["overall_score"] == pytest.approx(expected[row["resume_id"]]["overall_score"], abs=0.01)
+        assert row["skill_match_score"] == pytest.approx(expected[row["resume_id"]]["skill_match_score"], abs=0.01)
+    assert preview["ranking"] != [] and preview["ranking"][-1]["overall_score"] == 0
+    db.close()
+
+
+def test_scores_only_matching_builds_detailed_analysis_once_on_demand(vector_nlp, monkeypatch):
+    import asyncio
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from backend.app.api import matching_routes
+    from backend.app.models.database import Base
+    from backend.app.models.jd_models import JobDescription
+    from backend.app.models.resume_models import MatchingResult, Resume
+
+    engine = MatchingEngine(nlp=vector_nlp)
+    monkeypatch.setattr(matching_routes, "matching_engine", engine)
+    monkeypatch.setattr(matching_routes, "USE_AGENTIC_AI", False)
+    monkeypatch.setattr(matching_routes.settings, "MATCHING_EXECUTOR", "thread")
+    monkeypatch.setattr(matching_routes.settings, "MATCHING_SCORES_ONLY", True)
+
+    # The endpoint builds the analysis in a worker thread, as the app's SQLite engine allows
+    db_engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=db_engine, tables=[
+        JobDescription.__table__, Resume.__table__, MatchingResult.__table__])
+    db = sessionmaker(bind=db_engine)()
+    jd_data = {"job_title": "Python Developer", "description": "Python developer, Django and Flask"}
+    db.add(JobDescription(original_text="jd", structured_data=jd_data, skills_weightage={"python": 80},
+                          is_approved=True, session_id="s1"))
+    resume_data = {"name": "Jane", "total_experience": 3, "skills": ["Python", "Flask"],
+                   "experience_timeline": [{"role": "Python Developer", "company": "Acme",
+                                            "duration": "3 years", "description": "Django and Flask"}]}
+    resume = Resume(filename="jane.pdf", file_path="x", session_id="s1", structured_data=resume_data)
+    db.add(resume)
+    db.commit()
+
+    calls = []
+    original = engine._get_complete_skills_analysis
+    monkeypatch.setattr(engine, "_get_complete_skills_analysis",
+                        lambda *args, **kwargs: calls.append(1) or original(*args, **kwargs))
+
+    matching_routes.run_matching("s1", db)
+    stored = db.query(MatchingResult).one().detailed_analysis
+    assert calls == []
+    assert stored["analysis_pending"] and "skills_analysis" not in stored
+
+    first = asyncio.run(matching_routes.get_detailed_analysis("s1", resume.id, db))
+    second = asyncio.run(matching_routes.get_detailed_analysis("s1", resume.id, db))
+    assert len(calls) == 1
+
+    eager = engine.calculate_ats_score(jd_data, resume_data, {"python": 80})["detailed_analysis"]
+    for analysis in (first["matching_analysis"]["detailed_analysis"],
+                     second["matching_analysis"]["detailed_analysis"],
+                     db.query(MatchingResult).one().detailed_analysis):
+        assert "analysis_pending" not in analysis
+        assert analysis["skills_analysis"] == eager["skills_analysis"]
+        assert analysis["experience_analysis"] == eager["experience_analysis"]
+
+    # A JD edited after matching: the stored scores are stale, no analysis is built for them
+    from fastapi import HTTPException
+
+    matching_routes.run_matching("s1", db, force=True)
+    built = len(calls)
+    jd = db.query(JobDescription).one()
+    jd.skills_weightage = {"python": 20}
+    db.commit()
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(matching_routes.get_detailed_analysis("s1", resume.id, db))
+    assert error.value.status_code == 409
+    assert len(calls) == built
+    assert db.query(MatchingResult).one().detailed_analysis["analysis_pending"]
+    db.close()
+
+
+def test_cascade_sends_only_the_traditional_top_k_to_agentic_ai(monkeypatch):
+    import asyncio
+    import threading
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from backend.app.api import matching_routes
+    from backend.app.models.database import Base
+    from backend.app.models.jd_models import JobDescription
+    from backend.app.models.resume_models import MatchingResult, Resume
+    from backend.app.services.rate_limiter import RateLimitExceeded, rate_limits
+
+    engine = CountingEngine()
+    monkeypatch.setattr(matching_routes, "matching_engine", engine)
+    monkeypatch.setattr(matching_routes, "USE_AGENTIC_AI", True)
+    monkeypatch.setattr(matching_routes.settings, "MATCHING_EXECUTOR", "thread")
+    monkeypatch.setattr(matching_routes.settings, "AGENTIC_CASCADE", True)
+    monkeypatch.setattr(matching_routes.settings, "AGENTIC_CASCADE_TOP_K", 2)
+    rate_limits.reset()
+
+    # Both shortlisted resumes must be in flight at once to get past the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    agentic_calls = []
+
+    def fake_agentic(resume_data, jd_data):
+        agentic_calls.append(resume_data["name"])
+        barrier.wait()
+        # A's agentic score (5) is below C's traditional score (10)
+        score = 90.0 if resume_data["name"] == "B" else 5.0
+        return {"overall_score": score, "skill_match_score": score, "experience_score": score,
+                "detailed_analysis": {"scoring_method": "Agentic AI"}}
+
+    monkeypatch.setattr(matching_routes, "_agentic_ats_score", fake_agentic)
+
+    db_engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=db_engine, tables=[
+        JobDescription.__table__, Resume.__table__, MatchingResult.__table__])
+    db = sessionmaker(bind=db_engine)()
+    db.add(JobDescription(original_text="jd", structured_data={"job_title": "Dev"},
+                          skills_weightage={}, is_approved=True, session_id="s1"))
+    for name, skills in (("A", ["a", "b", "c"]), ("B", ["a", "b"]), ("C", ["a"]), ("D", [])):
+        db.add(Resume(filename=f"{name}.pdf", file_path="x", session_id="s1",
+                      structured_data={"name": name, "skills": skills}))
+    db.commit()
+
+    reported = []
+    summary = matching_routes.run_matching("s1", db, on_result=lambda r: reported.append(r.candidate_name))
+
+    assert sorted(engine.scored) == ["A", "B", "C", "D"]
+    assert sorted(agentic_calls) == ["A", "B"]
+    assert sorted(reported) == ["A", "B", "C", "D"]
+    assert set(reported[:2]) == {"C", "D"}  # the rest is reported before the shortlist
+    assert summary["cascade"] == {
+        "top_k": 2, "score_band": [0.0, 100.0], "hard_rejected": 1,
+        "agentic_calls": 2, "agentic_fallbacks": 0, "llm_calls_saved": 2,
+    }
+    methods = {r["candidate_name"]: r["ats_score"]["detailed_analysis"]["scoring_method"]
+               for r in summary["ranking"]}
+    assert [r["candidate_name"] for r in summary["ranking"]] == ["B", "A", "C", "D"]
+    assert methods == {"B": "Agentic AI", "A": "Agentic AI", "C": "Traditional", "D": "Traditional"}
+    assert summary["ranking"][1]["ats_score"]["detailed_analysis"]["traditional_score"] == 30.0
+
+    # The shortlist ranks as a block: A stays ahead of C despite the lower agentic score
+    results = asyncio.run(matching_routes.get_matching_results("s1", limit=None, cursor=None, fields="candidate_name", db=db))
+    assert [r["candidate_name"] for r in results["results"]] == ["B", "A", "C", "D"]
+    preview = matching_routes.what_if_ranking("s1", {"python": 100}, db)
+    assert [r["filename"] for r in preview["ranking"]] == ["B.pdf", "A.pdf", "C.pdf", "D.pdf"]
+    assert preview["results_rescored"] == 4
+    assert [r["overall_score"] for r in preview["ranking"][:2]] == [90.0, 5.0]
+
+    # Agentic results keep the traditional vector and move with their traditional score
+    stored = {row.resume_id: row for row in db.query(MatchingResult)}
+    assert all(row.skill_vector for row in stored.values())
+    assert stored[preview["ranking"][0]["resume_id"]].skill_vector["experience_score"] == 20.0
+    preview = matching_routes.what_if_ranking("s1", {"a": 0, "b": 0}, db)
+    scores = {r["filename"]: (r["overall_score"], r["skill_match_score"]) for r in preview["ranking"]}
+    assert scores == {"B.pdf": (56.67, 23.33), "A.pdf": (5.0, 5.0), "C.pdf": (5.0, 0.0), "D.pdf": (0.0, 0.0)}
+    assert [r["filename"] for r in preview["ranking"]] == ["B.pdf", "A.pdf", "C.pdf", "D.pdf"]
+
+    # Unchanged inputs: nothing is rescored and no LLM call is made
+    engine.scored.clear()
+    agentic_calls.clear()
+    summary = matching_routes.run_matching("s1", db)
+    assert engine.scored == [] and agentic_calls == []
+    assert summary["cascade"]["llm_calls_saved"] == 0
+    assert [r["candidate_name"] for r in summary["ranking"]] == ["B", "A", "C", "D"]
+
+    # A rate-limit timeout falls back to the traditional score instead of dropping the candidate
+    def no_slot():
+        raise RateLimitExceeded("agentic", 600)
+
+    monkeypatch.setattr(rate_limits.get("agentic"), "acquire", no_slot)
+    summary = matching_routes.run_matching("s1", db, force=True)
+    assert agentic_calls == []
+    assert summary["cascade"]["agentic_fallbacks"] == 2
+    assert [r["candidate_name"] for r in summary["ranking"]] == ["A", "B", "C", "D"]
+    assert db.query(MatchingResult).count() == 4
+    db.close()
+    rate_limits.reset()
+
+
+def test_results_pages_through_score_ties_and_rejects_bad_requests():
+    import asyncio
+    from fastapi import HTTPException
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from backend.app.api import matching_routes
+    from backend.app.models.database import Base
+    from backend.app.models.resume_models import MatchingResult, Resume
+
+    db_engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=db_engine, tables=[Resume.__table__, MatchingResult.__table__])
+    db = sessionmaker(bind=db_engine)()
+
+    # Every candidate scores 70; E and C share a stored rank, ids do not follow the ranking
+    ranks = {"E": 3, "B": 2, "D": 4, "A": 1, "C": 3}
+    for name, rank in ranks.items():
+        resume = Resume(filename=f"{name}.pdf", file_path="x", session_id="s1", structured_data={"name": name})
+        db.add(resume)
+        db.flush()
+        db.add(MatchingResult(session_id="s1", jd_id=1, resume_id=resume.id, overall_score=70.0,
+                              rank_position=rank, detailed_analysis={}))
+    db.add(Resume(filename="waiting.pdf", file_path="x", session_id="s2", structured_data={"name": "W"}))
+    db.commit()
+
+    def results(session_id="s1", limit=None, cursor=None, fields="candidate_name,overall_score"):
+        return asyncio.run(matching_routes.get_matching_results(
+            session_id, limit=limit, cursor=cursor, fields=fields, db=db))
+
+    full = results()
+    assert [r["candidate_name"] for r in full["results"]] == ["A", "B", "E", "C", "D"]
+
+    pages, cursor = [], None
+    while True:
+        page = results(limit=2, cursor=cursor)
+        assert page["total_results"] == 5
+        pages.append(page["results"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            assert not page["has_more"]
+            break
+    assert [len(p) for p in pages] == [2, 2, 1]
+    assert [r for p in pages for r in p] == full["results"]
+    assert [r["rank"] for p in pages for r in p] == [1, 2, 3, 4, 5]
+
+    for bad_cursor in ("not-a-cursor", "e30=", "WzFd"):  # garbage, {} and [1]
+        with pytest.raises(HTTPException) as error:
+            results(limit=2, cursor=bad_cursor)
+        assert error.value.status_code == 400
+
+    with pytest.raises(HTTPException) as error:
+        results(fields="candidate_name,salary")
+    assert error.value.status_code == 400 and "salary" in error.value.detail
+
+    # No resumes at all vs. resumes that were never matched
+    with pytest.raises(HTTPException) as error:
+        results(session_id="empty")
+    assert error.value.status_code == 400
+    with pytest.raises(HTTPException) as error:
+        results(session_id="s2")
+    assert error.value.status_code == 404
+
+
+def test_synchronous_start_refuses_a_session_with_a_running_job(monkeypatch):
+    import asyncio
+    from fastapi import HTTPException
+    from backend.app.api import matching_routes
+    from backend.app.services.matching_jobs import MatchingJobRegistry
+
+    registry = MatchingJobRegistry()
+    monkeypatch.setattr(matching_routes, "matching_jobs", registry)
+    monkeypatch.setattr(matching_routes, "_get_matching_inputs", lambda session_id, db: (None, [1, 2]))
+    monkeypatch.setattr(matching_routes, "run_matching", lambda *args, **kwargs: pytest.fail("must not run"))
+
+    running = registry.create("s1", total=2)
+    running.start()
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(matching_routes.start_matching("s1", force=False, db=None))
+    assert error.value.status_code == 409 and running.job_id in error.value.detail
+
+    # And a synchronous run blocks background jobs until it is done
+    running.finish({"status": "completed"})
+    background_status = []
+
+    def fake_run_matching(session_id, db, on_result=None, force=False):
+        try:
+            asyncio.run(matching_routes.start_matching_job(session_id, None, force=False, db=None))
+        except HTTPException as e:
+            background_status.append(e.status_code)
+        return {"status": "completed"}
+
+    monkeypatch.setattr(matching_routes, "run_matching", fake_run_matching)
+    assert asyncio.run(matching_routes.start_matching("s1", force=False, db=None)) == {"status": "completed"}
+    assert background_status == [409]
+    assert registry.active_for_session("s1") is None
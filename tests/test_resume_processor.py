@@ -0,0 +1,413 @@
+import asyncio
+import io
+import time
+
+import fitz
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.app.models.database import Base
+from backend.app.models.extraction_cache_models import ExtractionCacheEntry
+from backend.app.models.resume_models import Resume
+from backend.app.services import resume_ingestion, upload_storage
+from backend.app.services.pdf_processor import PDFProcessor
+from backend.app.services.prompt_compactor import PromptCompactor, estimate_tokens
+from backend.app.services.tiered_extractor import TieredResumeExtractor
+
+
+class FakeUpload:
+    """Like Starlette's UploadFile: a spooled file handle, size unknown to the route"""
+
+    def __init__(self, filename: str, content: bytes):
+        self.filename = filename
+        self.file = io.BytesIO(content)
+        self.size = None
+
+    async def read(self) -> bytes:
+        raise AssertionError("uploads must be streamed, not read whole")
+
+
+class SlowLLM:
+    """Waits on I/O without blocking the loop, like the pooled HTTP backends"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = 0
+
+    def model_identity(self) -> str:
+        return "fake:slow"
+
+    async def extract_resume_information(self, resume_text: str):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"name": resume_text.split()[0], "skills": "Python, SQL", "total_experience": 3}
+
+
+def _pdf(text: str, title: str = "") -> bytes:
+    doc = fitz.open()
+    doc.set_metadata({"title": title})
+    doc.new_page().insert_text((72, 72), text)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+WELL_FORMED_RESUME = """Jane Smith
+jane.smith@example.com | +1 415 555 0199
+EXPERIENCE
+Senior Software Engineer at Acme Technologies
+Jan 2021 - Present
+- Developed Python and FastAPI services on AWS with Docker and Kubernetes
+Software Engineer at Beta Systems Inc.
+2018 - 2020
+- Built PostgreSQL and Redis backed APIs in Django
+EDUCATION
+Bachelor of Technology in Computer Science, 2018
+SKILLS
+Python, FastAPI, Django, PostgreSQL, Redis, Docker, Kubernetes, AWS, Git
+"""
+
+
+class FieldLLM(SlowLLM):
+    """Answers partial (tiered) extraction requests"""
+
+    def __init__(self):
+        super().__init__(delay=0)
+        self.requested = []
+
+    async def extract_resume_fields(self, resume_text: str, fields):
+        self.calls += 1
+        self.requested.append(list(fields))
+        answers = {"name": "Sam Lee", "skills": ["Go", "gRPC"], "total_experience": 4}
+        return {f: answers[f] for f in fields if f in answers}
+
+
+@pytest.fixture(autouse=True)
+def llm_extraction_mode(monkeypatch):
+    # Pipeline tests exercise full LLM extraction unless they opt into tiers
+    monkeypatch.setattr(resume_ingestion.settings, "RESUME_EXTRACTION_MODE", "llm")
+
+
+@pytest.fixture
+def db_session():
+    # One shared connection: the pipeline runs its DB calls on worker threads
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine, tables=[Resume.__table__, ExtractionCacheEntry.__table__])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def test_ingestion_pipeline_overlaps_llm_calls(db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_ingestion, "RESUME_UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(resume_ingestion.settings, "RESUME_LLM_CONCURRENCY", 4)
+    monkeypatch.setattr(resume_ingestion.settings, "RESUME_COMMIT_BATCH_SIZE", 5)
+
+    files = [FakeUpload(f"cand_{i}.pdf", _pdf(f"Cand{i} Python developer")) for i in range(8)]
+    files.append(FakeUpload("CAND_1.pdf", _pdf("duplicate")))
+    files.append(FakeUpload("broken.pdf", b"not a pdf"))
+
+    llm = SlowLLM(delay=0.2)
+    pipeline = resume_ingestion.ResumeIngestionPipeline(db_session, llm, "s1")
+
+    start = time.time()
+    summary = asyncio.run(pipeline.run(files))
+    elapsed = time.time() - start
+
+    assert summary["successfully_processed"] == 8
+    assert summary["skipped_count"] == 1
+    assert summary["failed_count"] == 1
+    assert not (tmp_path / "s1_broken.pdf").exists()  # failed uploads leave no file behind
+    assert llm.calls == 8
+    # 8 blocking calls of 0.2s each, 4 at a time
+    assert elapsed < 8 * 0.2 * 0.75
+    assert [r["filename"] for r in summary["resumes"]] == [f"cand_{i}.pdf" for i in range(8)]
+    assert summary["resumes"][0]["structured_data"]["skills"] == ["Python", "SQL"]
+    assert summary["performance_metrics"]["commits"] <= 4
+    stored = db_session.query(Resume.filename, Resume.id).filter(Resume.session_id == "s1").all()
+    assert len(stored) == 8
+    assert {(r["filename"], r["id"]) for r in summary["resumes"]} == set(stored)
+
+
+def test_ingestion_extracts_pdfs_on_the_shared_process_pool(db_session, tmp_path, monkeypatch):
+    from backend.app.services import pdf_processor
+
+    monkeypatch.setattr(resume_ingestion, "RESUME_UPLOAD_DIR", str(tmp_path))
+    pdf_processor.shutdown_process_pool()
+    llm = SlowLLM(delay=0)
+
+    first = resume_ingestion.ResumeIngestionPipeline(db_session, llm, "s1")
+    summary = asyncio.run(first.run([FakeUpload("ann.pdf", _pdf("Ann Python developer"))]))
+    pool = pdf_processor._process_pool
+    assert pool is not None
+    assert summary["resumes"][0]["structured_data"]["name"] == "Ann"
+
+    # A second upload (new event loop) reuses the same worker processes
+    second = resume_ingestion.ResumeIngestionPipeline(db_session, llm, "s2")
+    summary = asyncio.run(second.run([FakeUpload("ben.pdf", _pdf("Ben Go developer"))]))
+    assert summary["resumes"][0]["structured_data"]["name"] == "Ben"
+    assert pdf_processor._process_pool is pool
+
+
+def test_extraction_cache_skips_llm_across_sessions(db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_ingestion, "RESUME_UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(resume_ingestion.settings, "EXTRACTION_CACHE_ENABLED", True)
+
+    same_bytes = _pdf("Alice Python developer")
+    llm = SlowLLM(delay=0)
+    first = resume_ingestion.ResumeIngestionPipeline(db_session, llm, "s1")
+    asyncio.run(first.run([FakeUpload("alice.pdf", same_bytes)]))
+    assert llm.calls == 1
+
+    # Same bytes under a new name, and a re-export with the same text but different bytes
+    re_exported = _pdf("Alice   Python developer", title="v2")
+    assert same_bytes != re_exported
+
+    second = resume_ingestion.ResumeIngestionPipeline(db_session, llm, "s2")
+    summary = asyncio.run(second.run([
+        FakeUpload("alice_cv.pdf", same_bytes),
+        FakeUpload("alice_final.pdf", re_exported),
+    ]))
+
+    assert llm.calls == 1
+    assert summary["successfully_processed"] == 2
+    assert summary["performance_metrics"]["cache_content_hits"] == 1
+    assert summary["performance_metrics"]["cache_text_hits"] == 1
+    assert all(r["from_cache"] for r in summary["resumes"])
+    assert summary["resumes"][0]["structured_data"]["name"] == "Alice"
+
+    # A different model or prompt version never reuses the entry
+    class OtherLLM(SlowLLM):
+        def model_identity(self) -> str:
+            return "fake:other"
+
+    other = OtherLLM(delay=0)
+    third = resume_ingestion.ResumeIngestionPipeline(db_session, other, "s3")
+    asyncio.run(third.run([FakeUpload("alice.pdf", same_bytes)]))
+    assert other.calls == 1
+
+
+def test_rolled_back_batch_leaves_no_uploaded_files(db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_ingestion, "RESUME_UPLOAD_DIR", str(tmp_path))
+
+    def fail_commit():
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(db_session, "commit", fail_commit)
+    pipeline = resume_ingestion.ResumeIngestionPipeline(db_session, SlowLLM(delay=0), "s1")
+    summary = asyncio.run(pipeline.run([FakeUpload("ann.pdf", _pdf("Ann Python developer"))]))
+
+    assert summary["failed_count"] == 1 and summary["successfully_processed"] == 0
+    assert "database is locked" in summary["failed_files"][0]["error"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_extraction_cache_never_shares_empty_text(db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_ingestion, "RESUME_UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(resume_ingestion.settings, "EXTRACTION_CACHE_ENABLED", True)
+
+    class ScanLLM(SlowLLM):
+        async def extract_resume_information(self, resume_text: str):
+            self.calls += 1
+            return {"name": f"Scanned {self.calls}", "skills": [], "total_experience": 0}
+
+    # Image-only scans: no text layer, or just a page number
+    llm = ScanLLM(delay=0)
+    first = resume_ingestion.ResumeIngestionPipeline(db_session, llm, "s1")
+    asyncio.run(first.run([FakeUpload("scan_a.pdf", _pdf("", title="a"))]))
+
+    second = resume_ingestion.ResumeIngestionPipeline(db_session, llm, "s2")
+    summary = asyncio.run(second.run([
+        FakeUpload("scan_b.pdf", _pdf("", title="b")),
+        FakeUpload("scan_c.pdf", _pdf("1", title="c")),
+    ]))
+
+    assert llm.calls == 3
+    assert summary["performance_metrics"]["cache_text_hits"] == 0
+    assert not any(r["from_cache"] for r in summary["resumes"])
+    assert db_session.query(ExtractionCacheEntry).count() == 0
+
+
+def test_oversized_upload_is_rejected_per_file(db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_ingestion, "RESUME_UPLOAD_DIR", str(tmp_path))
+    small = _pdf("Bob Java developer")
+    monkeypatch.setattr(resume_ingestion.settings, "MAX_FILE_SIZE", len(small) + 10)
+    monkeypatch.setattr(upload_storage, "UPLOAD_CHUNK_SIZE", 64)
+
+    llm = SlowLLM(delay=0)
+    pipeline = resume_ingestion.ResumeIngestionPipeline(db_session, llm, "s1")
+    summary = asyncio.run(pipeline.run([
+        FakeUpload("bob.pdf", small),
+        FakeUpload("huge.pdf", small + b"\0" * 1000),
+    ]))
+
+    assert summary["successfully_processed"] == 1
+    assert summary["failed_files"][0]["filename"] == "huge.pdf"
+    assert summary["failed_files"][0]["status_code"] == 413
+    # The partial copy is cleaned up; the accepted file is kept byte for byte
+    assert not (tmp_path / "s1_huge.pdf").exists()
+    assert (tmp_path / "s1_bob.pdf").read_bytes() == small
+
+
+def test_tiered_extraction_calls_llm_only_for_weak_fields():
+    llm = FieldLLM()
+    extractor = TieredResumeExtractor(llm, mode="tiered", min_confidence=0.7)
+
+    strong = asyncio.run(extractor.extract(WELL_FORMED_RESUME))
+    assert llm.calls == 0 and strong.llm_fields == []
+    data = strong.structured_data
+    assert data["name"] == "Jane Smith"
+    assert data["total_experience"] > 0
+    assert {"python", "django", "kubernetes"} <= {s.lower() for s in data["skills"]}
+    assert [e["company"] for e in data["experience_timeline"]] == ["Acme Technologies", "Beta Systems Inc."]
+    assert data["extraction"]["method"] == "heuristic"
+
+    weak = asyncio.run(extractor.extract("worked on some backend things, go and grpc\nsam.lee@example.com"))
+    assert llm.calls == 1
+    assert "email" not in llm.requested[0] and "skills" in llm.requested[0]
+    assert weak.structured_data["name"] == "Sam Lee"
+    assert weak.structured_data["skills"] == ["Go", "gRPC"]
+    assert weak.structured_data["email"] == "sam.lee@example.com"  # kept from the heuristic tier
+    assert weak.field_confidence["skills"] < 0.7
+
+    heuristic_only = TieredResumeExtractor(llm, mode="heuristic")
+    asyncio.run(heuristic_only.extract("worked on some backend things"))
+    assert llm.calls == 1
+    assert heuristic_only.cache_identity() != extractor.cache_identity()
+
+
+def test_heuristic_extraction_scores_end_to_end():
+    from backend.app.services.matching_engine import MatchingEngine
+
+    resume_text = """Jane Smith
+jane.smith@example.com
+
+EXPERIENCE
+Senior Python Developer
+Acme Corp | Jan 2020 - Present
+- Built Django and Flask services on Kubernetes for 2M users
+Java Developer at Initech
+2016 - 2019
+- Maintained Spring services and internal tooling
+
+SKILLS
+Python, Django, Flask, Kubernetes, Java
+"""
+    extraction = asyncio.run(TieredResumeExtractor(FieldLLM(), mode="heuristic").extract(resume_text))
+    timeline = extraction.structured_data["experience_timeline"]
+    assert [(e["role"], e["company"], e["duration"]) for e in timeline] == [
+        ("Senior Python Developer", "Acme Corp", "Jan 2020 - Present"),
+        ("Java Developer", "Initech", "2016 - 2019"),
+    ]
+    assert "Django and Flask" in timeline[0]["description"]
+
+    jd_data = {"job_title": "Python Developer", "description": "Python developer with Django and Flask"}
+    engine = MatchingEngine()
+    result = engine.score_resume(jd_data, extraction.structured_data, {})
+    assert result.error is None
+    assert result.overall_score > 0
+
+    # Timelines that only carry a responsibilities list score the same
+    without_description = dict(extraction.structured_data, experience_timeline=[
+        {k: v for k, v in e.items() if k != "description"} for e in timeline])
+    again = engine.score_resume(jd_data, without_description, {})
+    assert again.error is None and again.overall_score == result.overall_score
+
+
+def test_prompt_compaction_keeps_every_section_within_budget():
+    bullets = "\n".join(f"• Developed service {i} in Python and FastAPI on AWS, cutting latency by {i}%" for i in range(40))
+    resume = WELL_FORMED_RESUME.replace(
+        "- Developed Python and FastAPI services on AWS with Docker and Kubernetes",
+        bullets + "\nPage 1 of 2\nJane Smith\nEXPERIENCE (continued)",
+    ) + "References available upon request\n______\nPage 2 of 2\n"
+
+    result = PromptCompactor(token_budget=300).compact(resume)
+    assert result.compacted_tokens <= 300
+    assert result.tokens_saved == estimate_tokens(resume) - result.compacted_tokens > 0
+    assert list(result.section_tokens) == ["header", "experience", "education", "skills"]
+    for kept in ("Beta Systems Inc.", "Built PostgreSQL", "Bachelor of Technology", "Kubernetes, AWS, Git", "service 0 "):
+        assert kept in result.text
+    for dropped in ("Page 1 of 2", "References available", "______", "service 39 "):
+        assert dropped not in result.text
+    assert result.text.count("Jane Smith") == 1
+
+    class RecordingLLM(SlowLLM):
+        async def extract_resume_information(self, resume_text: str):
+            self.prompt = resume_text
+            return await super().extract_resume_information(resume_text)
+
+    llm = RecordingLLM(delay=0)
+    extraction = asyncio.run(TieredResumeExtractor(llm, mode="llm").extract(resume))
+    assert len(llm.prompt) < len(resume) and "Bachelor of Technology" in llm.prompt
+    assert extraction.prompt_tokens_saved > 0
+
+
+def test_pdf_engine_sources_caps_and_parallel_batch(tmp_path):
+    doc = fitz.open()
+    for i in range(3):
+        doc.new_page().insert_text((72, 72), f"Page {i} Python FastAPI")
+    data = doc.tobytes()
+    doc.close()
+    path = tmp_path / "three_pages.pdf"
+    path.write_bytes(data)
+
+    engine = PDFProcessor("pymupdf", max_pages=0, max_chars=0)
+    text = engine.extract_text(data)
+    assert all(f"Page {i}" in text for i in range(3))
+    assert engine.extract_text(io.BytesIO(data)) == text == engine.extract_text_from_pdf(str(path))
+    assert PDFProcessor("pypdf2", max_pages=0, max_chars=0).extract(data).page_count == 3
+
+    capped = PDFProcessor("pymupdf", max_pages=2, max_chars=0).extract(data)
+    assert capped.pages_read == 2 and capped.truncated and "Page 2" not in capped.text
+    assert len(PDFProcessor("pymupdf", max_pages=0, max_chars=10).extract_text(data)) <= 10
+
+    results = engine.extract_many([str(path), b"not a pdf", data], max_workers=2)
+    assert [r.text for r in results] == [text, "", text]
+    assert results[1].error and not results[0].error
+
+
+def test_experience_timeline_splits_dates_companies_and_bullets():
+    from backend.app.services.resume_processor import ResumeProcessor
+
+    processor = ResumeProcessor()
+
+    # Dates on the role line stay out of the role and company
+    same_line = processor.parse_experience_timeline(
+        "EXPERIENCE\n"
+        "Software Engineer | Acme Corp | Jan 2020 - Present\n"
+        "• Developed Python APIs on AWS for billing\n"
+        "EDUCATION\n"
+    )
+    assert [(e["role"], e["company"], e["duration"]) for e in same_line] == [
+        ("Software Engineer", "Acme Corp", "Jan 2020 - Present"),
+    ]
+
+    # A role-only line takes its company (and dates) from the next line
+    next_line = processor.parse_experience_timeline(
+        "WORK EXPERIENCE\n"
+        "Senior Developer\n"
+        "Globex Ltd | 03/2017 to 06/2019\n"
+        "- Built Django services with PostgreSQL\n"
+        "Data Analyst\n"
+        "Initech, 2015 – 2017\n"
+    )
+    assert [(e["role"], e["company"], e["duration"]) for e in next_line] == [
+        ("Senior Developer", "Globex Ltd", "03/2017 to 06/2019"),
+        ("Data Analyst", "Initech", "2015 – 2017"),
+    ]
+    assert next_line[0]["responsibilities"] == ["- Built Django services with PostgreSQL"]
+
+    # Bullets naming roles are responsibilities, not new jobs
+    bullets = processor.parse_experience_timeline(
+        "Experience\n"
+        "Backend Engineer at Umbrella Inc, 2019 - 2021\n"
+        "• Lead developer for the payments engineering team\n"
+        "- Managed a team of 4 engineers on Kubernetes\n"
+        "Skills\n"
+    )
+    assert len(bullets) == 1
+    assert (bullets[0]["role"], bullets[0]["company"], bullets[0]["duration"]) == (
+        "Backend Engineer", "Umbrella Inc", "2019 - 2021")
+    assert len(bullets[0]["responsibilities"]) == 2